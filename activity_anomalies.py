@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+HOURS_PER_WEEK = 168
+# Robust z-score an hour (burst) or a quiet stretch (silence) has to pass
+Z_THRESHOLD = 3.5
+# Scales the median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+# Whole weeks of history needed before hour-of-week baselines mean anything
+MIN_WEEKS = 4
+# Senders with fewer messages are too sparse for baselines of their own
+MIN_SENDER_MESSAGES = 100
+# Bursts need at least this many messages in an hour, so 3 texts at 4 am is not news
+MIN_BURST_MESSAGES = 10
+
+WINDOW_COLUMNS = ["kind", "start", "end", "hours", "messages", "expected", "score"]
+
+def hourly_counts(df: pd.DataFrame, min_messages: int = MIN_SENDER_MESSAGES) -> dict:
+    """
+    Messages per hour for the whole chat and every sender with at least
+    min_messages, as one (series x hours) matrix built with a single np.bincount.
+
+    Hours run from the Monday 00:00 before the first message to the end of the
+    last message's week, so the matrix reshapes to (series, weeks, 168).
+    Returns senders (row 0 is the whole chat, labelled None), origin (first
+    hour), counts and the first and last hour holding messages.
+    """
+    times = pd.to_datetime(df["datetime_ist"], format="ISO8601").to_numpy().astype("datetime64[h]")
+    hours = times.astype(np.int64)
+    if len(hours) == 0:
+        return {"senders": [None], "origin": None, "counts": np.zeros((1, 0), dtype=np.int64), "first": 0, "last": -1}
+    # Hour 0 of the epoch is a Thursday; step back to the Monday starting that week
+    first_day = hours.min() // 24
+    origin = (first_day - (first_day + 3) % 7) * 24
+    offsets = hours - origin
+    span = (offsets.max() // HOURS_PER_WEEK + 1) * HOURS_PER_WEEK
+
+    sender_codes, senders = pd.factorize(df["sender"], sort=True)
+    sizes = np.bincount(sender_codes, minlength=len(senders))
+    kept = sizes >= min_messages
+    rows = np.zeros(len(senders), dtype=np.int64)
+    rows[kept] = np.arange(1, kept.sum() + 1)
+    in_row = kept[sender_codes]
+    series = np.concatenate([np.zeros(len(offsets), dtype=np.int64), rows[sender_codes[in_row]]])
+    positions = series * span + np.concatenate([offsets, offsets[in_row]])
+    counts = np.bincount(positions, minlength=(kept.sum() + 1) * span).reshape(-1, span)
+    return {
+        "senders": [None] + list(senders[kept]),
+        "origin": np.datetime64(int(origin), "h"),
+        "counts": counts,
+        "first": int(offsets.min()),
+        "last": int(offsets.max())
+    }
+
+def _nan_median(values: np.ndarray, axis: int = 1) -> np.ndarray:
+    """Median along axis ignoring NaN, by sorting (NaN sorts last) and indexing the middle."""
+    ordered = np.sort(values, axis=axis)
+    valid = np.sum(~np.isnan(values), axis=axis, keepdims=True)
+    lower = np.take_along_axis(ordered, np.maximum((valid - 1) // 2, 0), axis=axis)
+    upper = np.take_along_axis(ordered, valid // 2, axis=axis)
+    return np.squeeze((lower + upper) / 2, axis=axis)
+
+def hour_of_week_scores(counts: np.ndarray, first: int, last: int) -> tuple:
+    """
+    Robust z-scores of every hourly count against its own hour-of-week baseline.
+
+    Each series' counts are reshaped to (weeks, 168); the median and median
+    absolute deviation over weeks give the expected count and spread of every
+    hour-of-week slot, for all series at once. The spread is floored at the
+    Poisson sqrt(expected), and at 1 when scoring, so slots that are nearly
+    always empty do not turn one message into an outlier. Hours outside
+    [first, last] are not scored (NaN). Returns (z, expected, spread), each
+    shaped like counts.
+    """
+    series, span = counts.shape
+    weekly = counts.astype(np.float32).reshape(series, span // HOURS_PER_WEEK, HOURS_PER_WEEK)
+    outside = (np.arange(span) < first) | (np.arange(span) > last)
+    weekly[:, outside.reshape(-1, HOURS_PER_WEEK)] = np.nan
+    median = _nan_median(weekly)
+    mad = _nan_median(np.abs(weekly - median[:, None, :]))
+    spread = np.maximum(MAD_SCALE * mad, np.sqrt(median))
+    z = (weekly - median[:, None, :]) / np.maximum(spread, 1)[:, None, :]
+    expected = np.broadcast_to(median[:, None, :], weekly.shape).reshape(series, span)
+    spread = np.broadcast_to(spread[:, None, :], weekly.shape).reshape(series, span)
+    return z.reshape(series, span), expected, spread
+
+def _runs(mask: np.ndarray) -> tuple:
+    """(row, start, end) of every run of True along the rows of a 2-D mask; end is exclusive."""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+def _run_sums(values: np.ndarray, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Sum of values over each run, from row-wise cumulative sums."""
+    totals = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=totals[:, 1:])
+    return totals[rows, ends] - totals[rows, starts]
+
+def anomaly_windows(hourly: dict, threshold: float = Z_THRESHOLD) -> pd.DataFrame:
+    """
+    Bursts and silences of every series in an hourly_counts result.
+
+    A burst is a run of consecutive hours each scoring at least threshold
+    (and holding MIN_BURST_MESSAGES); its score is the peak hour's. A silence
+    is a run of consecutive empty hours whose summed expected count is
+    threshold or more standard deviations of the run (the hours' unfloored
+    spreads added in quadrature); its score is that negative z.
+
+    Returns one row per window: sender (None for the whole chat), kind,
+    start, end (exclusive), hours, messages, expected and score.
+    """
+    counts = hourly["counts"]
+    if hourly["last"] - hourly["first"] + 1 < MIN_WEEKS * HOURS_PER_WEEK:
+        return pd.DataFrame(columns=["sender"] + WINDOW_COLUMNS)
+    z, expected, spread = hour_of_week_scores(counts, hourly["first"], hourly["last"])
+    scored = ~np.isnan(z)
+
+    parts = []
+    for kind, mask in (("burst", scored & (z >= threshold) & (counts >= MIN_BURST_MESSAGES)),
+                       ("silence", scored & (counts == 0))):
+        rows, starts, ends = _runs(mask)
+        run_expected = _run_sums(expected, rows, starts, ends)
+        if kind == "burst":
+            # Hours outside bursts are -inf, so each reduceat segment (one run start to the next) peaks inside its run
+            peaks = np.where(mask, z, -np.inf).ravel()
+            score = np.maximum.reduceat(peaks, rows * counts.shape[1] + starts) if len(rows) else np.empty(0)
+            keep = np.ones(len(rows), dtype=bool)
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                score = -run_expected / np.sqrt(_run_sums(spread ** 2, rows, starts, ends))
+            keep = score <= -threshold
+        parts.append((np.full(keep.sum(), kind, dtype=object), rows[keep], starts[keep], ends[keep],
+                      _run_sums(counts, rows, starts, ends)[keep], run_expected[keep], score[keep]))
+    kinds, rows, starts, ends, messages, run_expected, score = (np.concatenate(column) for column in zip(*parts))
+    result = pd.DataFrame({
+        "sender": np.array(hourly["senders"], dtype=object)[rows],
+        "kind": kinds,
+        "start": pd.to_datetime(hourly["origin"] + starts),
+        "end": pd.to_datetime(hourly["origin"] + ends),
+        "hours": ends - starts,
+        "messages": messages.astype(np.int64),
+        "expected": run_expected.round(1),
+        "score": score.round(1)
+    })
+    return result.sort_values(["start", "kind"], kind="stable", ignore_index=True)
+
+def activity_anomalies(df: pd.DataFrame, threshold: float = Z_THRESHOLD) -> dict:
+    """
+    Unusual bursts and silences for the whole chat and every active sender.
+
+    Returns {"overall": windows, "by_sender": windows with a sender column},
+    as produced by anomaly_windows.
+    """
+    windows = anomaly_windows(hourly_counts(df), threshold)
+    overall = windows["sender"].isna()
+    return {
+        "overall": windows.loc[overall, WINDOW_COLUMNS].reset_index(drop=True),
+        "by_sender": windows[~overall].reset_index(drop=True)
+    }
+
+def anomalies_for(anomalies: dict, sender=None) -> pd.DataFrame:
+    """The windows for one sender, or the whole chat's when sender is None."""
+    if sender is None:
+        return anomalies["overall"]
+    windows = anomalies["by_sender"]
+    return windows.loc[windows["sender"] == sender, WINDOW_COLUMNS].reset_index(drop=True)
+
+def window_messages(df: pd.DataFrame, window, sender=None) -> pd.DataFrame:
+    """The messages sent in one window (a row of the windows table), optionally by one sender."""
+    times = pd.to_datetime(df["datetime_ist"], format="ISO8601")
+    inside = (times >= window["start"]) & (times < window["end"])
+    if sender is not None:
+        inside &= df["sender"] == sender
+    return df[inside.to_numpy()]
@@ -0,0 +1,49 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def build_activity_matrix(df: pd.DataFrame) -> dict:
+    """
+    Precompute per-sender activity counts with one np.bincount per view.
+
+    Returns a dict with:
+        senders: sender names, in the order used by the first axis below
+        weekday_hour: int64 array of shape (n_senders, 7, 24), Monday = 0
+        month: int64 array of shape (n_senders, 12), January = 0
+    """
+    senders, sender_codes = np.unique(df["sender"].to_numpy(dtype=str), return_inverse=True)
+    n_senders = len(senders)
+    timestamps = pd.to_datetime(df["datetime_ist"], format="ISO8601")
+    weekday = timestamps.dt.weekday.to_numpy(dtype=np.int64)
+    hour = timestamps.dt.hour.to_numpy(dtype=np.int64)
+    month = timestamps.dt.month.to_numpy(dtype=np.int64) - 1
+
+    weekday_hour = np.bincount(sender_codes * 168 + weekday * 24 + hour, minlength=n_senders * 168)
+    month_counts = np.bincount(sender_codes * 12 + month, minlength=n_senders * 12)
+    return {
+        "senders": senders.tolist(),
+        "weekday_hour": weekday_hour.reshape(n_senders, 7, 24),
+        "month": month_counts.reshape(n_senders, 12)
+    }
+
+def _sender_rows(matrix: dict, key: str, sender: Optional[str]) -> np.ndarray:
+    counts = matrix[key]
+    if sender is None:
+        return counts.sum(axis=0)
+    if sender not in matrix["senders"]:
+        return np.zeros(counts.shape[1:], dtype=np.int64)
+    return counts[matrix["senders"].index(sender)]
+
+def weekday_hour_matrix(matrix: dict, sender: Optional[str] = None) -> np.ndarray:
+    """7x24 message counts (weekday x hour) for one sender, or everyone when sender is None."""
+    return _sender_rows(matrix, "weekday_hour", sender)
+
+def weekday_totals(matrix: dict, sender: Optional[str] = None) -> np.ndarray:
+    """Message counts per weekday (Monday first)."""
+    return weekday_hour_matrix(matrix, sender).sum(axis=1)
+
+def month_totals(matrix: dict, sender: Optional[str] = None) -> np.ndarray:
+    """Message counts per calendar month (January first), all years combined."""
+    return _sender_rows(matrix, "month", sender)
@@ -1,41 +1,51 @@
 #!/usr/bin/env python3
 
-from parser import parse_chat_file
+from chat_store import import_chat_file, open_store, run_query, run_saved_query
 
 def analyze_missed_media():
     """Analyze specific media patterns that are being missed in mobile parsing."""
     print("Analyzing missed media patterns...")
     
-    # Parse both files
-    pc_df = parse_chat_file('pc_pickleball_thane_chat.txt')
-    mobile_df = parse_chat_file('mobile-pickleball-thane.txt')
+    # Parse each export once; later runs query the stored copies
+    conn = open_store()
+    pc_chat = import_chat_file(conn, 'pc_pickleball_thane_chat.txt')
+    mobile_chat = import_chat_file(conn, 'mobile-pickleball-thane.txt')
     
-    # Get media messages from both
-    pc_media = pc_df[pc_df['media'] != '']
-    mobile_media = mobile_df[mobile_df['media'] != '']
+    # Get media counts from both
+    media_types = run_saved_query(conn, 'media_types', chat=pc_chat, other=mobile_chat)
+    pc_media, mobile_media = media_types['chat_count'].sum(), media_types['other_count'].sum()
     
-    print(f"PC media: {len(pc_media)} vs Mobile media: {len(mobile_media)}")
-    print(f"Difference: {len(pc_media) - len(mobile_media)}")
+    print(f"PC media: {pc_media} vs Mobile media: {mobile_media}")
+    print(f"Difference: {pc_media - mobile_media}")
     
     # Analyze mobile messages that are still marked as generic "media"
-    mobile_generic_media = mobile_media[mobile_media['media'] == 'media']
+    mobile_generic_media = run_saved_query(conn, 'generic_media', chat=mobile_chat)
     print(f"\nMobile generic media messages: {len(mobile_generic_media)}")
     
     print("\nSample mobile generic media messages:")
-    for i, (_, row) in enumerate(mobile_generic_media.head(20).iterrows()):
-        print(f"{i+1}. Raw: {row['raw_message'][:150]}...")
-        print(f"   Msg: {row['message'][:100]}...")
+    for i, row in enumerate(mobile_generic_media.head(20).itertuples(), start=1):
+        print(f"{i}. Raw: {row.raw_message[:150]}...")
+        print(f"   Msg: {row.message[:100]}...")
         print()
     
     # Look for specific patterns in PC media that might help identify types
     print("PC media type samples for comparison:")
+    pc_samples = run_query(
+        conn,
+        """SELECT media, raw_message, message FROM (
+               SELECT media, raw_message, message,
+                      ROW_NUMBER() OVER (PARTITION BY media ORDER BY datetime_ist, id) AS sample
+               FROM messages WHERE chat_id = :chat AND media IN ('image', 'video', 'document', 'gif', 'sticker', 'audio'))
+           WHERE sample <= 3""",
+        {'chat': pc_chat}
+    )
     for media_type in ['image', 'video', 'document', 'gif', 'sticker', 'audio']:
-        pc_samples = pc_media[pc_media['media'] == media_type]
-        if len(pc_samples) > 0:
+        samples = pc_samples[pc_samples['media'] == media_type]
+        if len(samples) > 0:
             print(f"\n{media_type} samples from PC:")
-            for _, row in pc_samples.head(3).iterrows():
-                print(f"  Raw: {row['raw_message'][:100]}...")
-                print(f"  Msg: {row['message'][:50]}...")
+            for row in samples.itertuples():
+                print(f"  Raw: {row.raw_message[:100]}...")
+                print(f"  Msg: {row.message[:50]}...")
     
     # Check for potential patterns in mobile messages that could indicate media types
     print("\nChecking for media type indicators in mobile generic media...")
@@ -49,19 +59,19 @@ def analyze_missed_media():
         'audio': ['mp3', 'wav', 'audio', 'voice']
     }
     
-    for media_type, indicators in type_indicators.items():
-        count = 0
-        for _, row in mobile_generic_media.iterrows():
-            raw_msg = row['raw_message'].lower()
-            msg = row['message'].lower()
-            
-            for indicator in indicators:
-                if indicator in raw_msg or indicator in msg:
-                    count += 1
-                    break
-        
+    # One pass over the generic media rows, one SUM per media type (LIKE is case-insensitive for ASCII)
+    indicator_sums = ", ".join(
+        "SUM(" + " OR ".join(f"raw_message LIKE '%{indicator}%' OR message LIKE '%{indicator}%'"
+                             for indicator in indicators) + f") AS {media_type}"
+        for media_type, indicators in type_indicators.items()
+    )
+    indicator_counts = run_query(
+        conn, f"SELECT {indicator_sums} FROM messages WHERE chat_id = :chat AND media = 'media'", {'chat': mobile_chat}
+    ).iloc[0]
+    
+    for media_type, count in indicator_counts.fillna(0).items():
         if count > 0:
-            print(f"  {media_type}: {count} potential matches")
+            print(f"  {media_type}: {int(count)} potential matches")
 
 if __name__ == "__main__":
     analyze_missed_media()
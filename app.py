@@ -1,23 +1,184 @@
+import hashlib
+import io
+import threading
+import time
+from contextlib import contextmanager
 import streamlit as st
 import pandas as pd
-from parser import parse_chat_file
+from parser import QUARANTINE_COLUMNS, parse_chat_file
+from word_frequency import HINDI_STOP_WORDS_FILE, load_stop_words, stop_words_version, word_counts_by_sender, word_counts_for
+from word_cloud import prerender_word_clouds, word_cloud_cache, word_cloud_key
+from emoji_tokenizer import emoji_counts_by_sender
+from activity_matrix import WEEKDAY_NAMES, build_activity_matrix, month_totals, weekday_hour_matrix, weekday_totals
+from search_index import build_search_index
+from sessions import DEFAULT_IDLE_GAP_MINUTES, segment_sessions, sessions_for_sender
+from response_times import response_times
+from interaction_graph import build_interaction_graph, centrality, top_pairs
+from timelines import FREQUENCIES, timeline
+from activity_anomalies import MIN_SENDER_MESSAGES, MIN_WEEKS, activity_anomalies, anomalies_for, window_messages
+from link_analytics import link_stats
+from sentiment import sentiment_stats
+from ngrams import DEFAULT_MIN_COUNT, collocations, ngram_stats, ngrams_for
+from near_duplicates import duplicate_clusters, find_near_duplicates
+from timezones import DEFAULT_TIMEZONE, convert_chat_timezone, timezone_names
+from chat_store import count_messages, fetch_messages_page, find_chat, list_chats, load_chat_messages, open_store, save_chat
 
 st.set_page_config(page_title="WhatsApp Chat Analyzer", layout="wide")
 st.title("📱 WhatsApp Chat Analyzer")
 
+@st.cache_data(show_spinner="Parsing chat...")
+def load_chat(chat_hash, _file_bytes, export_timezone):
+    """Parse an uploaded chat once per export zone; reruns reuse the cached (DataFrame, quarantined lines) pair."""
+    return parse_chat_file(io.BytesIO(_file_bytes), return_quarantine=True, timezone=export_timezone)
+
+@st.cache_data(show_spinner="Converting timezone...")
+def get_timezone_view(chat_hash, _master_df, export_timezone, viewer_timezone):
+    """The chat re-expressed in the viewer's timezone, computed once per zone pair."""
+    return convert_chat_timezone(_master_df, export_timezone, viewer_timezone)
+
+@st.cache_data(show_spinner=False)
+def get_activity_matrix(chat_hash, _user_messages_df):
+    """Per-sender weekday x hour and month counts, stored alongside the parsed chat."""
+    return build_activity_matrix(_user_messages_df)
+
+@st.cache_data(show_spinner=False)
+def get_word_counts(chat_hash, _user_messages_df):
+    """Per-sender word counts, computed once per uploaded chat."""
+    return word_counts_by_sender(_user_messages_df)
+
+@st.cache_data(show_spinner=False)
+def get_ngram_stats(chat_hash, _user_messages_df):
+    """Per-sender bigram and trigram counts with PMI, computed once per uploaded chat."""
+    return ngram_stats(_user_messages_df)
+
+@st.cache_data(show_spinner="Finding repeated messages...")
+def get_near_duplicates(chat_hash, _user_messages_df):
+    """Near-duplicate clusters (forwards, reposts) and their summary, computed once per chat and zone."""
+    duplicates = find_near_duplicates(_user_messages_df)
+    return duplicates, duplicate_clusters(_user_messages_df, duplicates)
+
+@st.cache_data(show_spinner=False)
+def get_emoji_counts(chat_hash, _user_messages_df):
+    """Per-sender emoji counts, computed once per uploaded chat."""
+    return emoji_counts_by_sender(_user_messages_df)
+
+@st.cache_data(show_spinner=False)
+def get_sessions(chat_hash, _user_messages_df, idle_gap_minutes):
+    """Conversation sessions for one idle gap, computed once per chat and gap."""
+    return segment_sessions(_user_messages_df, idle_gap_minutes)
+
+@st.cache_data(show_spinner=False)
+def get_response_times(chat_hash, _user_messages_df):
+    """Reply latency per sender and sender pair, computed once per chat."""
+    return response_times(_user_messages_df)
+
+@st.cache_data(show_spinner=False)
+def get_interaction_graph(chat_hash, _user_messages_df):
+    """Sparse reply/mention graph with centrality and all pairs, computed once per chat."""
+    graph = build_interaction_graph(_user_messages_df)
+    return graph, centrality(graph), top_pairs(graph, limit=None)
+
+@st.cache_data(show_spinner=False)
+def get_timeline(chat_hash, _filtered_df, selected_user, freq, rolling):
+    """Resampled, downsampled message timeline for one sender selection and resolution."""
+    return timeline(_filtered_df, freq, rolling=rolling)
+
+@st.cache_data(show_spinner="Looking for unusual activity...")
+def get_anomalies(chat_hash, _user_messages_df):
+    """Hour-of-week bursts and silences for the chat and every active sender, computed once per chat."""
+    return activity_anomalies(_user_messages_df)
+
+@st.cache_data(show_spinner=False)
+def get_link_stats(chat_hash, _user_messages_df):
+    """Shared-link domains per chat and per sender, computed once per chat and zone."""
+    return link_stats(_user_messages_df)
+
+@st.cache_data(show_spinner=False)
+def get_sentiment(chat_hash, _user_messages_df):
+    """Lexicon sentiment per message, sender and month, computed once per chat."""
+    return sentiment_stats(_user_messages_df)
+
+@st.cache_resource(show_spinner="Indexing messages...")
+def get_search_index(chat_hash, _user_messages_df):
+    """Inverted index over the user messages, built once per uploaded chat and shared across reruns."""
+    return build_search_index(_user_messages_df)
+
+@st.cache_resource
+def get_chat_store():
+    """One SQLite connection to the local chat database and the lock serializing its use, shared across sessions."""
+    return open_store(), threading.Lock()
+
+@contextmanager
+def chat_store():
+    """Hold the shared connection for one batch of store calls, so sessions never interleave transactions."""
+    store, lock = get_chat_store()
+    with lock:
+        yield store
+
+@st.cache_resource(show_spinner="Saving chat to the local database...")
+def store_chat(chat_hash, _master_df, name):
+    """Persist a parsed chat once per upload; returns its chat id."""
+    with chat_store() as store:
+        return save_chat(store, _master_df, chat_hash, name=name)
+
+@st.cache_data(show_spinner="Loading stored chat...")
+def load_stored_chat(chat_hash):
+    """Load a previously stored chat without re-parsing the export."""
+    with chat_store() as store:
+        return load_chat_messages(store, find_chat(store, chat_hash))
+
 # Sidebar Upload
 uploaded_file = st.sidebar.file_uploader("Upload WhatsApp Chat (.txt)", type=["txt"])
+use_store = st.sidebar.checkbox("💾 Keep chats in a local database", value=False,
+                                help="Stores parsed chats in SQLite so they can be reopened without re-uploading")
+
+stored_chat_hash = None
+if use_store and not uploaded_file:
+    with chat_store() as store:
+        stored_chats = list_chats(store)
+    if len(stored_chats) > 0:
+        stored_labels = {
+            row.chat_hash: f"{row.name or row.chat_hash[:8]} ({row.message_count} messages, {row.imported_at[:10]})"
+            for row in stored_chats.itertuples()
+        }
+        stored_chat_hash = st.sidebar.selectbox("Open stored chat", list(stored_labels), format_func=stored_labels.get)
+
+if uploaded_file or stored_chat_hash:
+    # Exports hold wall-clock times of the exporter's zone: the parser takes it for datetime_utc,
+    # and the viewer's zone re-expresses the times without re-parsing. Timeline caches are keyed
+    # by the zone pair as well as the chat.
+    zone_names = timezone_names()
+    export_timezone = st.sidebar.selectbox("🌍 Chat exported in timezone", zone_names,
+                                           index=zone_names.index(DEFAULT_TIMEZONE))
+    viewer_timezone = st.sidebar.selectbox("🕒 Show times in timezone", zone_names,
+                                           index=zone_names.index(export_timezone))
 
-if uploaded_file:
     try:
         # Master dataframe with ALL messages (including group notifications)
-        master_df = parse_chat_file(uploaded_file)
-        st.sidebar.success("Chat successfully parsed!")
+        if uploaded_file:
+            file_bytes = uploaded_file.getvalue()
+            chat_hash = hashlib.sha1(file_bytes).hexdigest()
+            master_df, quarantine_df = load_chat(chat_hash, file_bytes, export_timezone)
+            st.sidebar.success("Chat successfully parsed!")
+            if use_store:
+                store_chat(chat_hash, master_df, uploaded_file.name)
+        else:
+            chat_hash = stored_chat_hash
+            master_df = load_stored_chat(chat_hash)
+            # The stored UTC column follows the zone picked at upload; recompute it for this one
+            master_df = get_timezone_view(chat_hash, master_df, export_timezone, export_timezone)
+            quarantine_df = pd.DataFrame(columns=QUARANTINE_COLUMNS)
+            st.sidebar.success("Stored chat loaded!")
     except Exception as e:
         st.sidebar.error(f"Error parsing file: {str(e)}")
         st.error("Failed to parse the uploaded file. Please ensure it's a valid WhatsApp chat export.")
         st.stop()
     
+    view_key = chat_hash
+    if viewer_timezone != export_timezone:
+        master_df = get_timezone_view(chat_hash, master_df, export_timezone, viewer_timezone)
+        view_key = f"{chat_hash}:{export_timezone}>{viewer_timezone}"
+    
     # Create a copy with only user messages (excluding group notifications)
     user_messages_df = master_df[master_df['sender'] != "group_notification"].copy()
     
@@ -25,6 +186,25 @@ if uploaded_file:
     all_users = sorted(user_messages_df['sender'].unique())
     user_options = ["Overall"] + all_users
     
+    # Forwarded chains and reposts can be left out of the word and emoji analysis;
+    # those caches are then keyed separately from the full chat. Flags are matched
+    # by message index, since a timezone view re-sorts the rows
+    duplicates, duplicate_summary = get_near_duplicates(view_key, user_messages_df)
+    duplicates = duplicates.loc[user_messages_df.index]
+    exclude_duplicates = st.sidebar.checkbox("🔁 Exclude repeated/forwarded messages from word & emoji analysis")
+    if exclude_duplicates:
+        content_df = user_messages_df[~duplicates['is_duplicate']]
+        content_key = f"{view_key}:without-duplicates"
+    else:
+        content_df = user_messages_df
+        content_key = chat_hash
+    
+    # Warm the word cloud cache for the overall view and the most active senders
+    # in the background so the Word Cloud tab opens instantly
+    stop_words_key = stop_words_version(load_stop_words() | load_stop_words(HINDI_STOP_WORDS_FILE))
+    top_senders = user_messages_df['sender'].value_counts().index[:10].tolist()
+    prerender_word_clouds(content_key, get_word_counts(content_key, content_df), [None] + top_senders, stop_words_key)
+    
     # Single dropdown for user selection
     selected_user = st.sidebar.selectbox("Show Analysis wrt", user_options, index=0)
     
@@ -36,14 +216,17 @@ if uploaded_file:
         filtered_df = user_messages_df[user_messages_df['sender'] == selected_user].copy()
         display_title = f"{selected_user}'s Messages"
     
+    # Emoji counts for the current selection (whole emoji sequences, not code points)
+    emoji_counts_df = get_emoji_counts(content_key, content_df)
+    if selected_user != "Overall":
+        emoji_counts_df = emoji_counts_df[emoji_counts_df['sender'] == selected_user]
+    emoji_counts = emoji_counts_df.groupby('emoji')['count'].sum().sort_values(ascending=False, kind='stable')
+    
     # Display header and basic info
     st.header(f"📊 Analysis - {display_title}")
     
     # Calculate word count
-    total_words = 0
-    for message in filtered_df['message']:
-        if message and message.strip():
-            total_words += len(message.split())
+    total_words = int(filtered_df['message'].str.split().str.len().sum())
     
     # Show basic stats - Large metrics display
     st.subheader("📊 Key Statistics")
@@ -68,21 +251,7 @@ if uploaded_file:
         st.metric("Total Contacts Shared", total_contacts)
     with col6:
         # Count actual emojis, not messages with emojis
-        total_emojis = 0
-        emoji_messages = filtered_df[filtered_df['emojis'] != '']
-        for emoji_str in emoji_messages['emojis']:
-            if emoji_str and emoji_str != '':
-                try:
-                    # Parse the emoji list string
-                    import ast
-                    emoji_list = ast.literal_eval(emoji_str)
-                    if isinstance(emoji_list, list):
-                        total_emojis += len(emoji_list)
-                    else:
-                        total_emojis += 1
-                except (ValueError, SyntaxError):
-                    # If parsing fails, treat as single emoji
-                    total_emojis += 1
+        total_emojis = int(emoji_counts.sum())
         st.metric("Total Emojis Shared", total_emojis)
     with col7:
         mention_count = len(filtered_df[filtered_df['mentions'] != ""])
@@ -111,65 +280,38 @@ if uploaded_file:
     # Word frequency analysis
     st.subheader("📊 Word Frequency Analysis")
     if len(filtered_df) > 0:
-        # Load stop words
-        try:
-            with open('./stop_words_hinglish.txt', 'r', encoding='utf-8') as f:
-                stop_words = set(word.strip().lower() for word in f.readlines() if word.strip())
-        except FileNotFoundError:
-            stop_words = set()
+        stop_words = load_stop_words()
+        if not stop_words:
             st.warning("Stop words file not found. Word filtering may be less effective.")
+        stop_words = stop_words | load_stop_words(HINDI_STOP_WORDS_FILE)
+        
+        # Messages are cleaned and stop-word filtered with their own language's pipeline
+        language_share = filtered_df['language'].value_counts(normalize=True)
+        st.caption("Messages by language: " + ", ".join(
+            f"{language.title()} {share * 100:.0f}%" for language, share in language_share.items()
+        ))
         
-        # Collect all words from messages with better filtering
-        all_words = []
-        for message in filtered_df['message']:
-            if message and message.strip():
-                # Split message into words and clean them
-                words = message.lower().split()
-                for word in words:
-                    # Remove punctuation and special characters, keep only alphanumeric
-                    clean_word = ''.join(char for char in word if char.isalnum())
-                    # Filter: non-empty, length > 1, not in stop words, not pure numbers
-                    if (clean_word and 
-                        len(clean_word) > 1 and 
-                        clean_word not in stop_words and
-                        not clean_word.isdigit()):
-                        all_words.append(clean_word)
-        
-        if all_words:
-            from collections import Counter
+        # Per-sender counts are cached per chat; only the selection is collapsed on rerun
+        word_counts = word_counts_for(
+            get_word_counts(content_key, content_df),
+            None if selected_user == "Overall" else selected_user
+        )
+        
+        if len(word_counts) > 0:
             import plotly.express as px
-            from wordcloud import WordCloud
-            import matplotlib.pyplot as plt
-            import io
-            
-            # Count word frequencies
-            word_counts = Counter(all_words)
-            top_words_chart = word_counts.most_common(10)  # For chart display
-            all_words_sorted = word_counts.most_common()   # For scrollable list
-            
-            # Calculate percentages for chart (top 10)
-            total_words_count = len(all_words)
-            chart_data = []
-            for word, count in top_words_chart:
-                percentage = (count / total_words_count) * 100
-                chart_data.append({
-                    'word': word,
-                    'count': count,
-                    'percentage': percentage
-                })
-            
-            # Calculate percentages for all words (scrollable list)
-            all_words_data = []
-            for word, count in all_words_sorted:
-                percentage = (count / total_words_count) * 100
-                all_words_data.append({
-                    'word': word,
-                    'count': count,
-                    'percentage': percentage
-                })
+            
+            # Calculate percentages for all words (scrollable list) and the top 10 chart
+            total_words_count = int(word_counts.sum())
+            words_table = pd.DataFrame({
+                'word': word_counts.index,
+                'count': word_counts.to_numpy(),
+                'percentage': word_counts.to_numpy() / total_words_count * 100
+            })
+            all_words_data = words_table.to_dict('records')
+            chart_data = all_words_data[:10]
             
             # Create tabs for different visualizations
-            tab1, tab2, tab3 = st.tabs(["📊 Bar Chart", "☁️ Word Cloud", "📋 Word List"])
+            tab1, tab2, tab3, tab4 = st.tabs(["📊 Bar Chart", "☁️ Word Cloud", "📋 Word List", "🔗 Phrases"])
             
             with tab1:
                 # Create bar chart (top 10 only)
@@ -193,23 +335,10 @@ if uploaded_file:
                 # Create word cloud
                 st.markdown("**Word Cloud Visualization**")
                 
-                # Generate word cloud
-                wordcloud = WordCloud(
-                    width=800, 
-                    height=400, 
-                    background_color='white',
-                    colormap='viridis',
-                    max_words=100,
-                    stopwords=stop_words  # Pass stop words to WordCloud as well
-                ).generate_from_frequencies(word_counts)
-                
-                # Create matplotlib figure
-                fig, ax = plt.subplots(figsize=(10, 5))
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis('off')
-                
-                # Display the word cloud
-                st.pyplot(fig)
+                # Rendered images are cached per (chat, sender, stop word set)
+                cloud_key = word_cloud_key(content_key, None if selected_user == "Overall" else selected_user, stop_words_key)
+                cloud_png = word_cloud_cache.get_or_render(cloud_key, word_counts.to_dict())
+                st.image(cloud_png, use_container_width=True)
                 
                 # Add some info about the word cloud
                 st.info(f"""Word cloud generated from {len(all_words_data)} unique words 
@@ -238,6 +367,31 @@ if uploaded_file:
                     </div>""",
                     unsafe_allow_html=True
                 )
+            
+            with tab4:
+                # Bigrams/trigrams and the word pairs that stick together more than chance
+                phrases = get_ngram_stats(content_key, content_df)
+                phrase_size = st.radio("Phrase length", ["Two words", "Three words"], horizontal=True)
+                phrase_table = ngrams_for(phrases["bigrams" if phrase_size == "Two words" else "trigrams"],
+                                          None if selected_user == "Overall" else selected_user)
+                if len(phrase_table) > 0:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        fig_phrases = px.bar(phrase_table.head(15), x='count', y='ngram', orientation='h',
+                                             title='Most Frequent Phrases', labels={'count': 'Frequency', 'ngram': 'Phrase'},
+                                             height=500)
+                        fig_phrases.update_layout(yaxis={'categoryorder': 'total ascending'})
+                        st.plotly_chart(fig_phrases, use_container_width=True)
+                    with col2:
+                        st.markdown(f"**Collocations** (seen at least {DEFAULT_MIN_COUNT} times, ranked by PMI)")
+                        pairs_table = collocations(phrase_table)
+                        st.dataframe(pd.DataFrame({
+                            'Phrase': pairs_table['ngram'],
+                            'Count': pairs_table['count'],
+                            'PMI': pairs_table['pmi'].round(2)
+                        }), use_container_width=True, hide_index=True, height=460)
+                else:
+                    st.info("No repeated phrases found.")
         else:
             st.info("No words found after filtering stop words and short words.")
     else:
@@ -246,56 +400,23 @@ if uploaded_file:
     # Emoji analysis
     st.subheader("😊 Emoji Analysis")
     if len(filtered_df) > 0:
-        # Extract all emojis from the filtered dataframe
-        all_emojis = []
-        emoji_messages = filtered_df[filtered_df['emojis'] != '']
-        
-        if len(emoji_messages) > 0:
-            for emoji_str in emoji_messages['emojis']:
-                if emoji_str and emoji_str != '':
-                    try:
-                        # Parse the emoji list string
-                        import ast
-                        emoji_list = ast.literal_eval(emoji_str)  # type: ignore
-                        if isinstance(emoji_list, list):
-                            all_emojis.extend(emoji_list)
-                        else:
-                            # Handle case where it's just a string
-                            all_emojis.append(str(emoji_list))
-                    except (ValueError, SyntaxError):
-                        # If parsing fails, treat as single emoji
-                        all_emojis.append(emoji_str)
-        
-        if all_emojis:
-            from collections import Counter
+        # Same population as the emoji counts: without repeat copies when they are excluded
+        emoji_scope_df = content_df if selected_user == "Overall" else content_df[content_df['sender'] == selected_user]
+        emoji_messages = emoji_scope_df[emoji_scope_df['emojis'] != '']
+        
+        if len(emoji_counts) > 0:
             import plotly.express as px
             import plotly.graph_objects as go
             
-            # Count emoji frequencies
-            emoji_counts = Counter(all_emojis)
-            top_emojis_chart = emoji_counts.most_common(10)  # For charts
-            all_emojis_sorted = emoji_counts.most_common()   # For scrollable list
-            
-            # Calculate percentages for top 10 emojis
-            total_emoji_count = len(all_emojis)
-            chart_data = []
-            for emoji, count in top_emojis_chart:
-                percentage = (count / total_emoji_count) * 100
-                chart_data.append({
-                    'emoji': emoji,
-                    'count': count,
-                    'percentage': percentage
-                })
-            
-            # Calculate percentages for all emojis
-            all_emoji_data = []
-            for emoji, count in all_emojis_sorted:
-                percentage = (count / total_emoji_count) * 100
-                all_emoji_data.append({
-                    'emoji': emoji,
-                    'count': count,
-                    'percentage': percentage
-                })
+            # Calculate percentages for all emojis and the top 10 charts
+            total_emoji_count = int(emoji_counts.sum())
+            emojis_table = pd.DataFrame({
+                'emoji': emoji_counts.index,
+                'count': emoji_counts.to_numpy(),
+                'percentage': emoji_counts.to_numpy() / total_emoji_count * 100
+            })
+            all_emoji_data = emojis_table.to_dict('records')
+            chart_data = all_emoji_data[:10]
             
             # Create tabs for different emoji visualizations
             emoji_tab1, emoji_tab2, emoji_tab3 = st.tabs(["📊 Bar Chart", "🥧 Pie Chart", "📋 Emoji List"])
@@ -351,7 +472,7 @@ if uploaded_file:
                 st.info(f"""📊 **Emoji Usage Statistics:**
                 - Total emojis used: {total_emoji_count:,}
                 - Unique emojis: {len(all_emoji_data)}
-                - Messages with emojis: {len(emoji_messages)} ({len(emoji_messages)/len(filtered_df)*100:.1f}% of all messages)
+                - Messages with emojis: {len(emoji_messages)} ({len(emoji_messages)/len(emoji_scope_df)*100:.1f}% of all messages)
                 - Average emojis per message: {total_emoji_count/len(emoji_messages):.1f}
                 """)
             
@@ -389,6 +510,118 @@ if uploaded_file:
     else:
         st.info("No messages available for emoji analysis.")
     
+    # Forwarded chains and reposted announcements, clustered by MinHash-LSH
+    st.subheader("🔁 Repeated & Forwarded Messages")
+    if len(duplicate_summary) > 0:
+        clusters = duplicate_summary
+        repeats = duplicates['is_duplicate']
+        if selected_user != "Overall":
+            own = user_messages_df['sender'] == selected_user
+            clusters = clusters[clusters.index.isin(duplicates['cluster'][own])]
+            repeats = repeats[own]
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Repeated Texts", len(clusters))
+        with col2:
+            st.metric("Repeat Copies", int(repeats.sum()))
+        with col3:
+            st.metric("Share of Messages", f"{repeats.mean() * 100 if len(repeats) else 0:.1f}%")
+        
+        if len(clusters) > 0:
+            top_clusters = clusters.head(20)
+            st.dataframe(pd.DataFrame({
+                'Message': top_clusters['text'].str.slice(0, 120),
+                'Times Posted': top_clusters['messages'],
+                'Members': top_clusters['senders'],
+                'First Posted By': top_clusters['first_sender'],
+                'First Seen': pd.to_datetime(top_clusters['first_sent']).dt.strftime('%d %b %Y'),
+                'Last Seen': pd.to_datetime(top_clusters['last_sent']).dt.strftime('%d %b %Y')
+            }), use_container_width=True, hide_index=True)
+        if not exclude_duplicates:
+            st.caption("Tick the sidebar option to leave repeat copies out of the word and emoji analysis.")
+    else:
+        st.info("No repeated or forwarded messages found.")
+    
+    # Which sites get shared, from the extracted URL entities
+    st.subheader("🔗 Shared Links")
+    links = get_link_stats(view_key, user_messages_df)
+    if selected_user == "Overall":
+        domain_counts = links["domains"]
+    else:
+        user_links = links["links"][links["links"]["sender"] == selected_user]
+        domain_counts = user_links.groupby("domain").agg(
+            shares=("url", "size"), first_shared=("time", "min"), last_shared=("time", "max")
+        ).sort_values("shares", ascending=False)
+    if len(domain_counts) > 0:
+        import plotly.express as px
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            top_domains = domain_counts.head(15).reset_index()
+            fig_domains = px.bar(top_domains, x='shares', y='domain', orientation='h',
+                                 title='Most Shared Sites', labels={'shares': 'Links Shared', 'domain': 'Site'},
+                                 height=450)
+            fig_domains.update_layout(yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig_domains, use_container_width=True)
+        with col2:
+            domain_table = domain_counts.head(50).reset_index()
+            st.dataframe(pd.DataFrame({
+                'Site': domain_table['domain'],
+                'Links': domain_table['shares'],
+                'First Shared': domain_table['first_shared'].dt.strftime('%d %b %Y'),
+                'Last Shared': domain_table['last_shared'].dt.strftime('%d %b %Y')
+            }), use_container_width=True, hide_index=True, height=450)
+        
+        if selected_user == "Overall":
+            st.markdown("**Top Sharers per Site**")
+            sharers = links["by_sender"][links["by_sender"]["domain"].isin(domain_counts.head(10).index)]
+            st.dataframe(sharers.head(30).rename(columns={'sender': 'Member', 'domain': 'Site', 'shares': 'Links'}),
+                         use_container_width=True, hide_index=True)
+    else:
+        st.info("No links shared.")
+    
+    # Mood from the bundled English + Hinglish sentiment lexicon
+    st.subheader("🙂 Chat Mood")
+    mood = get_sentiment(view_key, user_messages_df)
+    if mood["by_sender"]["scored"].sum() > 0:
+        import plotly.express as px
+        
+        scored_messages = mood["messages"]
+        if selected_user == "Overall":
+            monthly = mood["by_month"].reset_index()
+        else:
+            scored_messages = scored_messages[scored_messages['sender'] == selected_user]
+            monthly = mood["by_sender_month"].loc[selected_user].reset_index()
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            average_mood = scored_messages['compound'][scored_messages['hits'] > 0].mean()
+            st.metric("Average Mood", f"{average_mood:+.2f}" if pd.notna(average_mood) else "–")
+        with col2:
+            st.metric("Positive Messages", f"{(scored_messages['label'] == 'positive').mean() * 100:.1f}%")
+        with col3:
+            st.metric("Negative Messages", f"{(scored_messages['label'] == 'negative').mean() * 100:.1f}%")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            monthly = monthly[monthly['scored'] > 0]
+            fig_mood = px.line(monthly, x='month', y='mood', markers=True, hover_data={'scored': True},
+                               title='Mood per Month', labels={'month': 'Month', 'mood': 'Average Mood (-1 to 1)'},
+                               height=400)
+            fig_mood.add_hline(y=0, line_dash='dot', line_color='gray')
+            st.plotly_chart(fig_mood, use_container_width=True)
+        with col2:
+            senders_mood = mood["by_sender"][mood["by_sender"]["scored"] > 0].head(20).reset_index()
+            fig_senders = px.bar(senders_mood, x='mood', y='sender', orientation='h', color='mood',
+                                 color_continuous_scale='RdYlGn', range_color=[-1, 1],
+                                 title='Average Mood per Member', labels={'sender': 'Member', 'mood': 'Average Mood'},
+                                 height=400)
+            fig_senders.update_layout(yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig_senders, use_container_width=True)
+    else:
+        st.info("No sentiment words found in the messages.")
+    
     # Timeline analysis
     st.subheader("📈 Timeline Analysis")
     if len(filtered_df) > 0:
@@ -396,6 +629,11 @@ if uploaded_file:
         import plotly.graph_objects as go
         from datetime import datetime
         import calendar
+        import numpy as np
+        
+        # Weekday/hour and month views read from the precomputed per-sender activity matrix
+        activity = get_activity_matrix(view_key, user_messages_df)
+        activity_sender = None if selected_user == "Overall" else selected_user
         
         # Convert datetime strings to datetime objects for analysis
         filtered_df_copy = filtered_df.copy()
@@ -405,13 +643,15 @@ if uploaded_file:
         filtered_df_copy['year'] = filtered_df_copy['datetime_obj'].dt.year  # type: ignore
         filtered_df_copy['month'] = filtered_df_copy['datetime_obj'].dt.month  # type: ignore
         filtered_df_copy['day'] = filtered_df_copy['datetime_obj'].dt.day  # type: ignore
-        filtered_df_copy['weekday'] = filtered_df_copy['datetime_obj'].dt.day_name()  # type: ignore
         filtered_df_copy['hour'] = filtered_df_copy['datetime_obj'].dt.hour  # type: ignore
         filtered_df_copy['year_month'] = filtered_df_copy['datetime_obj'].dt.to_period('M')  # type: ignore
         filtered_df_copy['date'] = filtered_df_copy['datetime_obj'].dt.date  # type: ignore
         
+        # Bursts and silences of the current selection, scored against its own hour-of-week pattern
+        anomalies = anomalies_for(get_anomalies(view_key, user_messages_df), activity_sender)
+        
         # Create tabs for different timeline analyses
-        time_tab1, time_tab2, time_tab3, time_tab4, time_tab5 = st.tabs(["📅 Monthly Timeline", "📆 Daily Timeline", "📇 Month Analysis", "📃 Weekday Analysis", "🔥 Activity Heatmap"])
+        time_tab1, time_tab2, time_tab3, time_tab4, time_tab5, time_tab6 = st.tabs(["📅 Monthly Timeline", "📆 Daily Timeline", "📇 Month Analysis", "📃 Weekday Analysis", "🔥 Activity Heatmap", "🚨 Bursts & Silences"])
         
         with time_tab1:
             st.markdown("**Monthly Message Timeline**")
@@ -454,25 +694,47 @@ if uploaded_file:
                     st.metric("Average Monthly", f"{avg_monthly:.0f} messages")
         
         with time_tab2:
-            st.markdown("**Daily Message Timeline**")
+            st.markdown("**Message Timeline**")
             
-            # Daily timeline - messages per day
-            daily_counts = filtered_df_copy.groupby('date').size().reset_index(name='message_count')
-            daily_counts['date_str'] = daily_counts['date'].astype(str)
+            # Resampled to the chosen resolution and downsampled (LTTB) so long chats stay light in the browser
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                granularity = st.radio("Resolution", list(FREQUENCIES), horizontal=True)
+            with col2:
+                show_rolling = st.checkbox("Show 7/30-day averages", value=True, disabled=granularity != "Day")
+            timeline_df = get_timeline(view_key, filtered_df, selected_user, FREQUENCIES[granularity],
+                                       show_rolling and granularity == "Day")
             
             fig_daily = px.line(
-                daily_counts,
-                x='date_str',
-                y='message_count',
-                title='Messages per Day Over Time',
-                labels={'date_str': 'Date', 'message_count': 'Number of Messages'},
+                timeline_df.reset_index(names='period'),
+                x='period',
+                y=list(timeline_df.columns),
+                title=f'Messages per {granularity} Over Time',
+                labels={'period': granularity, 'value': 'Number of Messages', 'variable': ''},
                 height=500
             )
             fig_daily.update_layout(
-                xaxis_title="Date",
+                xaxis_title=granularity,
                 yaxis_title="Number of Messages",
                 hovermode='x unified'
             )
+            
+            # Mark flagged bursts and silences at the timeline level of the period they start in
+            if len(anomalies) > 0:
+                levels = timeline_df['messages'].asof(pd.DatetimeIndex(anomalies['start'])).fillna(0).to_numpy()
+                for kind, symbol, color in (("burst", "triangle-up", "crimson"), ("silence", "triangle-down", "gray")):
+                    marked = (anomalies['kind'] == kind).to_numpy()
+                    fig_daily.add_scatter(
+                        x=anomalies['start'][marked], y=levels[marked], mode='markers', name=f"{kind.title()}s",
+                        marker=dict(symbol=symbol, size=10, color=color),
+                        hovertext=[f"{kind.title()}: {row.messages} messages in {row.hours}h (usually {row.expected:g})"
+                                   for row in anomalies[marked].itertuples()],
+                        hoverinfo='text'
+                    )
+            
+            # Daily statistics over active days
+            daily_counts = filtered_df_copy.groupby('date').size().reset_index(name='message_count')
+            daily_counts['date_str'] = daily_counts['date'].astype(str)
             fig_daily.update_xaxes(tickangle=45)
             st.plotly_chart(fig_daily, use_container_width=True)
             
@@ -496,7 +758,8 @@ if uploaded_file:
             st.markdown("**Month-based Analysis**")
             
             # Month analysis - aggregate by month name across all years
-            month_counts = filtered_df_copy.groupby('month').size().reset_index(name='message_count')
+            month_counts = pd.DataFrame({'month': np.arange(1, 13), 'message_count': month_totals(activity, activity_sender)})
+            month_counts = month_counts[month_counts['message_count'] > 0].reset_index(drop=True)
             month_counts['month_name'] = month_counts['month'].apply(lambda x: calendar.month_name[x])
             
             # Bar chart for month analysis
@@ -533,13 +796,9 @@ if uploaded_file:
         with time_tab4:
             st.markdown("**Weekday Analysis**")
             
-            # Weekday analysis
-            weekday_counts = filtered_df_copy.groupby('weekday').size().reset_index(name='message_count')
-            
-            # Order weekdays properly
-            weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            weekday_counts['weekday'] = pd.Categorical(weekday_counts['weekday'], categories=weekday_order, ordered=True)
-            weekday_counts = weekday_counts.sort_values('weekday')
+            # Weekday analysis (already in Monday-first order)
+            weekday_counts = pd.DataFrame({'weekday': WEEKDAY_NAMES, 'message_count': weekday_totals(activity, activity_sender)})
+            weekday_counts = weekday_counts[weekday_counts['message_count'] > 0].reset_index(drop=True)
             
             # Bar chart for weekday analysis
             fig_weekday = px.bar(
@@ -590,25 +849,15 @@ if uploaded_file:
         with time_tab5:
             st.markdown("**Activity Heatmap - Weekday vs Hour**")
             
-            # Create heatmap data: weekday vs hour
-            heatmap_data = filtered_df_copy.groupby(['weekday', 'hour']).size().reset_index(name='message_count')
-            
-            # Create a complete grid of all weekdays and hours
-            weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            # Weekday x hour grid straight from the activity matrix
+            heatmap_grid = weekday_hour_matrix(activity, activity_sender)
             hours = list(range(24))
             
-            # Create a pivot table for the heatmap
-            heatmap_pivot = heatmap_data.pivot(index='weekday', columns='hour', values='message_count')
-            
-            # Reindex to ensure all weekdays and hours are present
-            heatmap_pivot = heatmap_pivot.reindex(weekday_order, fill_value=0)
-            heatmap_pivot = heatmap_pivot.reindex(columns=hours, fill_value=0)
-            
             # Create heatmap using plotly
             fig_heatmap = go.Figure(data=go.Heatmap(
-                z=heatmap_pivot.values,
+                z=heatmap_grid,
                 x=[f"{h:02d}:00" for h in hours],
-                y=weekday_order,
+                y=WEEKDAY_NAMES,
                 colorscale='YlOrRd',
                 showscale=True,
                 hoverongaps=False,
@@ -626,29 +875,25 @@ if uploaded_file:
             st.plotly_chart(fig_heatmap, use_container_width=True)
             
             # Heatmap insights
-            if len(heatmap_data) > 0:
+            total_messages = int(heatmap_grid.sum())
+            if total_messages > 0:
                 # Find peak activity hour and day
-                peak_activity = heatmap_data.loc[heatmap_data['message_count'].idxmax()]
-                total_messages = heatmap_data['message_count'].sum()
+                peak_day_index, peak_hour = np.unravel_index(heatmap_grid.argmax(), heatmap_grid.shape)
                 
-                # Find most active hour overall
-                hourly_activity = heatmap_data.groupby('hour')['message_count'].sum().reset_index()
-                most_active_hour = hourly_activity.loc[hourly_activity['message_count'].idxmax()]
-                
-                # Find most active day overall (should match weekday analysis)
-                daily_activity = heatmap_data.groupby('weekday')['message_count'].sum().reset_index()
-                most_active_day = daily_activity.loc[daily_activity['message_count'].idxmax()]
+                # Find most active hour and day overall (day should match weekday analysis)
+                hourly_activity = heatmap_grid.sum(axis=0)
+                daily_activity = heatmap_grid.sum(axis=1)
                 
                 # Extract scalar values to avoid type issues
-                peak_weekday = str(peak_activity['weekday'])
-                peak_hour = int(peak_activity['hour'])
-                peak_count = int(peak_activity['message_count'])
+                peak_weekday = WEEKDAY_NAMES[peak_day_index]
+                peak_hour = int(peak_hour)
+                peak_count = int(heatmap_grid[peak_day_index, peak_hour])
                 
-                active_hour = int(most_active_hour['hour'])
-                active_hour_count = int(most_active_hour['message_count'])
+                active_hour = int(hourly_activity.argmax())
+                active_hour_count = int(hourly_activity[active_hour])
                 
-                active_day = str(most_active_day['weekday'])
-                active_day_count = int(most_active_day['message_count'])
+                active_day = WEEKDAY_NAMES[int(daily_activity.argmax())]
+                active_day_count = int(daily_activity.max())
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -674,15 +919,10 @@ if uploaded_file:
                 st.markdown("**Activity Insights:**")
                 
                 # Morning, afternoon, evening, night breakdown
-                morning_hours = list(range(6, 12))
-                afternoon_hours = list(range(12, 18))
-                evening_hours = list(range(18, 22))
-                night_hours = list(range(22, 24)) + list(range(0, 6))
-                
-                morning_msgs = heatmap_data[heatmap_data['hour'].isin(morning_hours)]['message_count'].sum()
-                afternoon_msgs = heatmap_data[heatmap_data['hour'].isin(afternoon_hours)]['message_count'].sum()
-                evening_msgs = heatmap_data[heatmap_data['hour'].isin(evening_hours)]['message_count'].sum()
-                night_msgs = heatmap_data[heatmap_data['hour'].isin(night_hours)]['message_count'].sum()
+                morning_msgs = int(hourly_activity[6:12].sum())
+                afternoon_msgs = int(hourly_activity[12:18].sum())
+                evening_msgs = int(hourly_activity[18:22].sum())
+                night_msgs = int(hourly_activity[22:].sum() + hourly_activity[:6].sum())
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -695,9 +935,261 @@ if uploaded_file:
                     - Evening (18:00-22:00): {evening_msgs} messages ({evening_msgs/total_messages*100:.1f}%)
                     - Night (22:00-06:00): {night_msgs} messages ({night_msgs/total_messages*100:.1f}%)
                     """)
+        
+        with time_tab6:
+            st.markdown("**Unusual Bursts and Silences**")
+            st.caption("Every hour is compared with the same hour of the week across the whole chat. "
+                       "Bursts are hours far busier than usual; silences are stretches with no messages "
+                       "when the chat would normally be talking.")
+            if len(anomalies) > 0:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Bursts", int((anomalies['kind'] == 'burst').sum()))
+                with col2:
+                    st.metric("Silences", int((anomalies['kind'] == 'silence').sum()))
+                
+                st.dataframe(pd.DataFrame({
+                    'Kind': anomalies['kind'].str.title(),
+                    'From': anomalies['start'].dt.strftime('%d %b %Y %H:%M'),
+                    'To': anomalies['end'].dt.strftime('%d %b %Y %H:%M'),
+                    'Hours': anomalies['hours'],
+                    'Messages': anomalies['messages'],
+                    'Usually': anomalies['expected'],
+                    'Score': anomalies['score']
+                }), use_container_width=True, hide_index=True)
+                
+                # Open the messages of one window; silences show the hour either side of the gap
+                window_labels = [
+                    f"{'🔺' if row.kind == 'burst' else '🔻'} {row.start:%d %b %Y %H:%M} ({row.hours}h, {row.messages} messages)"
+                    for row in anomalies.itertuples()
+                ]
+                chosen_window = st.selectbox("Show messages from", window_labels)
+                window = anomalies.iloc[window_labels.index(chosen_window)].copy()
+                if window['kind'] == 'silence':
+                    window['start'] -= pd.Timedelta(hours=1)
+                    window['end'] += pd.Timedelta(hours=1)
+                in_window = window_messages(user_messages_df, window, activity_sender)
+                st.dataframe(
+                    in_window[['datetime_ist_human', 'sender', 'message']].head(200).rename(
+                        columns={'datetime_ist_human': 'Time', 'sender': 'Sender', 'message': 'Message'}),
+                    use_container_width=True, hide_index=True
+                )
+                if len(in_window) > 200:
+                    st.caption(f"Showing the first 200 of {len(in_window):,} messages.")
+            else:
+                st.info(f"No unusual bursts or silences found. Detection needs at least {MIN_WEEKS} weeks of chat, "
+                        f"and senders need {MIN_SENDER_MESSAGES} messages for a pattern of their own.")
     else:
         st.info("No messages available for timeline analysis.")
     
+    # Conversation sessions: runs of messages with no idle gap longer than the threshold
+    st.subheader("💬 Conversation Sessions")
+    if len(user_messages_df) > 0:
+        import plotly.express as px
+        
+        idle_gap = st.slider("Idle gap that ends a conversation (minutes)", 5, 240, DEFAULT_IDLE_GAP_MINUTES, step=5)
+        segmented = get_sessions(view_key, user_messages_df, idle_gap)
+        sessions_df = segmented["sessions"]
+        if selected_user != "Overall":
+            sessions_df = sessions_for_sender(segmented, selected_user)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Conversations", len(sessions_df))
+        with col2:
+            st.metric("Median Messages", f"{sessions_df['messages'].median():.0f}" if len(sessions_df) else "0")
+        with col3:
+            st.metric("Median Duration", f"{sessions_df['duration_minutes'].median():.0f} min" if len(sessions_df) else "0 min")
+        with col4:
+            if selected_user == "Overall":
+                st.metric("Avg Participants", f"{sessions_df['participants'].mean():.1f}" if len(sessions_df) else "0")
+            else:
+                st.metric("Conversations Started", int((sessions_df['initiator'] == selected_user).sum()))
+        
+        if len(sessions_df) > 0:
+            col1, col2 = st.columns(2)
+            with col1:
+                initiators = segmented["sessions"]['initiator'].value_counts().head(15).reset_index()
+                initiators.columns = ['Sender', 'Conversations Started']
+                fig_initiators = px.bar(initiators, x='Conversations Started', y='Sender', orientation='h',
+                                        title='Who Starts Conversations', height=400)
+                fig_initiators.update_layout(yaxis={'categoryorder': 'total ascending'})
+                st.plotly_chart(fig_initiators, use_container_width=True)
+            with col2:
+                per_month = sessions_df.groupby(sessions_df['start'].dt.to_period('M')).size().reset_index(name='Conversations')
+                per_month['Month'] = per_month['start'].astype(str)
+                fig_sessions = px.line(per_month, x='Month', y='Conversations', markers=True,
+                                       title='Conversations per Month', height=400)
+                st.plotly_chart(fig_sessions, use_container_width=True)
+            
+            st.markdown("**Longest Conversations**")
+            longest = sessions_df.nlargest(10, 'messages')
+            st.dataframe(
+                pd.DataFrame({
+                    'Start': longest['start'].dt.strftime('%d %b %Y, %I:%M %p'),
+                    'Duration (min)': longest['duration_minutes'].round(0).astype(int),
+                    'Messages': longest['messages'],
+                    'Participants': longest['participants'],
+                    'Started By': longest['initiator']
+                }),
+                use_container_width=True, hide_index=True
+            )
+    else:
+        st.info("No messages available for session analysis.")
+    
+    # Reply latency: how long after someone else's message a sender answers
+    st.subheader("⏱️ Response Times")
+    latency = get_response_times(chat_hash, user_messages_df)
+    if len(latency["replies"]) > 0:
+        import plotly.express as px
+        
+        if selected_user == "Overall":
+            sender_latency = latency["senders"].sort_values("median_seconds").head(20).reset_index()
+            sender_latency["Median (min)"] = sender_latency["median_seconds"] / 60
+            fig_latency = px.bar(sender_latency, x='Median (min)', y='sender', orientation='h',
+                                 hover_data={'replies': True, 'p90_seconds': True},
+                                 title='Median Reply Time per Member', labels={'sender': 'Member'}, height=450)
+            fig_latency.update_layout(yaxis={'categoryorder': 'total descending'})
+            st.plotly_chart(fig_latency, use_container_width=True)
+            
+            # Who replies to whom, for the most active repliers
+            top_repliers = latency["senders"]["replies"].nlargest(10).index
+            pair_grid = (latency["pairs"]["median_seconds"] / 60).unstack()
+            pair_grid = pair_grid.reindex(index=top_repliers, columns=top_repliers)
+            fig_pairs = px.imshow(pair_grid, color_continuous_scale='YlGnBu_r', aspect='auto',
+                                  labels={'x': 'Replying to', 'y': 'Reply from', 'color': 'Median (min)'},
+                                  title='Median Reply Time by Pair (minutes)', height=500)
+            st.plotly_chart(fig_pairs, use_container_width=True)
+        elif selected_user in latency["senders"].index:
+            own = latency["senders"].loc[selected_user]
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Replies", int(own["replies"]))
+            with col2:
+                st.metric("Median Reply Time", f"{own['median_seconds'] / 60:.1f} min")
+            with col3:
+                st.metric("90th Percentile", f"{own['p90_seconds'] / 60:.1f} min")
+            
+            pairs = latency["pairs"].reset_index()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"**How fast {selected_user} replies to**")
+                replies_from = pairs[pairs['sender'] == selected_user]
+                st.dataframe(pd.DataFrame({
+                    'Member': replies_from['replied_to'],
+                    'Replies': replies_from['replies'],
+                    'Median (min)': (replies_from['median_seconds'] / 60).round(1)
+                }).sort_values('Replies', ascending=False), use_container_width=True, hide_index=True)
+            with col2:
+                st.markdown(f"**How fast others reply to {selected_user}**")
+                replies_to = pairs[pairs['replied_to'] == selected_user]
+                st.dataframe(pd.DataFrame({
+                    'Member': replies_to['sender'],
+                    'Replies': replies_to['replies'],
+                    'Median (min)': (replies_to['median_seconds'] / 60).round(1)
+                }).sort_values('Replies', ascending=False), use_container_width=True, hide_index=True)
+        else:
+            st.info(f"{selected_user} has not replied to anyone yet.")
+    else:
+        st.info("No replies found to measure response times.")
+    
+    # Who talks to whom: replies and @-mentions between members
+    st.subheader("🕸️ Interaction Network")
+    graph, centrality_df, pairs_df = get_interaction_graph(chat_hash, user_messages_df)
+    if len(pairs_df) > 0:
+        import numpy as np
+        import plotly.graph_objects as go
+        
+        # Circular layout of the most central members; edge width follows interaction count
+        members = centrality_df.head(25).index.tolist()
+        if selected_user != "Overall" and selected_user in centrality_df.index and selected_user not in members:
+            members[-1] = selected_user
+        angles = 2 * np.pi * np.arange(len(members)) / len(members)
+        positions = {member: (np.cos(angle), np.sin(angle)) for member, angle in zip(members, angles)}
+        shown_pairs = pairs_df[pairs_df['member_a'].isin(members) & pairs_df['member_b'].isin(members)].head(60)
+        max_weight = shown_pairs['weight'].max() if len(shown_pairs) else 1
+        
+        fig_network = go.Figure()
+        for pair in shown_pairs.itertuples():
+            involves_user = selected_user in (pair.member_a, pair.member_b)
+            (x0, y0), (x1, y1) = positions[pair.member_a], positions[pair.member_b]
+            fig_network.add_trace(go.Scatter(
+                x=[x0, 0.25 * (x0 + x1), x1], y=[y0, 0.25 * (y0 + y1), y1], mode='lines',
+                line=dict(width=1 + 9 * pair.weight / max_weight, shape='spline',
+                          color='rgba(214, 39, 40, 0.7)' if involves_user else 'rgba(31, 119, 180, 0.35)'),
+                hoverinfo='text', text=f"{pair.member_a} ↔ {pair.member_b}: {pair.replies} replies, {pair.mentions} mentions",
+                showlegend=False
+            ))
+        node_scores = centrality_df.loc[members]
+        fig_network.add_trace(go.Scatter(
+            x=[positions[m][0] for m in members], y=[positions[m][1] for m in members],
+            mode='markers+text', text=members, textposition='top center',
+            marker=dict(size=12 + 40 * node_scores['pagerank'] / node_scores['pagerank'].max(), color='#2ca02c'),
+            hovertext=[f"{m}<br>Sent: {row.out_strength}<br>Received: {row.in_strength}<br>Partners: {row.partners}"
+                       for m, row in zip(members, node_scores.itertuples())],
+            hoverinfo='text', showlegend=False
+        ))
+        fig_network.update_layout(
+            title='Replies and Mentions Between Members', height=650,
+            xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor='x')
+        )
+        st.plotly_chart(fig_network, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Most Central Members**")
+            st.dataframe(pd.DataFrame({
+                'Member': centrality_df.index,
+                'Interactions Sent': centrality_df['out_strength'].to_numpy(),
+                'Interactions Received': centrality_df['in_strength'].to_numpy(),
+                'Partners': centrality_df['partners'].to_numpy(),
+                'PageRank': centrality_df['pagerank'].round(3).to_numpy()
+            }).head(15), use_container_width=True, hide_index=True)
+        with col2:
+            if selected_user == "Overall":
+                st.markdown("**Top Pairs**")
+                user_pairs = pairs_df
+            else:
+                st.markdown(f"**{selected_user}'s Top Partners**")
+                user_pairs = pairs_df[(pairs_df['member_a'] == selected_user) | (pairs_df['member_b'] == selected_user)]
+            st.dataframe(user_pairs.head(15).rename(columns={
+                'member_a': 'Member A', 'member_b': 'Member B', 'replies': 'Replies', 'mentions': 'Mentions', 'weight': 'Total'
+            }), use_container_width=True, hide_index=True)
+    else:
+        st.info("No interactions between members found.")
+    
+    # Full-text search over the inverted index
+    st.subheader("🔎 Search Messages")
+    search_index = get_search_index(view_key, user_messages_df)
+    search_query = st.text_input(
+        "Search", placeholder='e.g. court "kal milte" OR game -party',
+        help='Words are ANDed, "quotes" match a phrase, OR matches either side, -word excludes'
+    )
+    if search_query.strip():
+        chat_dates = pd.to_datetime(user_messages_df['datetime_ist'], format='ISO8601')
+        date_range = st.date_input(
+            "Date range", value=(chat_dates.min().date(), chat_dates.max().date()),
+            min_value=chat_dates.min().date(), max_value=chat_dates.max().date()
+        )
+        # The picker returns a single date while the user is still choosing the range end
+        start_date, end_date = (list(date_range) + [None, None])[:2]
+        started = time.perf_counter()
+        match_ids = search_index.search(
+            search_query,
+            senders=None if selected_user == "Overall" else [selected_user],
+            start=start_date, end=end_date
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.caption(f"{len(match_ids):,} matching messages in {elapsed_ms:.1f} ms")
+        if len(match_ids) > 0:
+            results_df = user_messages_df.iloc[match_ids[:200]][['datetime_ist_human', 'sender', 'message']]
+            st.dataframe(
+                results_df.rename(columns={'datetime_ist_human': 'Time', 'sender': 'Sender', 'message': 'Message'}),
+                use_container_width=True, hide_index=True
+            )
+            if len(match_ids) > 200:
+                st.caption("Showing the first 200 matches.")
+    
     # Show sample data
     st.subheader("📋 Sample Messages")
     if len(filtered_df) > 0:
@@ -735,6 +1227,24 @@ if uploaded_file:
     else:
         st.warning("No messages found for the selected user.")
     
+    # Page through the stored copy instead of holding every row in the table widget
+    if use_store:
+        with st.expander("🗄️ Browse Stored Messages"):
+            page_sender = None if selected_user == "Overall" else selected_user
+            page_size = 100
+            with chat_store() as store:
+                stored_chat_id = find_chat(store, chat_hash)
+                total_pages = max(1, -(-count_messages(store, stored_chat_id, sender=page_sender) // page_size))
+            page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1)
+            with chat_store() as store:
+                page_df = fetch_messages_page(store, stored_chat_id, page=page - 1, page_size=page_size, sender=page_sender)
+            st.dataframe(
+                page_df[['datetime_ist_human', 'sender', 'message', 'media']].rename(columns={
+                    'datetime_ist_human': 'Time', 'sender': 'Sender', 'message': 'Message', 'media': 'Media Type'
+                }),
+                use_container_width=True, hide_index=True
+            )
+    
     # Debug section (expandable)
     with st.expander("🔍 Debug Information"):
         st.write("**Master DataFrame Info:**")
@@ -743,6 +1253,9 @@ if uploaded_file:
         st.write(f"- User messages: {len(user_messages_df)}")
         st.write(f"- Media messages: {len(master_df[master_df['media'] != ''])}")
         st.write(f"- All senders: {list(master_df['sender'].unique())}")
+        st.write(f"- Skipped (quarantined) lines: {len(quarantine_df)}")
+        if len(quarantine_df) > 0:
+            st.dataframe(quarantine_df.head(100), use_container_width=True, hide_index=True)
         
         st.write("\n**Filtered DataFrame Info:**")
         st.write(f"- Filtered rows: {len(filtered_df)}")
@@ -790,16 +1303,9 @@ if uploaded_file:
             st.write(f"- Messages with only emojis: {len(emoji_messages[emoji_messages['message'] == ''])}")
             
             # Show most common emojis
-            all_emojis = []
-            for emoji_str in emoji_messages['emojis']:
-                if emoji_str:
-                    all_emojis.extend(emoji_str.split(' '))
-            
-            if all_emojis:
-                from collections import Counter
-                emoji_counts = Counter(all_emojis)
+            if len(emoji_counts) > 0:
                 st.write("\n**Most Common Emojis:**")
-                for emoji, count in emoji_counts.most_common(10):
+                for emoji, count in emoji_counts.head(10).items():
                     st.write(f"- {emoji}: {count}")
         
         st.write("\n**Sample from Master DataFrame:**")
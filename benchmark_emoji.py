@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark the emoji tokenizer against the old code-point regex and the sequence trie walk
+Usage: python benchmark_emoji.py [chat_file]
+"""
+
+import random
+import re
+import sys
+import time
+from emoji_tokenizer import find_emojis, strip_emojis, walk_sequence_trie
+
+# The character-class regex extract_message_data used before the emoji tokenizer
+legacy_emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002600-\U000026FF\U00002700-\U000027BF\U0001F900-\U0001F9FF\U0001F018-\U0001F270\U0001F000-\U0001F02F\U0001F0A0-\U0001F0FF\U0001F100-\U0001F64F\U0001F170-\U0001F251]', re.UNICODE)
+
+def emoji_heavy_messages(count=100000, seed=7):
+    """Generate synthetic emoji-heavy chat messages."""
+    rng = random.Random(seed)
+    pieces = ["haha", "kal milte", "ok", "game night?", "bhai", "😂", "😂😂😂", "👍🏽", "👨‍👩‍👧",
+              "🇮🇳", "❤️", "🔥", "🏃‍♀️", "1️⃣", "🙏🏻", "🎉🎉"]
+    return [" ".join(rng.choice(pieces) for _ in range(rng.randint(1, 10))) for _ in range(count)]
+
+def load_messages(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f]
+
+def time_it(func, messages):
+    start = time.perf_counter()
+    for message in messages:
+        func(message)
+    return time.perf_counter() - start
+
+def main():
+    messages = load_messages(sys.argv[1]) if len(sys.argv) > 1 else emoji_heavy_messages()
+    print(f"Benchmarking {len(messages)} messages")
+
+    legacy_find = time_it(lambda m: [(x.group(), x.start(), x.end()) for x in legacy_emoji_pattern.finditer(m)], messages)
+    walk_find = time_it(walk_sequence_trie, messages)
+    tokenizer_find = time_it(find_emojis, messages)
+    legacy_strip = time_it(lambda m: legacy_emoji_pattern.sub('', m), messages)
+    tokenizer_strip = time_it(strip_emojis, messages)
+
+    print(f"Extract - legacy regex: {legacy_find:.3f}s, trie walk: {walk_find:.3f}s ({walk_find / legacy_find:.2f}x), "
+          f"tokenizer: {tokenizer_find:.3f}s ({tokenizer_find / legacy_find:.2f}x)")
+    print(f"Strip   - legacy regex: {legacy_strip:.3f}s, tokenizer: {tokenizer_strip:.3f}s ({tokenizer_strip / legacy_strip:.2f}x)")
+
+    legacy_total = sum(len(legacy_emoji_pattern.findall(m)) for m in messages)
+    tokenizer_total = sum(len(find_emojis(m)) for m in messages)
+    print(f"Emojis found - legacy regex: {legacy_total}, tokenizer: {tokenizer_total}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Media placeholders differ between exports ("image omitted" vs "<Media omitted>"),
+# so every media message gets the same fingerprint text
+MEDIA_FINGERPRINT_TEXT = "<media>"
+whitespace_regex = re.compile(r"\s+")
+
+def normalize_sender_key(senders: pd.Series) -> pd.Series:
+    """Case- and spacing-insensitive sender key (names are already normalized by the parser)."""
+    return senders.astype(str).str.casefold().str.replace(whitespace_regex, " ", regex=True).str.strip()
+
+def text_fingerprint(df: pd.DataFrame) -> pd.Series:
+    """64-bit hash of the cleaned message text, lowercased with whitespace collapsed."""
+    text = df["message"].fillna("").astype(str).str.lower().str.replace(whitespace_regex, " ", regex=True).str.strip()
+    if "media" in df.columns:
+        text = text.mask(df["media"].fillna("") != "", MEDIA_FINGERPRINT_TEXT)
+    return pd.Series(pd.util.hash_pandas_object(text, index=False).to_numpy(), index=df.index)
+
+def alignment_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the join keys for one export.
+
+    Columns: row (position in df), minute (timestamp truncated to the minute, the
+    resolution both export formats share), sender_key, fingerprint, and occurrence
+    (running count of identical keys, so repeated messages pair up one-to-one).
+    """
+    keys = pd.DataFrame({
+        "row": range(len(df)),
+        "minute": pd.to_datetime(df["datetime_ist"], format="ISO8601").dt.floor("min").to_numpy(),
+        "sender_key": normalize_sender_key(df["sender"]).to_numpy(),
+        "fingerprint": text_fingerprint(df).to_numpy()
+    })
+    keys["occurrence"] = keys.groupby(["minute", "sender_key", "fingerprint"], sort=False).cumcount()
+    return keys
+
+def align_exports(pc_df: pd.DataFrame, mobile_df: pd.DataFrame) -> dict:
+    """
+    Align two exports of the same chat with hash joins instead of comparing by row position.
+
+    Messages are matched on (minute, sender, text fingerprint). Unmatched messages
+    that share a minute and sender are paired as changed (same message, different
+    text); whatever is left is deleted (only in the PC export) or inserted (only in
+    the mobile export).
+
+    Returns a dict with:
+        matched:  DataFrame[pc_row, mobile_row]
+        changed:  DataFrame[pc_row, mobile_row, minute, sender, pc_message, mobile_message]
+        deleted:  DataFrame of PC rows with no counterpart (original columns plus pc_row)
+        inserted: DataFrame of mobile rows with no counterpart (original columns plus mobile_row)
+        summary:  counts of each category
+    Row numbers are positions in the frames that were passed in.
+    """
+    pc_keys = alignment_keys(pc_df)
+    mobile_keys = alignment_keys(mobile_df)
+    key_columns = ["minute", "sender_key", "fingerprint", "occurrence"]
+
+    exact = pc_keys.merge(mobile_keys, on=key_columns, how="outer", suffixes=("_pc", "_mobile"), indicator=True)
+    matched = exact.loc[exact["_merge"] == "both", ["row_pc", "row_mobile"]].astype("int64")
+
+    # Leftovers in the same minute from the same sender are edits of one message
+    pc_left = exact.loc[exact["_merge"] == "left_only", ["row_pc", "minute", "sender_key"]]
+    mobile_left = exact.loc[exact["_merge"] == "right_only", ["row_mobile", "minute", "sender_key"]]
+    pc_left = pc_left.assign(slot=pc_left.sort_values("row_pc").groupby(["minute", "sender_key"]).cumcount())
+    mobile_left = mobile_left.assign(slot=mobile_left.sort_values("row_mobile").groupby(["minute", "sender_key"]).cumcount())
+    paired = pc_left.merge(mobile_left, on=["minute", "sender_key", "slot"], how="inner")
+    pc_rows = paired["row_pc"].astype("int64").to_numpy()
+    mobile_rows = paired["row_mobile"].astype("int64").to_numpy()
+
+    changed = pd.DataFrame({
+        "pc_row": pc_rows,
+        "mobile_row": mobile_rows,
+        "minute": paired["minute"].to_numpy(),
+        "sender": pc_df["sender"].to_numpy()[pc_rows],
+        "pc_message": pc_df["message"].to_numpy()[pc_rows],
+        "mobile_message": mobile_df["message"].to_numpy()[mobile_rows]
+    }).sort_values("pc_row", ignore_index=True)
+
+    deleted_rows = np.setdiff1d(pc_left["row_pc"].to_numpy(dtype=np.int64), pc_rows)
+    inserted_rows = np.setdiff1d(mobile_left["row_mobile"].to_numpy(dtype=np.int64), mobile_rows)
+    deleted = pc_df.iloc[deleted_rows].assign(pc_row=deleted_rows)
+    inserted = mobile_df.iloc[inserted_rows].assign(mobile_row=inserted_rows)
+
+    return {
+        "matched": matched.rename(columns={"row_pc": "pc_row", "row_mobile": "mobile_row"})
+                          .sort_values("pc_row", ignore_index=True),
+        "changed": changed,
+        "deleted": deleted,
+        "inserted": inserted,
+        "summary": {
+            "pc_messages": len(pc_df),
+            "mobile_messages": len(mobile_df),
+            "matched": len(matched),
+            "changed": len(changed),
+            "deleted": len(deleted),
+            "inserted": len(inserted)
+        }
+    }
@@ -0,0 +1,64 @@
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from parser import parse_chat_file
+from chat_alignment import alignment_keys
+
+def message_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Stable 64-bit content hash per message.
+
+    Hashes (minute, normalized sender, cleaned text fingerprint, occurrence) from
+    chat_alignment.alignment_keys. Minutes are the timestamp resolution every
+    export format shares, media messages share one fingerprint because exports
+    label the same attachment differently, and the occurrence count keeps
+    genuinely repeated messages ("ok", "ok") distinct.
+    """
+    keys = alignment_keys(df)[["minute", "sender_key", "fingerprint", "occurrence"]]
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def merge_chat_frames(frames: Iterable[pd.DataFrame], names: Optional[Iterable[str]] = None):
+    """
+    Combine parsed exports of one chat into a single deduplicated timeline.
+
+    Messages are kept the first time their content hash is seen, so earlier
+    frames win; pass the most detailed export (e.g. PC, with seconds and
+    specific media types) first. Deduplication is one hash-table pass over all
+    rows, linear in the total number of messages.
+
+    Returns (merged DataFrame sorted by datetime_ist with a fresh index, stats).
+    """
+    frames = list(frames)
+    names = list(names) if names is not None else [f"export {i + 1}" for i in range(len(frames))]
+    if not frames:
+        return pd.DataFrame(), {"exports": [], "total_messages": 0, "duplicates_removed": 0, "merged_messages": 0}
+
+    hashes = np.concatenate([message_hashes(frame) for frame in frames])
+    combined = pd.concat(frames, ignore_index=True)
+    keep = ~pd.Series(hashes).duplicated().to_numpy()
+    merged = combined[keep].sort_values("datetime_ist", kind="stable", ignore_index=True)
+
+    # Unique messages contributed by each export (messages no earlier export had)
+    source = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+    new_counts = np.bincount(source[keep], minlength=len(frames))
+    return merged, {
+        "exports": [
+            {"name": name, "messages": len(frame), "new_messages": int(new)}
+            for name, frame, new in zip(names, frames, new_counts)
+        ],
+        "total_messages": len(combined),
+        "duplicates_removed": int(len(combined) - keep.sum()),
+        "merged_messages": len(merged)
+    }
+
+def merge_chat_files(files, utc_offset_hours=0, timezone: Optional[str] = None):
+    """
+    Parse several exports of the same chat with parse_chat_file and merge them.
+
+    files are paths or file objects, in order of preference (see merge_chat_frames).
+    Returns (merged DataFrame, stats).
+    """
+    files = list(files)
+    frames = [parse_chat_file(file, utc_offset_hours=utc_offset_hours, timezone=timezone) for file in files]
+    names = [file if isinstance(file, str) else getattr(file, "name", f"export {i + 1}") for i, file in enumerate(files)]
+    return merge_chat_frames(frames, names)
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+SQLite persistence for parsed chats.
+
+Stores parse_chat_file output in a local database so exports can be queried
+later without re-parsing:
+
+    messages      one row per parsed message, indexed on sender and timestamp
+    entities      one row per extracted URL / phone / email / money / mention / emoji
+    messages_fts  FTS5 index over the cleaned message text
+
+Usage:
+    python chat_store.py import chat.txt [--db whatsapp_chats.db] [--name "Family group"]
+    python chat_store.py list [--db whatsapp_chats.db]
+    python chat_store.py query "SELECT sender, COUNT(*) FROM messages GROUP BY sender"
+    python chat_store.py query --saved media_per_sender_month --param chat=1
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Optional
+import pandas as pd
+
+DEFAULT_DB_PATH = "whatsapp_chats.db"
+
+# Parser output columns, stored as-is so a stored chat loads back into the same DataFrame.
+# Each column is declared with its SQLite type; adding one changes the schema explicitly
+TEXT_COLUMNS = [
+    "datetime_ist", "datetime_ist_human", "datetime_utc", "sender",
+    "raw_message", "message", "media", "media_file_name", "urls", "url_positions",
+    "phone_numbers", "phone_positions", "emails", "email_positions",
+    "money_amounts", "money_positions", "mentions", "mention_positions",
+    "emojis", "emoji_positions", "message_modifier"
+]
+INTEGER_COLUMNS = ["group_system_message", "year", "month", "day", "hour", "minute", "enhanced_from_pc"]
+MESSAGE_COLUMNS = TEXT_COLUMNS + INTEGER_COLUMNS
+BOOL_COLUMNS = ["group_system_message", "enhanced_from_pc"]
+
+# (positions column, entity kind, key holding the matched text)
+ENTITY_SOURCES = [
+    ("url_positions", "url", "item"),
+    ("phone_positions", "phone", "item"),
+    ("email_positions", "email", "item"),
+    ("money_positions", "money", "item"),
+    ("mention_positions", "mention", "item"),
+    ("emoji_positions", "emoji", "emoji")
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS chats (
+    id INTEGER PRIMARY KEY,
+    chat_hash TEXT NOT NULL UNIQUE,
+    name TEXT,
+    imported_at TEXT NOT NULL,
+    message_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    chat_id INTEGER NOT NULL REFERENCES chats(id),
+    {", ".join(f"{column} TEXT" for column in TEXT_COLUMNS)},
+    {", ".join(f"{column} INTEGER" for column in INTEGER_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS idx_messages_time ON messages(chat_id, datetime_ist);
+CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(chat_id, sender, datetime_ist);
+CREATE TABLE IF NOT EXISTS entities (
+    message_id INTEGER NOT NULL REFERENCES messages(id),
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    start_pos INTEGER,
+    end_pos INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_entities_message ON entities(message_id);
+CREATE INDEX IF NOT EXISTS idx_entities_kind ON entities(kind, value);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    message, content='messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+def open_store(path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """
+    Open (and create if needed) a chat database.
+
+    The connection may be handed between threads, but callers sharing it
+    must serialize its use (the app holds a lock around every store call).
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def chat_hash_for(file_bytes: bytes) -> str:
+    """Identify an export by its content, matching the app's upload cache key."""
+    return hashlib.sha1(file_bytes).hexdigest()
+
+def find_chat(conn: sqlite3.Connection, chat_hash: str) -> Optional[int]:
+    """Return the id of a stored chat, or None if it was never imported."""
+    row = conn.execute("SELECT id FROM chats WHERE chat_hash = ?", (chat_hash,)).fetchone()
+    return row[0] if row else None
+
+def _entity_rows(df: pd.DataFrame, message_ids):
+    """Yield (message_id, kind, value, start, end) for every extracted entity."""
+    for column, kind, value_key in ENTITY_SOURCES:
+        if column not in df.columns:
+            continue
+        positions = df[column].to_numpy()
+        for row in (positions != "").nonzero()[0]:
+            for entity in json.loads(positions[row]):
+                yield (int(message_ids[row]), kind, entity[value_key], entity["start"], entity["end"])
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def save_chat(conn: sqlite3.Connection, df: pd.DataFrame, chat_hash: str, name: Optional[str] = None,
+              replace: bool = False, batch_size: int = 50_000) -> int:
+    """
+    Store a parsed chat and return its chat id.
+
+    Chats are keyed by content hash, so importing the same export twice is a
+    no-op unless replace=True. Rows are written with executemany in batches
+    inside a single transaction; the FTS index is filled in one statement
+    afterwards.
+    """
+    existing = find_chat(conn, chat_hash)
+    if existing is not None and not replace:
+        return existing
+
+    with conn:
+        if existing is not None:
+            delete_chat(conn, existing, commit=False)
+        chat_id = conn.execute(
+            "INSERT INTO chats (chat_hash, name, imported_at, message_count) VALUES (?, ?, ?, ?)",
+            (chat_hash, name, datetime.now().isoformat(timespec="seconds"), len(df))
+        ).lastrowid
+
+        # Assign message ids up front so entity rows can reference them without a lookup
+        first_id = (conn.execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]) + 1
+        message_ids = range(first_id, first_id + len(df))
+        columns = df.reindex(columns=MESSAGE_COLUMNS, fill_value="")
+        for column in BOOL_COLUMNS:
+            columns[column] = columns[column].fillna(False).astype(bool).astype(int)
+        columns = columns.astype(object).where(columns.notna(), None)
+        rows = ((message_id, chat_id, *values)
+                for message_id, values in zip(message_ids, columns.itertuples(index=False, name=None)))
+        placeholders = ", ".join("?" * (len(MESSAGE_COLUMNS) + 2))
+        for batch in _batches(rows, batch_size):
+            conn.executemany(
+                f"INSERT INTO messages (id, chat_id, {', '.join(MESSAGE_COLUMNS)}) VALUES ({placeholders})", batch
+            )
+        for batch in _batches(_entity_rows(df, message_ids), batch_size):
+            conn.executemany("INSERT INTO entities VALUES (?, ?, ?, ?, ?)", batch)
+        conn.execute(
+            "INSERT INTO messages_fts (rowid, message) SELECT id, message FROM messages WHERE chat_id = ?", (chat_id,)
+        )
+    return chat_id
+
+def delete_chat(conn: sqlite3.Connection, chat_id: int, commit: bool = True):
+    """Remove a stored chat with its entities and FTS rows."""
+    statements = [
+        ("INSERT INTO messages_fts (messages_fts, rowid, message) "
+         "SELECT 'delete', id, message FROM messages WHERE chat_id = ?"),
+        "DELETE FROM entities WHERE message_id IN (SELECT id FROM messages WHERE chat_id = ?)",
+        "DELETE FROM messages WHERE chat_id = ?",
+        "DELETE FROM chats WHERE id = ?"
+    ]
+    for statement in statements:
+        conn.execute(statement, (chat_id,))
+    if commit:
+        conn.commit()
+
+def list_chats(conn: sqlite3.Connection) -> pd.DataFrame:
+    """All stored chats, most recently imported first."""
+    return pd.read_sql_query(
+        "SELECT id, chat_hash, name, imported_at, message_count FROM chats ORDER BY imported_at DESC, id DESC", conn
+    )
+
+def _filters(chat_id, sender=None, start=None, end=None):
+    clauses, params = ["chat_id = ?"], [chat_id]
+    if sender is not None:
+        clauses.append("sender = ?")
+        params.append(sender)
+    if start is not None:
+        clauses.append("datetime_ist >= ?")
+        params.append(pd.Timestamp(start).isoformat())
+    if end is not None:
+        if isinstance(end, datetime):
+            clauses.append("datetime_ist <= ?")
+            params.append(pd.Timestamp(end).isoformat())
+        else:
+            # A bare date includes the whole day
+            clauses.append("datetime_ist < ?")
+            params.append(pd.Timestamp(end + timedelta(days=1)).isoformat())
+    return " AND ".join(clauses), params
+
+def _to_frame(df: pd.DataFrame) -> pd.DataFrame:
+    from parser import message_languages
+    for column in BOOL_COLUMNS:
+        df[column] = df[column].astype(bool)
+    # Languages are derived from the text, so they are labelled on load rather than stored
+    df["language"] = message_languages(df)
+    return df
+
+def load_chat_messages(conn: sqlite3.Connection, chat_id: int, sender: Optional[str] = None,
+                       start=None, end=None) -> pd.DataFrame:
+    """Load a stored chat back into the DataFrame shape parse_chat_file returns."""
+    where, params = _filters(chat_id, sender, start, end)
+    return _to_frame(pd.read_sql_query(
+        f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages WHERE {where} ORDER BY datetime_ist, id", conn, params=params
+    ))
+
+def count_messages(conn: sqlite3.Connection, chat_id: int, sender: Optional[str] = None,
+                   start=None, end=None) -> int:
+    """Number of stored messages matching the filters."""
+    where, params = _filters(chat_id, sender, start, end)
+    return conn.execute(f"SELECT COUNT(*) FROM messages WHERE {where}", params).fetchone()[0]
+
+def fetch_messages_page(conn: sqlite3.Connection, chat_id: int, page: int = 0, page_size: int = 100,
+                        sender: Optional[str] = None, start=None, end=None) -> pd.DataFrame:
+    """One page of messages in chronological order, read straight from the timestamp/sender indexes."""
+    where, params = _filters(chat_id, sender, start, end)
+    return _to_frame(pd.read_sql_query(
+        f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages WHERE {where} "
+        "ORDER BY datetime_ist, id LIMIT ? OFFSET ?",
+        conn, params=params + [page_size, page * page_size]
+    ))
+
+def search_messages(conn: sqlite3.Connection, chat_id: int, query: str, limit: int = 200) -> pd.DataFrame:
+    """Full-text search one chat with FTS5 query syntax, best matches first."""
+    return _to_frame(pd.read_sql_query(
+        f"SELECT {', '.join('m.' + column for column in MESSAGE_COLUMNS)} FROM messages_fts "
+        "JOIN messages m ON m.id = messages_fts.rowid "
+        "WHERE messages_fts MATCH ? AND m.chat_id = ? ORDER BY messages_fts.rank LIMIT ?",
+        conn, params=[query, chat_id, limit]
+    ))
+
+# Ready-made queries for questions that used to need a throwaway parsing script.
+# :chat and :other are chat ids from list_chats().
+SAVED_QUERIES = {
+    "messages_per_sender_month": (
+        "Messages per sender per month",
+        """SELECT sender, printf('%04d-%02d', year, month) AS month, COUNT(*) AS messages
+           FROM messages WHERE chat_id = :chat AND sender != 'group_notification'
+           GROUP BY sender, year, month ORDER BY month, messages DESC, sender"""
+    ),
+    "media_per_sender_month": (
+        "Media messages per sender per month",
+        """SELECT sender, printf('%04d-%02d', year, month) AS month, COUNT(*) AS media_messages
+           FROM messages WHERE chat_id = :chat AND media != ''
+           GROUP BY sender, year, month ORDER BY month, media_messages DESC, sender"""
+    ),
+    "media_types": (
+        "Media type counts in two chats side by side (e.g. PC vs mobile export)",
+        """SELECT media, SUM(chat_id = :chat) AS chat_count, SUM(chat_id = :other) AS other_count,
+                  SUM(chat_id = :chat) - SUM(chat_id = :other) AS difference
+           FROM messages WHERE chat_id IN (:chat, :other) AND media != ''
+           GROUP BY media ORDER BY chat_count DESC, media"""
+    ),
+    "missing_media": (
+        "Media messages in :chat with no media message in :other in the same minute",
+        """SELECT a.id AS message_id, a.datetime_ist, a.sender, a.media, a.raw_message
+           FROM messages a
+           WHERE a.chat_id = :chat AND a.media != '' AND NOT EXISTS (
+               SELECT 1 FROM messages b
+               WHERE b.chat_id = :other AND b.media != ''
+                 AND b.datetime_ist >= substr(a.datetime_ist, 1, 16)
+                 AND b.datetime_ist < substr(a.datetime_ist, 1, 16) || ':99')
+           ORDER BY a.datetime_ist"""
+    ),
+    "generic_media": (
+        "Media messages whose type could not be identified",
+        """SELECT datetime_ist, sender, raw_message, message FROM messages
+           WHERE chat_id = :chat AND media = 'media' ORDER BY datetime_ist"""
+    )
+}
+
+def run_query(conn: sqlite3.Connection, sql: str, params=None) -> pd.DataFrame:
+    """Run an SQL query against the store (tables: chats, messages, entities, messages_fts)."""
+    return pd.read_sql_query(sql, conn, params=params)
+
+def run_saved_query(conn: sqlite3.Connection, name: str, **params) -> pd.DataFrame:
+    """Run one of SAVED_QUERIES by name with its named parameters."""
+    if name not in SAVED_QUERIES:
+        raise KeyError(f"Unknown saved query '{name}'. Available: {', '.join(SAVED_QUERIES)}")
+    return run_query(conn, SAVED_QUERIES[name][1], params)
+
+def import_chat_file(conn: sqlite3.Connection, path: str, name: Optional[str] = None, replace: bool = False) -> int:
+    """Parse and store a chat export unless the same file is already stored; returns its chat id."""
+    from parser import parse_chat_file
+
+    with open(path, "rb") as f:
+        chat_hash = chat_hash_for(f.read())
+    chat_id = find_chat(conn, chat_hash)
+    if chat_id is not None and not replace:
+        return chat_id
+    return save_chat(conn, parse_chat_file(path), chat_hash, name=name or path, replace=replace)
+
+def _param_value(value: str):
+    return int(value) if value.lstrip("-").isdigit() else value
+
+def main():
+    db_option = argparse.ArgumentParser(add_help=False)
+    db_option.add_argument("--db", default=DEFAULT_DB_PATH, help="database path")
+    arg_parser = argparse.ArgumentParser(description="Store and query parsed WhatsApp chats in SQLite")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    import_command = commands.add_parser("import", parents=[db_option], help="parse a chat export and store it")
+    import_command.add_argument("chat_file")
+    import_command.add_argument("--name", help="display name (defaults to the file name)")
+    import_command.add_argument("--replace", action="store_true", help="re-import an already stored export")
+    commands.add_parser("list", parents=[db_option], help="list stored chats")
+    query_command = commands.add_parser("query", parents=[db_option], help="run an SQL or saved query")
+    query_command.add_argument("sql", nargs="?", help="SQL to run (omit when using --saved)")
+    query_command.add_argument("--saved", choices=sorted(SAVED_QUERIES), help="run a saved query instead")
+    query_command.add_argument("--param", action="append", default=[], metavar="NAME=VALUE",
+                               help="named query parameter, e.g. --param chat=1")
+    query_command.add_argument("--csv", metavar="PATH", help="write results to a CSV file")
+    args = arg_parser.parse_args()
+
+    conn = open_store(args.db)
+    if args.command == "import":
+        with open(args.chat_file, "rb") as f:
+            existing = find_chat(conn, chat_hash_for(f.read()))
+        if existing is not None and not args.replace:
+            print(f"⏭️  Already stored as chat {existing}: {args.chat_file}")
+            return
+        chat_id = import_chat_file(conn, args.chat_file, name=args.name, replace=args.replace)
+        print(f"✅ Stored {count_messages(conn, chat_id)} messages as chat {chat_id} in {args.db}")
+    elif args.command == "list":
+        print(list_chats(conn).to_string(index=False))
+    else:
+        if not args.sql and not args.saved:
+            query_command.error("give an SQL query or --saved NAME")
+        params = dict(param.split("=", 1) for param in args.param)
+        params = {key: _param_value(value) for key, value in params.items()}
+        # Ad-hoc queries must not modify the store
+        conn.execute("PRAGMA query_only = ON")
+        if args.saved:
+            result = run_saved_query(conn, args.saved, **params)
+        else:
+            result = run_query(conn, args.sql, params)
+        if args.csv:
+            result.to_csv(args.csv, index=False)
+            print(f"✅ Wrote {len(result)} rows to {args.csv}")
+        else:
+            print(result.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
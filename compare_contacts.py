@@ -4,22 +4,20 @@ Compare contact messages between PC and mobile WhatsApp parsing outputs.
 This script will help identify why mobile parsing shows fewer contacts than PC.
 """
 
-import json
-from datetime import timedelta
+from chat_alignment import align_exports
 from parser import parse_chat_file
 
+CONTACT_PATTERNS = ['contact card', 'vcf', 'omitted', 'file attached']
+
 def parse_whatsapp_chat(file_path):
     """Wrapper function to parse WhatsApp chat and return dict with messages and contacts."""
-    df = parse_chat_file(file_path)
-    
-    # Convert DataFrame to list of dictionaries
-    messages = df.to_dict('records')
+    df = parse_chat_file(file_path).reset_index(drop=True)
     
     # Extract unique contacts (senders)
     contacts = df[df['sender'] != 'group_notification']['sender'].unique().tolist()
     
     return {
-        'messages': messages,
+        'messages': df,
         'contacts': contacts
     }
 
@@ -46,8 +44,8 @@ def compare_contact_messages():
         return
     
     # Extract contact messages
-    pc_contacts = [msg for msg in pc_messages if msg.get('media') == 'contact']
-    mobile_contacts = [msg for msg in mobile_messages if msg.get('media') == 'contact']
+    pc_contacts = pc_messages[pc_messages['media'] == 'contact'].reset_index(drop=True)
+    mobile_contacts = mobile_messages[mobile_messages['media'] == 'contact'].reset_index(drop=True)
     
     print(f"\nSummary:")
     print(f"PC total messages: {len(pc_messages)}")
@@ -87,112 +85,57 @@ def compare_contact_messages():
     
     # Show sample contact messages from each
     print(f"\nSample PC contact messages (first 5):")
-    for i, msg in enumerate(pc_contacts[:5]):
-        print(f"{i+1}. {msg['datetime_ist_human']} - {msg['sender']}: {msg['raw_message'][:100]}...")
+    for i, msg in enumerate(pc_contacts.head(5).itertuples(), start=1):
+        print(f"{i}. {msg.datetime_ist_human} - {msg.sender}: {msg.raw_message[:100]}...")
     
     print(f"\nSample mobile contact messages (first 5):")
-    for i, msg in enumerate(mobile_contacts[:5]):
-        print(f"{i+1}. {msg['datetime_ist_human']} - {msg['sender']}: {msg['raw_message'][:100]}...")
+    for i, msg in enumerate(mobile_contacts.head(5).itertuples(), start=1):
+        print(f"{i}. {msg.datetime_ist_human} - {msg.sender}: {msg.raw_message[:100]}...")
     
-    # Find messages that appear in PC but not in mobile
+    # Find contact messages present in one export but not the other
     print(f"\nAnalyzing discrepancies...")
     
-    # Create sets of message identifiers for comparison
-    pc_contact_ids = set()
-    mobile_contact_ids = set()
-    
-    for msg in pc_contacts:
-        # Use timestamp + sender + first 50 chars of raw message as identifier
-        identifier = f"{msg['datetime_ist']}_{msg['sender']}_{msg['raw_message'][:50]}"
-        pc_contact_ids.add(identifier)
-    
-    for msg in mobile_contacts:
-        identifier = f"{msg['datetime_ist']}_{msg['sender']}_{msg['raw_message'][:50]}"
-        mobile_contact_ids.add(identifier)
-    
-    # Find messages only in PC
-    only_in_pc = pc_contact_ids - mobile_contact_ids
-    only_in_mobile = mobile_contact_ids - pc_contact_ids
+    alignment = align_exports(pc_contacts, mobile_contacts)
+    only_in_pc = alignment['deleted']
+    only_in_mobile = alignment['inserted']
     
     print(f"Messages only detected as contacts in PC: {len(only_in_pc)}")
     print(f"Messages only detected as contacts in mobile: {len(only_in_mobile)}")
     
     # Show some examples of PC-only contact messages
-    if only_in_pc:
+    if len(only_in_pc) > 0:
         print(f"\nExamples of contact messages only found in PC parsing:")
-        count = 0
-        for msg in pc_contacts:
-            if count >= 10:  # Show max 10 examples
-                break
-            identifier = f"{msg['datetime_ist']}_{msg['sender']}_{msg['raw_message'][:50]}"
-            if identifier in only_in_pc:
-                print(f"- {msg['datetime_ist_human']} - {msg['sender']}: {msg['raw_message']}")
-                count += 1
+        for msg in only_in_pc.head(10).itertuples():
+            print(f"- {msg.datetime_ist_human} - {msg.sender}: {msg.raw_message}")
     
     # Show some examples of mobile-only contact messages
-    if only_in_mobile:
+    if len(only_in_mobile) > 0:
         print(f"\nExamples of contact messages only found in mobile parsing:")
-        count = 0
-        for msg in mobile_contacts:
-            if count >= 10:  # Show max 10 examples
-                break
-            identifier = f"{msg['datetime_ist']}_{msg['sender']}_{msg['raw_message'][:50]}"
-            if identifier in only_in_mobile:
-                print(f"- {msg['datetime_ist_human']} - {msg['sender']}: {msg['raw_message']}")
-                count += 1
+        for msg in only_in_mobile.head(10).itertuples():
+            print(f"- {msg.datetime_ist_human} - {msg.sender}: {msg.raw_message}")
     
     # Check for patterns in messages that might be missed in mobile
     print(f"\nChecking for patterns in PC contacts that might be missed in mobile...")
     
-    # Look for common patterns in PC contacts that might not be detected in mobile
-    pc_contact_patterns = {}
-    for msg in pc_contacts:
-        raw_msg = msg['raw_message'].lower()
-        # Check for common contact-related patterns
-        if 'contact card' in raw_msg:
-            pc_contact_patterns['contact card'] = pc_contact_patterns.get('contact card', 0) + 1
-        if 'vcf' in raw_msg:
-            pc_contact_patterns['vcf'] = pc_contact_patterns.get('vcf', 0) + 1
-        if 'omitted' in raw_msg:
-            pc_contact_patterns['omitted'] = pc_contact_patterns.get('omitted', 0) + 1
-        if 'file attached' in raw_msg:
-            pc_contact_patterns['file attached'] = pc_contact_patterns.get('file attached', 0) + 1
-    
-    mobile_contact_patterns = {}
-    for msg in mobile_contacts:
-        raw_msg = msg['raw_message'].lower()
-        if 'contact card' in raw_msg:
-            mobile_contact_patterns['contact card'] = mobile_contact_patterns.get('contact card', 0) + 1
-        if 'vcf' in raw_msg:
-            mobile_contact_patterns['vcf'] = mobile_contact_patterns.get('vcf', 0) + 1
-        if 'omitted' in raw_msg:
-            mobile_contact_patterns['omitted'] = mobile_contact_patterns.get('omitted', 0) + 1
-        if 'file attached' in raw_msg:
-            mobile_contact_patterns['file attached'] = mobile_contact_patterns.get('file attached', 0) + 1
-    
-    print(f"\nPC contact patterns:")
-    for pattern, count in pc_contact_patterns.items():
-        print(f"  {pattern}: {count}")
-    
-    print(f"\nMobile contact patterns:")
-    for pattern, count in mobile_contact_patterns.items():
-        print(f"  {pattern}: {count}")
+    for label, contacts in [("PC", pc_contacts), ("Mobile", mobile_contacts)]:
+        raw_messages = contacts['raw_message'].str.lower()
+        print(f"\n{label} contact patterns:")
+        for pattern in CONTACT_PATTERNS:
+            count = int(raw_messages.str.contains(pattern, regex=False).sum())
+            if count:
+                print(f"  {pattern}: {count}")
     
     # Check for potential media type misclassification in mobile
     print(f"\nChecking for potential contact messages classified as other media types in mobile...")
     
     # Look for messages containing contact-related keywords but classified as other media
-    potential_contacts = []
-    for msg in mobile_messages:
-        if msg.get('media') and msg.get('media') != 'contact':
-            raw_msg = msg['raw_message'].lower()
-            if any(keyword in raw_msg for keyword in ['contact card', 'vcf', '.vcf']):
-                potential_contacts.append(msg)
-    
-    if potential_contacts:
+    other_media = mobile_messages[(mobile_messages['media'] != '') & (mobile_messages['media'] != 'contact')]
+    potential_contacts = other_media[other_media['raw_message'].str.lower().str.contains(r'contact card|vcf', regex=True)]
+    
+    if len(potential_contacts) > 0:
         print(f"Found {len(potential_contacts)} potential contact messages classified as other media types:")
-        for msg in potential_contacts[:10]:  # Show first 10
-            print(f"  {msg['datetime_ist_human']} - {msg['sender']} - Media: {msg['media']} - {msg['raw_message'][:100]}...")
+        for msg in potential_contacts.head(10).itertuples():  # Show first 10
+            print(f"  {msg.datetime_ist_human} - {msg.sender} - Media: {msg.media} - {msg.raw_message[:100]}...")
     else:
         print("No potential contact messages found classified as other media types.")
 
@@ -1,48 +1,37 @@
 #!/usr/bin/env python3
 
-from parser import parse_chat_file
+from chat_store import import_chat_file, open_store, run_saved_query
 
 def compare_media():
     """Compare total media shared between PC and mobile formats."""
     print("Comparing total media shared...")
     
-    # Parse both files
-    pc_df = parse_chat_file('pc_pickleball_thane_chat.txt')
-    mobile_df = parse_chat_file('mobile-pickleball-thane.txt')
+    # Parse each export once; later runs query the stored copies
+    conn = open_store()
+    pc_chat = import_chat_file(conn, 'pc_pickleball_thane_chat.txt')
+    mobile_chat = import_chat_file(conn, 'mobile-pickleball-thane.txt')
     
-    # Calculate total media
-    pc_media_count = len(pc_df[pc_df['media'] != ''])
-    mobile_media_count = len(mobile_df[mobile_df['media'] != ''])
+    # Media type counts for both exports in one grouped query
+    media_types = run_saved_query(conn, 'media_types', chat=pc_chat, other=mobile_chat)
     
-    print(f"PC total media messages: {pc_media_count}")
-    print(f"Mobile total media messages: {mobile_media_count}")
-    
-    # Find media types
-    pc_media_types = pc_df['media'].value_counts()
-    mobile_media_types = mobile_df['media'].value_counts()
+    print(f"PC total media messages: {media_types['chat_count'].sum()}")
+    print(f"Mobile total media messages: {media_types['other_count'].sum()}")
     
     print("\nPC media type distribution:")
-    for media_type, count in pc_media_types.items():
-        if media_type:
-            print(f"  {media_type}: {count}")
+    for row in media_types[media_types['chat_count'] > 0].itertuples():
+        print(f"  {row.media}: {row.chat_count}")
     
     print("\nMobile media type distribution:")
-    for media_type, count in mobile_media_types.items():
-        if media_type:
-            print(f"  {media_type}: {count}")
+    mobile_types = media_types[media_types['other_count'] > 0].sort_values('other_count', ascending=False)
+    for row in mobile_types.itertuples():
+        print(f"  {row.media}: {row.other_count}")
 
     # Identify discrepancies in media types
-    discrepancies = []
-    for media_type in set(pc_media_types.index).union(set(mobile_media_types.index)):
-        pc_count = pc_media_types.get(media_type, 0)
-        mobile_count = mobile_media_types.get(media_type, 0)
-        if pc_count != mobile_count:
-            discrepancies.append((media_type, pc_count, mobile_count))
-            
-    if discrepancies:
+    discrepancies = media_types[media_types['difference'] != 0]
+    if len(discrepancies) > 0:
         print("\nDiscrepancies in media types:")
-        for media_type, pc_count, mobile_count in discrepancies:
-            print(f"  {media_type}: PC = {pc_count}, Mobile = {mobile_count}")
+        for row in discrepancies.itertuples():
+            print(f"  {row.media}: PC = {row.chat_count}, Mobile = {row.other_count}")
     else:
         print("\nNo discrepancies in media types found.")
 
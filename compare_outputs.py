@@ -1,5 +1,5 @@
 import pandas as pd
-import re
+from chat_alignment import align_exports
 
 def count_words(text):
     """Count words in a message text."""
@@ -7,17 +7,27 @@ def count_words(text):
         return 0
     return len(text.split())
 
-def compare_pc_mobile_outputs(pc_df: pd.DataFrame, mobile_df: pd.DataFrame):
+def word_counts(messages: pd.Series) -> pd.Series:
+    """Vectorized count_words for a whole message column."""
+    return messages.fillna('').astype(str).str.split().str.len().fillna(0).astype(int)
+
+def compare_pc_mobile_outputs(pc_df: pd.DataFrame, mobile_df: pd.DataFrame, max_examples: int = 20):
     """
     Compare PC and Mobile DataFrame outputs message-by-message to identify discrepancies.
+
+    Messages are aligned on (minute, sender, text fingerprint) rather than by row
+    position, so one missing message no longer shifts every later comparison.
+    Returns the alignment from chat_alignment.align_exports.
     """
     print(f"PC DataFrame: {len(pc_df)} messages")
     print(f"Mobile DataFrame: {len(mobile_df)} messages")
     print()
     
     # Calculate total word counts
-    pc_total_words = pc_df['message'].apply(count_words).sum()
-    mobile_total_words = mobile_df['message'].apply(count_words).sum()
+    pc_words = word_counts(pc_df['message']).to_numpy()
+    mobile_words = word_counts(mobile_df['message']).to_numpy()
+    pc_total_words = int(pc_words.sum())
+    mobile_total_words = int(mobile_words.sum())
     
     print(f"PC total words: {pc_total_words}")
     print(f"Mobile total words: {mobile_total_words}")
@@ -30,60 +40,52 @@ def compare_pc_mobile_outputs(pc_df: pd.DataFrame, mobile_df: pd.DataFrame):
         print(f"PC: {len(pc_df)} vs Mobile: {len(mobile_df)}")
         print()
     
-    # Compare messages line by line
-    mismatch_count = 0
-    word_diff_total = 0
-    max_len = min(len(pc_df), len(mobile_df))
+    alignment = align_exports(pc_df, mobile_df)
+    matched, changed = alignment['matched'], alignment['changed']
+    deleted, inserted = alignment['deleted'], alignment['inserted']
+    
+    # Text mismatches: edited messages, plus aligned messages whose text differs only in case/spacing/media placeholder
+    matched_words = pc_words[matched['pc_row']] - mobile_words[matched['mobile_row']]
+    changed_words = pc_words[changed['pc_row']] - mobile_words[changed['mobile_row']]
+    matched_text_differs = pc_df['message'].to_numpy()[matched['pc_row']] != mobile_df['message'].to_numpy()[matched['mobile_row']]
     
-    for i in range(max_len):
-        pc_message = pc_df.iloc[i]['message']
-        mobile_message = mobile_df.iloc[i]['message']
-        
-        pc_words = count_words(pc_message)
-        mobile_words = count_words(mobile_message)
-        word_diff = pc_words - mobile_words
-        
-        if pc_message != mobile_message:
-            mismatch_count += 1
-            word_diff_total += word_diff
-            print(f"Mismatch in message {i}:")
-            print(f"PC ({pc_words} words): {repr(pc_message)}")
-            print(f"Mobile ({mobile_words} words): {repr(mobile_message)}")
-            print(f"Word difference: {word_diff}")
-            print("---")
-        elif word_diff != 0:
-            # Same message content but different word counts (shouldn't happen)
-            print(f"Same message but different word counts at index {i}:")
-            print(f"PC ({pc_words} words): {repr(pc_message)}")
-            print(f"Mobile ({mobile_words} words): {repr(mobile_message)}")
-            print("---")
+    for row in changed.head(max_examples).itertuples():
+        print(f"Changed message at {row.minute} from {row.sender} (PC[{row.pc_row}] / Mobile[{row.mobile_row}]):")
+        print(f"PC ({pc_words[row.pc_row]} words): {repr(row.pc_message)}")
+        print(f"Mobile ({mobile_words[row.mobile_row]} words): {repr(row.mobile_message)}")
+        print(f"Word difference: {pc_words[row.pc_row] - mobile_words[row.mobile_row]}")
+        print("---")
     
-    # Check if there are extra messages in either DataFrame
-    if len(pc_df) > len(mobile_df):
-        print(f"Extra messages in PC DataFrame (indices {max_len} to {len(pc_df)-1}):")
-        for i in range(max_len, len(pc_df)):
-            extra_words = count_words(pc_df.iloc[i]['message'])
-            word_diff_total += extra_words
-            print(f"PC[{i}] ({extra_words} words): {repr(pc_df.iloc[i]['message'])}")
-    elif len(mobile_df) > len(pc_df):
-        print(f"Extra messages in Mobile DataFrame (indices {max_len} to {len(mobile_df)-1}):")
-        for i in range(max_len, len(mobile_df)):
-            extra_words = count_words(mobile_df.iloc[i]['message'])
-            word_diff_total -= extra_words
-            print(f"Mobile[{i}] ({extra_words} words): {repr(mobile_df.iloc[i]['message'])}")
+    if len(deleted) > 0:
+        print(f"Messages only in PC DataFrame: {len(deleted)}")
+        for row in deleted.head(max_examples).itertuples():
+            print(f"PC[{row.pc_row}] ({pc_words[row.pc_row]} words): {row.datetime_ist} {row.sender}: {repr(row.message)}")
+    if len(inserted) > 0:
+        print(f"Messages only in Mobile DataFrame: {len(inserted)}")
+        for row in inserted.head(max_examples).itertuples():
+            print(f"Mobile[{row.mobile_row}] ({mobile_words[row.mobile_row]} words): {row.datetime_ist} {row.sender}: {repr(row.message)}")
+    
+    mismatch_count = len(changed) + int(matched_text_differs.sum())
+    word_diff_total = int(matched_words.sum() + changed_words.sum()
+                          + pc_words[deleted['pc_row']].sum() - mobile_words[inserted['mobile_row']].sum())
     
     print(f"\nSummary:")
+    print(f"Aligned messages: {len(matched)}")
+    print(f"Changed messages: {len(changed)}")
+    print(f"Only in PC (deleted from mobile): {len(deleted)}")
+    print(f"Only in mobile (inserted): {len(inserted)}")
     print(f"Text mismatches: {mismatch_count}")
     print(f"Word count difference from mismatches: {word_diff_total}")
     print(f"Expected total difference: {pc_total_words - mobile_total_words}")
     
-    if mismatch_count == 0 and pc_total_words == mobile_total_words:
+    if mismatch_count == 0 and len(deleted) == 0 and len(inserted) == 0 and pc_total_words == mobile_total_words:
         print("✓ Perfect match!")
     elif word_diff_total == (pc_total_words - mobile_total_words):
         print("✓ Word count difference explained by message differences")
     else:
         print("⚠ Word count difference NOT fully explained by message differences")
+    
+    return alignment
 
 # Example usage (assuming pc_df and mobile_df are available as DataFrame variables):
 # compare_pc_mobile_outputs(pc_df, mobile_df)
-
@@ -0,0 +1,210 @@
+import json
+import re
+from collections import Counter
+from typing import List, Tuple
+import pandas as pd
+
+# Code point ranges that render as emoji on their own (emoji presentation by default,
+# plus the Miscellaneous Symbols / Dingbats blocks the old regex always counted)
+emoji_ranges = [
+    (0x231A, 0x231B), (0x23E9, 0x23EC), (0x23F0, 0x23F0), (0x23F3, 0x23F3),
+    (0x25FD, 0x25FE), (0x2600, 0x27BF), (0x2B1B, 0x2B1C), (0x2B50, 0x2B50), (0x2B55, 0x2B55),
+    (0x1F000, 0x1F0FF), (0x1F100, 0x1F1E5), (0x1F200, 0x1F2FF), (0x1F300, 0x1F3FA),
+    (0x1F400, 0x1F64F), (0x1F680, 0x1F6FF), (0x1F7E0, 0x1F7EB), (0x1F900, 0x1F9FF),
+    (0x1FA70, 0x1FAFF)
+]
+# Pictographs that default to text presentation and only count as emoji with VS16 or a modifier
+text_default_ranges = [
+    (0x00A9, 0x00A9), (0x00AE, 0x00AE), (0x203C, 0x203C), (0x2049, 0x2049),
+    (0x2122, 0x2122), (0x2139, 0x2139), (0x2194, 0x2199), (0x21A9, 0x21AA),
+    (0x2328, 0x2328), (0x23CF, 0x23CF), (0x23ED, 0x23EF), (0x23F1, 0x23F2),
+    (0x23F8, 0x23FA), (0x24C2, 0x24C2), (0x25AA, 0x25AB), (0x25B6, 0x25B6),
+    (0x25C0, 0x25C0), (0x25FB, 0x25FC), (0x2934, 0x2935), (0x2B05, 0x2B07),
+    (0x3030, 0x3030), (0x303D, 0x303D), (0x3297, 0x3297), (0x3299, 0x3299)
+]
+regional_indicator_range = (0x1F1E6, 0x1F1FF)
+skin_tone_range = (0x1F3FB, 0x1F3FF)
+tag_range = (0xE0020, 0xE007E)
+
+# Code point classes the sequence trie is keyed on
+EMOJI, TEXT_DEFAULT, REGIONAL, MODIFIER, VARIATION, ZWJ, KEYCAP_BASE, KEYCAP, TAG, CANCEL_TAG = (
+    "E", "T", "R", "M", "V", "Z", "K", "C", "G", "X"
+)
+
+def _build_class_table():
+    """Precompute the character -> class lookup used by the scanner."""
+    table = {}
+    for ranges, cls in [(emoji_ranges, EMOJI), (text_default_ranges, TEXT_DEFAULT),
+                        ([regional_indicator_range], REGIONAL), ([skin_tone_range], MODIFIER),
+                        ([tag_range], TAG)]:
+        for start, end in ranges:
+            for cp in range(start, end + 1):
+                table[chr(cp)] = cls
+    table.update({"\ufe0f": VARIATION, "\ufe0e": VARIATION, "\u200d": ZWJ, "\u20e3": KEYCAP, "\U000E007F": CANCEL_TAG})
+    for ch in "0123456789#*":
+        table[ch] = KEYCAP_BASE
+    return table
+
+CLASS_OF = _build_class_table()
+
+# Sequence trie over code point classes (UTS #51 emoji sequence grammar).
+# Each state maps a class to the next state; states in ACCEPTING end a complete emoji.
+# emoji_sequence_pattern below is written by hand to mirror this trie; change both together.
+SEQUENCE_TRIE = {
+    "start": {EMOJI: "element", MODIFIER: "element", TEXT_DEFAULT: "text", REGIONAL: "regional",
+              KEYCAP_BASE: "keycap_base"},
+    "element": {VARIATION: "presented", MODIFIER: "modified", ZWJ: "joiner", TAG: "tag"},
+    "presented": {ZWJ: "joiner", MODIFIER: "modified"},
+    "modified": {VARIATION: "presented", ZWJ: "joiner"},
+    "text": {VARIATION: "presented", MODIFIER: "modified"},
+    "joiner": {EMOJI: "element", TEXT_DEFAULT: "element", MODIFIER: "element"},
+    "regional": {REGIONAL: "flag"},
+    "flag": {},
+    "tag": {TAG: "tag", CANCEL_TAG: "tag_sequence"},
+    "tag_sequence": {},
+    "keycap_base": {VARIATION: "keycap_presented", KEYCAP: "keycap"},
+    "keycap_presented": {KEYCAP: "keycap"},
+    "keycap": {}
+}
+ACCEPTING = frozenset({"element", "presented", "modified", "regional", "flag", "tag_sequence", "keycap"})
+
+def _char_class_pattern(classes, max_gap=1):
+    """
+    Build a regex character-class body covering every character in the given classes.
+
+    Code points less than max_gap apart share one range. The default gives the
+    exact class; a wide gap gives a coarse superset with only a few ranges,
+    which the regex engine scans for much faster than a long exact class.
+    """
+    code_points = sorted(ord(ch) for ch, cls in CLASS_OF.items() if cls in classes)
+    # Collapse into ranges so the regex engine tests a handful of ranges, not thousands of literals
+    parts, start = [], None
+    for i, cp in enumerate(code_points):
+        if start is None:
+            start = cp
+        if i + 1 == len(code_points) or code_points[i + 1] - cp > max_gap:
+            parts.append(re.escape(chr(start)) if start == cp else f"{re.escape(chr(start))}-{re.escape(chr(cp))}")
+            start = None
+    return "".join(parts)
+
+# Merging ranges closer than this keeps the leading classes to a few ranges
+_COARSE_GAP = 0x400
+
+_emoji, _text, _regional, _modifier, _variation, _zwj, _tag, _cancel_tag, _keycap_base = (
+    _char_class_pattern({cls}) for cls in (EMOJI, TEXT_DEFAULT, REGIONAL, MODIFIER, VARIATION, ZWJ, TAG,
+                                           CANCEL_TAG, KEYCAP_BASE)
+)
+
+# A hand-written regex mirroring SEQUENCE_TRIE; test_emoji_tokenizer.py checks it against
+# walk_sequence_trie. Each pattern starts with a coarse class so the engine skips plain
+# text quickly; the lookbehind then checks the exact class of the first character and
+# picks the branch of the trie it starts.
+# Selectors and modifiers after an element alternate ("element" <-> "presented"/"modified")
+_modifiers = f"(?:[{_variation}](?:[{_modifier}][{_variation}])*[{_modifier}]?|[{_modifier}](?:[{_variation}][{_modifier}])*[{_variation}]?)"
+_after_element = f"(?:{_modifiers}?[{_zwj}][{_emoji}{_text}{_modifier}])*(?:[{_tag}]+[{_cancel_tag}]|{_modifiers})?"
+_sequence_branches = (
+    f"(?<=[{_emoji}{_modifier}]){_after_element}"
+    f"|(?<=[{_text}])(?=[{_variation}{_modifier}]){_after_element}"
+    f"|(?<=[{_regional}])[{_regional}]?"
+)
+_sequence_start = _char_class_pattern({EMOJI, MODIFIER, TEXT_DEFAULT, REGIONAL}, _COARSE_GAP)
+emoji_sequence_pattern = re.compile(f"[{_sequence_start}](?:{_sequence_branches})")
+# Keycaps start at a digit, which would make the engine try every timestamp digit,
+# so the keycap branch only runs on text that contains U+20E3
+keycap_sequence_pattern = re.compile(
+    f"[{_keycap_base}{_sequence_start}](?:{_sequence_branches}|(?<=[{_keycap_base}])\ufe0f?\u20e3)"
+)
+
+# Every character that can belong to an accepted sequence; text-default pictographs only
+# when a selector or modifier follows them. Used to strip emoji without segmenting first.
+_strippable = _char_class_pattern({EMOJI, REGIONAL, MODIFIER, VARIATION, ZWJ, TAG, CANCEL_TAG})
+_strip_unit = f"[{_strippable}]|[{_text}](?=[{_variation}{_modifier}])"
+_strip_start = _char_class_pattern({EMOJI, REGIONAL, MODIFIER, VARIATION, ZWJ, TAG, CANCEL_TAG, TEXT_DEFAULT},
+                                   _COARSE_GAP)
+emoji_strip_pattern = re.compile(
+    f"[{_strip_start}](?:(?<=[{_strippable}])|(?<=[{_text}])(?=[{_variation}{_modifier}]))(?:{_strip_unit})*"
+)
+keycap_strip_pattern = re.compile(
+    f"[{_keycap_base}{_strip_start}](?:(?<=[{_keycap_base}])\ufe0f?\u20e3|(?<=[{_strippable}])"
+    f"|(?<=[{_text}])(?=[{_variation}{_modifier}]))(?:[{_keycap_base}]\ufe0f?\u20e3|{_strip_unit})*"
+)
+
+# Runs of emoji-related code points, for walking SEQUENCE_TRIE directly.
+# Keycap bases are only candidates when they are actually followed by U+20E3.
+emoji_candidate_pattern = re.compile(
+    "(?:[0-9#*]\ufe0f?\u20e3|[" +
+    _char_class_pattern({EMOJI, TEXT_DEFAULT, REGIONAL, MODIFIER, VARIATION, ZWJ, TAG, CANCEL_TAG}) + "])+"
+)
+
+def walk_sequence_trie(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Segment text by walking SEQUENCE_TRIE over every candidate run, emitting
+    the longest accepted sequence at every position.
+
+    This is the reference definition of the grammar; find_emojis gives the same
+    result from emoji_sequence_pattern, which mirrors the trie, several times faster.
+    """
+    found = []
+    class_of, trie, accepting = CLASS_OF, SEQUENCE_TRIE, ACCEPTING
+    for run in emoji_candidate_pattern.finditer(text):
+        chars = run.group()
+        offset = run.start()
+        n = len(chars)
+        i = 0
+        while i < n:
+            state, j, last_accept = "start", i, -1
+            while j < n:
+                state = trie[state].get(class_of.get(chars[j]))
+                if state is None:
+                    break
+                j += 1
+                if state in accepting:
+                    last_accept = j
+            if last_accept > i:
+                found.append((chars[i:last_accept], offset + i, offset + last_accept))
+                i = last_accept
+            else:
+                i += 1
+    return found
+
+def find_emojis(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Return every whole emoji sequence in text as (emoji, start, end) tuples.
+
+    Matches the longest accepted SEQUENCE_TRIE sequence at every position, in a
+    single pass of emoji_sequence_pattern.
+    """
+    # Every emoji class is outside ASCII (keycaps need U+20E3), so plain-text messages skip the regex
+    if not text or text.isascii():
+        return []
+    pattern = keycap_sequence_pattern if "\u20e3" in text else emoji_sequence_pattern
+    return [(match.group(), match.start(), match.end()) for match in pattern.finditer(text)]
+
+def strip_emojis(text: str) -> str:
+    """Remove every emoji sequence (including its joiners and selectors) from text."""
+    if not text or text.isascii():
+        return text
+    return (keycap_strip_pattern if "\u20e3" in text else emoji_strip_pattern).sub("", text)
+
+# Zero-width joiners only survive invisible-character cleaning when they glue two emoji together
+_joinable = _char_class_pattern({EMOJI, TEXT_DEFAULT, MODIFIER, VARIATION})
+stray_zwj_pattern = re.compile("(?<![" + _joinable + "])\u200d|\u200d(?![" + _joinable + "])")
+
+def emoji_counts_by_sender(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count emojis per sender from the parser's JSON 'emojis' column.
+
+    Returns a DataFrame with 'sender', 'emoji' and 'count' columns sorted by
+    descending count.
+    """
+    has_emojis = df["emojis"] != ""
+    counts = Counter()
+    for sender, emojis_json in zip(df.loc[has_emojis, "sender"], df.loc[has_emojis, "emojis"]):
+        for emoji in json.loads(emojis_json):
+            counts[(sender, emoji)] += 1
+    if not counts:
+        return pd.DataFrame({"sender": pd.Series(dtype=str), "emoji": pd.Series(dtype=str),
+                             "count": pd.Series(dtype="int64")})
+    result = pd.DataFrame([(sender, emoji, count) for (sender, emoji), count in counts.items()],
+                          columns=["sender", "emoji", "count"])
+    return result.sort_values(["count", "emoji"], ascending=[False, True], ignore_index=True)
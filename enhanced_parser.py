@@ -37,7 +37,9 @@ def parse_chat_with_enhancement(file_path, pc_reference_file=None, utc_offset_ho
             pc_messages = pc_df.to_dict('records')
             
             # Apply enhancement
-            enhanced_messages = enhance_mobile_media_with_pc_reference(main_messages, pc_messages)
+            enhanced_messages, match_stats = enhance_mobile_media_with_pc_reference(main_messages, pc_messages)
+            print(f"Matched {match_stats['matched']} of {match_stats['candidates']} generic media messages: "
+                  f"{match_stats['media_types']}")
             
             # Convert back to DataFrame
             df = pd.DataFrame(enhanced_messages)
@@ -1,94 +1,72 @@
 #!/usr/bin/env python3
 
-from parser import parse_chat_file
-from datetime import datetime
-import pandas as pd
+from chat_store import import_chat_file, open_store, run_query, run_saved_query
+
+# For each missing PC media message, the closest mobile message within a minute
+NEAREST_MOBILE_MESSAGE = """
+SELECT pc_time, pc_media, pc_raw, mobile_time, mobile_media, mobile_raw, time_diff FROM (
+    SELECT a.datetime_ist AS pc_time, a.media AS pc_media, a.raw_message AS pc_raw,
+           b.datetime_ist AS mobile_time, b.media AS mobile_media, b.raw_message AS mobile_raw,
+           ABS(strftime('%s', a.datetime_ist) - strftime('%s', b.datetime_ist)) AS time_diff,
+           ROW_NUMBER() OVER (
+               PARTITION BY a.id
+               ORDER BY ABS(strftime('%s', a.datetime_ist) - strftime('%s', b.datetime_ist)), b.id
+           ) AS closeness
+    FROM messages a
+    JOIN messages b
+      ON b.chat_id = :mobile
+     AND b.datetime_ist BETWEEN strftime('%Y-%m-%dT%H:%M:%S', a.datetime_ist, '-60 seconds')
+                            AND strftime('%Y-%m-%dT%H:%M:%S', a.datetime_ist, '+60 seconds')
+    WHERE a.id IN ({ids})
+)
+WHERE closeness = 1
+ORDER BY pc_time
+"""
 
 def find_missing_media():
-    """Find the 42 missing media messages in mobile format."""
+    """Find the media messages in PC format that are missing in mobile format."""
     print("Finding missing media messages in mobile format...")
     
-    # Parse both files
-    pc_df = parse_chat_file('pc_pickleball_thane_chat.txt')
-    mobile_df = parse_chat_file('mobile-pickleball-thane.txt')
-    
-    # Get media messages from both
-    pc_media = pc_df[pc_df['media'] != '']
-    mobile_media = mobile_df[mobile_df['media'] != '']
-    
-    print(f"PC media: {len(pc_media)}")
-    print(f"Mobile media: {len(mobile_media)}")
-    print(f"Missing: {len(pc_media) - len(mobile_media)}")
+    # Parse each export once; later runs query the stored copies
+    conn = open_store()
+    pc_chat = import_chat_file(conn, 'pc_pickleball_thane_chat.txt')
+    mobile_chat = import_chat_file(conn, 'mobile-pickleball-thane.txt')
     
-    # Create timestamp-based comparison
-    pc_media_times = {}
-    for _, row in pc_media.iterrows():
-        timestamp = row['datetime_ist']
-        dt = datetime.fromisoformat(timestamp)
-        key = dt.strftime('%Y-%m-%d %H:%M')
-        pc_media_times[key] = {
-            'media_type': row['media'],
-            'raw_message': row['raw_message'],
-            'sender': row['sender'],
-            'timestamp': timestamp
-        }
+    media_counts = run_query(
+        conn, "SELECT chat_id, COUNT(*) AS media FROM messages WHERE chat_id IN (?, ?) AND media != '' GROUP BY chat_id",
+        (pc_chat, mobile_chat)
+    ).set_index('chat_id')['media']
+    pc_media, mobile_media = media_counts.get(pc_chat, 0), media_counts.get(mobile_chat, 0)
+    print(f"PC media: {pc_media}")
+    print(f"Mobile media: {mobile_media}")
+    print(f"Missing: {pc_media - mobile_media}")
     
-    mobile_media_times = {}
-    for _, row in mobile_media.iterrows():
-        timestamp = row['datetime_ist']
-        dt = datetime.fromisoformat(timestamp)
-        key = dt.strftime('%Y-%m-%d %H:%M')
-        mobile_media_times[key] = {
-            'media_type': row['media'],
-            'raw_message': row['raw_message'],
-            'sender': row['sender'],
-            'timestamp': timestamp
-        }
-    
-    # Find PC media messages that don't exist in mobile
-    missing_in_mobile = []
-    for key, pc_msg in pc_media_times.items():
-        if key not in mobile_media_times:
-            missing_in_mobile.append(pc_msg)
+    # PC media messages with no mobile media message in the same minute
+    missing_in_mobile = run_saved_query(conn, 'missing_media', chat=pc_chat, other=mobile_chat)
     
     print(f"\nFound {len(missing_in_mobile)} media messages in PC that are missing in mobile:")
     
     # Show examples of missing messages
-    for i, msg in enumerate(missing_in_mobile[:20]):  # Show first 20
-        print(f"{i+1}. {msg['timestamp']} - {msg['media_type']} - {msg['sender']}")
-        print(f"   Raw: {msg['raw_message'][:100]}...")
+    for i, msg in enumerate(missing_in_mobile.head(20).itertuples(), start=1):
+        print(f"{i}. {msg.datetime_ist} - {msg.media} - {msg.sender}")
+        print(f"   Raw: {msg.raw_message[:100]}...")
         print()
     
     # Now let's check what these messages look like in the mobile format
     print("Checking what these missing messages look like in mobile format...")
     
-    # Get all mobile messages (including non-media)
-    mobile_all = mobile_df
-    
-    matches_found = []
-    for missing_msg in missing_in_mobile[:10]:  # Check first 10
-        timestamp = missing_msg['timestamp']
-        dt = datetime.fromisoformat(timestamp)
-        
-        # Look for messages around the same time in mobile
-        for _, mobile_row in mobile_all.iterrows():
-            mobile_dt = datetime.fromisoformat(mobile_row['datetime_ist'])
-            time_diff = abs((dt - mobile_dt).total_seconds())
-            
-            if time_diff <= 60:  # Within 1 minute
-                matches_found.append({
-                    'pc_msg': missing_msg,
-                    'mobile_msg': mobile_row,
-                    'time_diff': time_diff
-                })
-                break
+    missing_ids = missing_in_mobile['message_id'].head(10).tolist()
+    matches_found = run_query(
+        conn, NEAREST_MOBILE_MESSAGE.format(ids=", ".join(str(int(message_id)) for message_id in missing_ids)),
+        {'mobile': mobile_chat}
+    )
     
-    if matches_found:
+    if len(matches_found) > 0:
         print(f"\nFound {len(matches_found)} corresponding messages in mobile format:")
-        for i, match in enumerate(matches_found):
-            print(f"{i+1}. Time diff: {match['time_diff']} seconds")
-            print(f"   PC ({match['pc_msg']['media_type']}): {match['pc_msg']['raw_message'][:100]}...")
-            print(f"   Mobile (media='{match['mobile_msg']['media']}'): {match['mobile_msg']['raw_message'][:100]}...")
+        for i, match in enumerate(matches_found.itertuples(), start=1):
+            print(f"{i}. Time diff: {match.time_diff} seconds")
+            print(f"   PC ({match.pc_media}): {match.pc_raw[:100]}...")
+            print(f"   Mobile (media='{match.mobile_media}'): {match.mobile_raw[:100]}...")
             print()
     
     return missing_in_mobile, matches_found
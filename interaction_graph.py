@@ -0,0 +1,140 @@
+import re
+from typing import Optional
+import numpy as np
+import pandas as pd
+from response_times import DEFAULT_MAX_LATENCY_MINUTES
+
+mention_regex = re.compile(r"@(\w+)")
+non_word_regex = re.compile(r"\W+")
+
+def mention_lookup(senders) -> dict:
+    """
+    Map normalized mention text to sender codes.
+
+    Mentions are '@' plus word characters: phone mentions ("@919876543210")
+    match senders like "+91 98765 43210", and name mentions match either the
+    full name without spaces or a first name shared by no other sender.
+    """
+    lookup = {}
+    first_names = {}
+    for code, sender in enumerate(senders):
+        lookup[non_word_regex.sub("", sender.lower())] = code
+        first = sender.lower().split(" ")[0]
+        first_names[first] = code if first not in first_names else None
+    for first, code in first_names.items():
+        if code is not None:
+            lookup.setdefault(non_word_regex.sub("", first), code)
+    return lookup
+
+def build_interaction_graph(df: pd.DataFrame, max_gap_minutes: float = DEFAULT_MAX_LATENCY_MINUTES) -> dict:
+    """
+    Directed, weighted sender x sender interaction graph in sparse (COO) form.
+
+    An edge a -> b counts replies (a's message directly follows b's, within
+    max_gap_minutes) and mentions (a's message @-mentions b). Pairs are coded
+    as source * n + target and counted with np.unique/np.bincount, so only
+    pairs that interact are stored.
+
+    Returns a dict with senders (names, indexed by code) and equal-length
+    arrays source, target, replies, mentions and weight (replies + mentions).
+    """
+    # Hash-factorize, then renumber so codes follow sorted sender names
+    codes, senders = pd.factorize(df["sender"].to_numpy(dtype=object))
+    name_order = np.argsort(senders.astype(str), kind="stable")
+    senders = senders[name_order].astype(str)
+    codes = np.argsort(name_order)[codes]
+    n = len(senders)
+    timestamps = pd.to_datetime(df["datetime_ist"], format="ISO8601").to_numpy()
+    order = np.argsort(timestamps, kind="stable")
+    ordered_codes, ordered_times = codes[order], timestamps[order]
+
+    # Replies: consecutive messages from different senders
+    is_reply = (ordered_codes[1:] != ordered_codes[:-1]) & (
+        np.diff(ordered_times) <= np.timedelta64(int(max_gap_minutes * 60), "s")
+    )
+    reply_pairs = ordered_codes[1:][is_reply] * n + ordered_codes[:-1][is_reply]
+
+    # Mentions: every @-mention that resolves to another sender
+    if "mentions" in df.columns:
+        mention_text = pd.Series(df["mentions"].fillna("").to_numpy())
+        mention_text = mention_text[mention_text != ""]
+        mentioned = mention_text.str.findall(mention_regex).explode().dropna()
+        targets = mentioned.str.lower().map(mention_lookup(senders))
+        resolved = targets.notna().to_numpy()
+        mention_sources = codes[mentioned.index.to_numpy()[resolved]]
+        mention_targets = targets.to_numpy()[resolved].astype(np.int64)
+        not_self = mention_sources != mention_targets
+        mention_pairs = mention_sources[not_self] * n + mention_targets[not_self]
+    else:
+        mention_pairs = np.empty(0, dtype=np.int64)
+
+    pairs, inverse = np.unique(np.concatenate([reply_pairs, mention_pairs]).astype(np.int64), return_inverse=True)
+    replies = np.bincount(inverse[:len(reply_pairs)], minlength=len(pairs))
+    mentions = np.bincount(inverse[len(reply_pairs):], minlength=len(pairs))
+    return {
+        "senders": senders.tolist(),
+        "source": pairs // n,
+        "target": pairs % n,
+        "replies": replies,
+        "mentions": mentions,
+        "weight": replies + mentions
+    }
+
+def pagerank(graph: dict, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """
+    Weighted PageRank over the edge arrays; each iteration is one np.bincount.
+
+    Rank flows from a sender to the people they reply to and mention, so
+    members others respond to score highest.
+    """
+    n = len(graph["senders"])
+    if n == 0:
+        return np.empty(0)
+    source, target, weight = graph["source"], graph["target"], graph["weight"].astype(float)
+    out_weight = np.bincount(source, weights=weight, minlength=n)
+    dangling = out_weight == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        flow = np.bincount(target, weights=rank[source] * weight / out_weight[source], minlength=n)
+        new_rank = (1 - damping) / n + damping * (flow + rank[dangling].sum() / n)
+        converged = np.abs(new_rank - rank).sum() < tol
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+def centrality(graph: dict) -> pd.DataFrame:
+    """
+    Per-sender centrality, sorted by PageRank.
+
+    Columns: out_strength (interactions a sender directs at others),
+    in_strength (interactions received), partners (distinct senders
+    interacted with in either direction) and pagerank.
+    """
+    n = len(graph["senders"])
+    source, target, weight = graph["source"], graph["target"], graph["weight"]
+    undirected = np.unique(np.minimum(source, target) * n + np.maximum(source, target))
+    partners = np.bincount(np.concatenate([undirected // n, undirected % n]), minlength=n)
+    return pd.DataFrame({
+        "out_strength": np.bincount(source, weights=weight, minlength=n).astype(np.int64),
+        "in_strength": np.bincount(target, weights=weight, minlength=n).astype(np.int64),
+        "partners": partners,
+        "pagerank": pagerank(graph)
+    }, index=pd.Index(graph["senders"], name="sender")).sort_values("pagerank", ascending=False, kind="stable")
+
+def top_pairs(graph: dict, limit: Optional[int] = 10) -> pd.DataFrame:
+    """Most interacting pairs of senders (all pairs when limit is None), counting both directions together."""
+    n = len(graph["senders"])
+    first = np.minimum(graph["source"], graph["target"])
+    second = np.maximum(graph["source"], graph["target"])
+    pairs, inverse = np.unique(first * n + second, return_inverse=True)
+    names = np.array(graph["senders"], dtype=object)
+    table = pd.DataFrame({
+        "member_a": names[pairs // n],
+        "member_b": names[pairs % n],
+        "replies": np.bincount(inverse, weights=graph["replies"], minlength=len(pairs)).astype(np.int64),
+        "mentions": np.bincount(inverse, weights=graph["mentions"], minlength=len(pairs)).astype(np.int64)
+    })
+    table["weight"] = table["replies"] + table["mentions"]
+    table = table.sort_values("weight", ascending=False, kind="stable", ignore_index=True)
+    return table if limit is None else table.head(limit)
@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+
+# The model and the samples it is trained from ship next to this module
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+LANGUAGE_MODEL_FILE = os.path.join(MODULE_DIR, "language_model.json")
+LANGUAGE_SAMPLES_FILE = os.path.join(MODULE_DIR, "language_samples.txt")
+
+LANGUAGES = ("english", "hinglish", "hindi")
+OTHER_LANGUAGE = "other"
+NGRAM_ORDERS = (1, 2, 3)
+HASH_BITS = 18
+SMOOTHING = 0.5
+# Messages with fewer letters than this (emoji, numbers, "k") are labelled other
+MIN_LETTERS = 2
+# Characters scored per batch, which bounds the memory used for n-gram arrays
+CHUNK_CHARS = 2_000_000
+
+# Lowercase Latin letters and Devanagari letters, vowel signs and virama are kept;
+# digits, dandas and everything else collapse to a space
+non_letter_pattern = r"[^a-z\u0900-\u0963\u0971-\u097F]+"
+
+FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+FNV_PRIME = np.uint64(0x100000001B3)
+
+def normalize_texts(texts: pd.Series) -> pd.Series:
+    """Lowercase and reduce texts to single-space separated runs of letters."""
+    return texts.fillna("").astype(str).str.lower().str.replace(non_letter_pattern, " ", regex=True).str.strip()
+
+def _hash_ngrams(columns) -> np.ndarray:
+    """FNV-1a hash of n-grams given as n aligned code point arrays, reduced to HASH_BITS buckets."""
+    with np.errstate(over="ignore"):
+        hashes = np.full(len(columns[0]), FNV_OFFSET ^ np.uint64(len(columns)), dtype=np.uint64)
+        for column in columns:
+            hashes ^= column
+            hashes *= FNV_PRIME
+    return (hashes >> np.uint64(64 - HASH_BITS)).astype(np.int64)
+
+def _letter_mask(codes: np.ndarray) -> np.ndarray:
+    """Code points kept by normalize_texts: a-z and the Devanagari letters, vowel signs and virama."""
+    return (((codes >= 0x61) & (codes <= 0x7A)) | ((codes >= 0x900) & (codes <= 0x963))
+            | ((codes >= 0x971) & (codes <= 0x97F)))
+
+def _ngram_buckets(texts) -> tuple:
+    """
+    Hashed character n-grams of every text, normalized as by normalize_texts
+    and padded with a space.
+
+    Texts are joined into one lowercased code point array and normalized
+    there, so each n-gram order is a handful of numpy operations over all
+    texts at once. Returns (text index, bucket) arrays and letters per text.
+    """
+    joined = (" " + " \0 ".join(texts) + " ").lower()
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    is_letter = _letter_mask(codes)
+    codes[~is_letter & (codes != 0)] = ord(" ")
+    single = np.r_[True, (codes[1:] != ord(" ")) | (codes[:-1] != ord(" "))]
+    codes, is_letter = codes[single], is_letter[single]
+    text_of = np.cumsum(codes == 0)
+    letters = np.bincount(text_of[is_letter], minlength=len(texts))
+
+    text_ids, buckets = [], []
+    for n in NGRAM_ORDERS:
+        windows = len(codes) - n + 1
+        valid = (text_of[:windows] == text_of[n - 1:]) & (codes[:windows] != 0)
+        if n == 1:
+            valid &= is_letter
+        text_ids.append(text_of[:windows][valid])
+        buckets.append(_hash_ngrams([codes[k:k + windows][valid] for k in range(n)]))
+    return np.concatenate(text_ids), np.concatenate(buckets), letters
+
+def train_language_model(samples: Iterable) -> dict:
+    """Character n-gram counts per language from (language, text) pairs, as stored in the model file."""
+    counts = {}
+    for language, text in samples:
+        padded = f" {normalize_texts(pd.Series([text])).iloc[0]} "
+        language_counts = counts.setdefault(language, Counter())
+        for n in NGRAM_ORDERS:
+            grams = (padded[i:i + n] for i in range(len(padded) - n + 1))
+            language_counts.update(gram for gram in grams if gram.strip() or n > 1)
+    return {
+        "orders": list(NGRAM_ORDERS),
+        "counts": {language: dict(sorted(grams.items())) for language, grams in counts.items()}
+    }
+
+def read_samples(path: str = LANGUAGE_SAMPLES_FILE) -> list:
+    """(language, text) pairs from a tab-separated samples file; '#' lines are comments."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t", 1)) for line in f if line.strip() and not line.startswith("#")]
+
+@lru_cache(maxsize=None)
+def load_language_model(path: str = LANGUAGE_MODEL_FILE) -> dict:
+    """
+    Load the bundled model once per process as a languages x buckets table
+    of smoothed log-probabilities (naive Bayes with equal priors).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    languages = list(stored["counts"])
+    table = np.zeros((len(languages), 2 ** HASH_BITS))
+    for row, language in enumerate(languages):
+        grams = stored["counts"][language]
+        for n in stored["orders"]:
+            of_order = [gram for gram in grams if len(gram) == n]
+            if not of_order:
+                continue
+            codes = np.frombuffer("".join(of_order).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+            buckets = _hash_ngrams(list(codes.reshape(-1, n).T))
+            np.add.at(table[row], buckets, [grams[gram] for gram in of_order])
+    table = np.log((table + SMOOTHING) / (table.sum(axis=1, keepdims=True) + SMOOTHING * table.shape[1]))
+    return {"languages": languages, "table": table.astype(np.float32)}
+
+def identify_languages(messages: pd.Series, model: Optional[dict] = None) -> pd.Series:
+    """
+    Label every message as english, hinglish, hindi or other in one batch.
+
+    Each distinct text is scored once: its hashed character 1-3 grams index
+    the model table and np.bincount sums the log-probabilities per text for
+    every language. Texts are processed about CHUNK_CHARS at a time.
+    """
+    if model is None:
+        model = load_language_model()
+    codes, texts = pd.factorize(messages.fillna("").astype(str).to_numpy(dtype=object))
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    chunk_of = np.cumsum(lengths) // CHUNK_CHARS
+    languages = np.array(model["languages"], dtype=object)
+    labels = np.full(len(texts), OTHER_LANGUAGE, dtype=object)
+    for chunk in np.unique(chunk_of):
+        batch = np.flatnonzero(chunk_of == chunk)
+        text_ids, buckets, letters = _ngram_buckets(texts[batch])
+        weights = model["table"][:, buckets]
+        scores = np.stack([np.bincount(text_ids, weights=row, minlength=len(batch)) for row in weights])
+        labels[batch] = np.where(letters >= MIN_LETTERS, languages[scores.argmax(axis=0)], OTHER_LANGUAGE)
+    return pd.Series(labels[codes], index=messages.index, dtype=object)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Rebuild the bundled language identification model")
+    arg_parser.add_argument("--samples", default=LANGUAGE_SAMPLES_FILE, help="tab-separated language/text samples")
+    arg_parser.add_argument("--model", default=LANGUAGE_MODEL_FILE, help="model file to write")
+    args = arg_parser.parse_args()
+
+    samples = read_samples(args.samples)
+    model = train_language_model(samples)
+    with open(args.model, "w", encoding="utf-8") as f:
+        json.dump(model, f, ensure_ascii=False, indent=0)
+    sizes = ", ".join(f"{language}: {len(grams)}" for language, grams in model["counts"].items())
+    print(f"✅ Trained on {len(samples)} samples ({sizes} n-grams) -> {args.model}")
+
+if __name__ == "__main__":
+    main()
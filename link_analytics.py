@@ -0,0 +1,64 @@
+import json
+from functools import lru_cache
+from urllib.parse import urlsplit
+import pandas as pd
+
+# Second-level labels under country-code TLDs that act as public suffixes
+# ("bbc.co.uk", "flipkart.co.in"); a small stand-in for the full public suffix list
+COMMON_SECOND_LEVEL = {"co", "com", "net", "org", "gov", "edu", "ac", "nic", "res", "ltd", "plc"}
+
+@lru_cache(maxsize=None)
+def url_domain(url: str) -> str:
+    """Lowercased registrable domain of a URL ("https://m.youtube.com/x" -> "youtube.com")."""
+    try:
+        host = (urlsplit(url).hostname or "").rstrip(".")
+    except ValueError:
+        return ""
+    labels = host.split(".")
+    if len(labels) <= 2 or host.replace(".", "").isdigit():
+        return host
+    if len(labels[-1]) == 2 and labels[-2] in COMMON_SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+def link_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per shared URL: url, domain, sender and time.
+
+    The urls JSON is decoded only for messages that have links, and each
+    distinct URL is parsed once (url_domain is memoized) before mapping the
+    domains back over the exploded column.
+    """
+    with_links = df[df["urls"].fillna("") != ""].reset_index(drop=True)
+    urls = with_links["urls"].map(json.loads).explode().dropna()
+    rows = with_links.loc[urls.index]
+    links = pd.DataFrame({
+        "url": urls.to_numpy(dtype=object),
+        "sender": rows["sender"].to_numpy(),
+        "time": pd.to_datetime(rows["datetime_ist"], format="ISO8601").to_numpy()
+    })
+    distinct = links["url"].unique()
+    links["domain"] = links["url"].map(dict(zip(distinct, map(url_domain, distinct))))
+    return links[links["domain"] != ""].reset_index(drop=True)
+
+def link_stats(df: pd.DataFrame) -> dict:
+    """
+    Link-sharing statistics for a chat.
+
+    Returns a dict with:
+        links:     the link_table rows
+        domains:   DataFrame indexed by domain with shares, senders (distinct
+                   members sharing it), first_shared and last_shared, most
+                   shared first
+        by_sender: DataFrame[sender, domain, shares], most shared first
+    """
+    links = link_table(df)
+    domains = links.groupby("domain").agg(
+        shares=("url", "size"),
+        senders=("sender", "nunique"),
+        first_shared=("time", "min"),
+        last_shared=("time", "max")
+    ).sort_values(["shares", "last_shared"], ascending=False)
+    by_sender = (links.groupby(["sender", "domain"]).size().reset_index(name="shares")
+                      .sort_values("shares", ascending=False, kind="stable", ignore_index=True))
+    return {"links": links, "domains": domains, "by_sender": by_sender}
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+NUM_PERMUTATIONS = 64
+BANDS = 8
+SHINGLE_CHARS = 5
+# Shorter messages ("good morning", "ok") repeat naturally and are never flagged
+MIN_CHARS = 40
+SIMILARITY_THRESHOLD = 0.8
+# Characters hashed per batch, which bounds the memory used for shingle arrays
+CHUNK_CHARS = 2_000_000
+SEED = 2024
+
+FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+FNV_PRIME = np.uint64(0x100000001B3)
+
+def normalize_messages(messages: pd.Series) -> pd.Series:
+    """Lowercase and collapse whitespace, so re-typed forwards compare equal."""
+    return messages.fillna("").astype(str).str.lower().str.split().str.join(" ")
+
+def _shingle_hashes(texts) -> tuple:
+    """32-bit hashes of every SHINGLE_CHARS-character shingle, with the text each belongs to."""
+    codes = np.frombuffer("\0".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    text_of = np.cumsum(codes == 0)
+    windows = len(codes) - SHINGLE_CHARS + 1
+    valid = (text_of[:windows] == text_of[SHINGLE_CHARS - 1:]) & (codes[:windows] != 0)
+    with np.errstate(over="ignore"):
+        hashes = np.full(int(valid.sum()), FNV_OFFSET, dtype=np.uint64)
+        for k in range(SHINGLE_CHARS):
+            hashes ^= codes[k:k + windows][valid]
+            hashes *= FNV_PRIME
+    return hashes >> np.uint64(32), text_of[:windows][valid]
+
+def minhash_signatures(texts, num_permutations: int = NUM_PERMUTATIONS, seed: int = SEED) -> np.ndarray:
+    """
+    MinHash signature (texts x num_permutations, uint32) of each text's character shingles.
+
+    Every permutation is a multiply-shift hash applied to all shingles at
+    once, and np.minimum.reduceat takes its minimum per text. Texts must be
+    at least SHINGLE_CHARS long; they are processed about CHUNK_CHARS at a time.
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, num_permutations, dtype=np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, num_permutations, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_permutations), dtype=np.uint32)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    chunk_of = np.cumsum(lengths) // CHUNK_CHARS
+    for chunk in np.unique(chunk_of):
+        first, last = np.searchsorted(chunk_of, [chunk, chunk + 1])
+        shingles, text_of = _shingle_hashes(texts[first:last])
+        starts = np.searchsorted(text_of, np.arange(last - first))
+        permuted = np.empty_like(shingles)
+        with np.errstate(over="ignore"):
+            for column, (multiplier, offset) in enumerate(zip(multipliers, offsets)):
+                np.multiply(shingles, multiplier, out=permuted)
+                np.add(permuted, offset, out=permuted)
+                np.right_shift(permuted, np.uint64(32), out=permuted)
+                signatures[first:last, column] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = BANDS) -> tuple:
+    """
+    Candidate (text, text) pairs: texts whose signatures agree on every row of some band.
+
+    Each band's rows are hashed to one key; texts sharing a key are paired
+    with the first text in that bucket, so the work stays near-linear.
+    """
+    rows = signatures.shape[1] // bands
+    sources, targets = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    if len(signatures) == 0:
+        return sources[0], targets[0]
+    for band in range(bands):
+        keys = np.full(len(signatures), FNV_OFFSET, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for column in signatures[:, band * rows:(band + 1) * rows].T:
+                keys ^= column.astype(np.uint64)
+                keys *= FNV_PRIME
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bucket_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        first = order[np.flatnonzero(bucket_start)[np.cumsum(bucket_start) - 1]]
+        paired = ~bucket_start
+        sources.append(order[paired])
+        targets.append(first[paired])
+    return np.concatenate(sources), np.concatenate(targets)
+
+def connected_components(n: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Component label (smallest member index) of each of n nodes, by min-label propagation with pointer jumping."""
+    labels = np.arange(n)
+    while True:
+        smallest = np.minimum(labels[sources], labels[targets])
+        updated = labels.copy()
+        np.minimum.at(updated, sources, smallest)
+        np.minimum.at(updated, targets, smallest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+def find_near_duplicates(df: pd.DataFrame, threshold: float = SIMILARITY_THRESHOLD) -> pd.DataFrame:
+    """
+    Cluster near-identical messages (forwards, reposted announcements).
+
+    Messages of at least MIN_CHARS characters are MinHashed once per distinct
+    normalized text; LSH buckets propose pairs, which are kept when their
+    signatures agree on at least threshold of the permutations (an estimate
+    of shingle Jaccard similarity).
+
+    Returns a DataFrame aligned with df: cluster (-1 for messages with no near
+    duplicate; clusters numbered largest first), cluster_size and
+    is_duplicate (every message of a cluster but its earliest).
+    """
+    normalized = normalize_messages(df["message"])
+    candidate = (normalized.str.len() >= MIN_CHARS).to_numpy()
+    text_codes, texts = pd.factorize(normalized.to_numpy(dtype=object)[candidate])
+
+    signatures = minhash_signatures(list(texts))
+    sources, targets = lsh_candidate_pairs(signatures)
+    similar = (signatures[sources] == signatures[targets]).mean(axis=1) >= threshold
+    components = connected_components(len(texts), sources[similar], targets[similar])
+
+    labels = np.full(len(df), -1, dtype=np.int64)
+    labels[candidate] = components[text_codes]
+    sizes = np.ones(len(df), dtype=np.int64)
+    sizes[candidate] = np.bincount(components[text_codes], minlength=len(texts))[components[text_codes]]
+    labels[sizes < 2] = -1
+
+    # Renumber clusters largest first and mark every message but the earliest in each
+    clustered = labels >= 0
+    cluster_ids, cluster_sizes = np.unique(labels[clustered], return_counts=True)
+    rank = np.empty(len(cluster_ids), dtype=np.int64)
+    rank[np.argsort(-cluster_sizes, kind="stable")] = np.arange(len(cluster_ids))
+    labels[clustered] = rank[np.searchsorted(cluster_ids, labels[clustered])]
+    times = pd.to_datetime(df["datetime_ist"], format="ISO8601").to_numpy()
+    order = np.lexsort((np.arange(len(df)), times, labels))
+    is_duplicate = np.zeros(len(df), dtype=bool)
+    is_duplicate[order[1:]] = (labels[order[1:]] == labels[order[:-1]]) & (labels[order[1:]] >= 0)
+    return pd.DataFrame({
+        "cluster": labels,
+        "cluster_size": np.where(clustered, sizes, 1),
+        "is_duplicate": is_duplicate
+    }, index=df.index)
+
+def duplicate_clusters(df: pd.DataFrame, duplicates: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per cluster, largest first: messages, senders (distinct), first_sent,
+    last_sent, first_sender and the earliest message's text.
+    """
+    clustered = df.assign(cluster=duplicates["cluster"].to_numpy(), is_duplicate=duplicates["is_duplicate"].to_numpy())
+    clustered = clustered[clustered["cluster"] >= 0]
+    originals = clustered[~clustered["is_duplicate"]].set_index("cluster")
+    summary = clustered.groupby("cluster").agg(
+        messages=("message", "size"),
+        senders=("sender", "nunique"),
+        first_sent=("datetime_ist", "min"),
+        last_sent=("datetime_ist", "max")
+    )
+    summary["first_sender"] = originals["sender"]
+    summary["text"] = originals["message"]
+    return summary.sort_values("messages", ascending=False, kind="stable")
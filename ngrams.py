@@ -0,0 +1,171 @@
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from parser import MEDIA_PLACEHOLDER
+from word_frequency import message_pipelines, pipeline_stop_words, tokenize_messages
+
+NGRAM_NAMES = {2: "bigrams", 3: "trigrams"}
+DEFAULT_MIN_COUNT = 3
+
+def encode_corpus(df: pd.DataFrame) -> dict:
+    """
+    Integer-coded token corpus for a chat.
+
+    Each distinct message text is tokenized once (with the same tokenizer and
+    per-language cleaning as the word counts, using the language of its first
+    occurrence) and its tokens are factorized into vocabulary ids; every
+    distinct (text, sender) pair keeps how often it was sent. Captionless
+    media placeholders are left out.
+
+    Returns a dict with vocab and senders (names indexed by id), token_ids and
+    token_text (text index of every token, in order), text_length (tokens per
+    text) and pair_text, pair_sender and pair_count for the (text, sender)
+    pairs.
+    """
+    df = df[df["message"] != MEDIA_PLACEHOLDER]
+    text_codes, texts = pd.factorize(df["message"].fillna("").astype(str).to_numpy(dtype=object))
+    sender_codes, senders = pd.factorize(df["sender"].to_numpy(dtype=object))
+    first = np.unique(text_codes, return_index=True)[1]
+    tokens = tokenize_messages(pd.Series(texts), pd.Series(message_pipelines(df).to_numpy(dtype=object)[first]))
+    token_ids, vocab = pd.factorize(tokens.to_numpy(dtype=object))
+    token_text = tokens.index.to_numpy().astype(np.int64)
+    text_length = np.bincount(token_text, minlength=len(texts))
+
+    pairs, pair_count = np.unique(text_codes.astype(np.int64) * max(len(senders), 1) + sender_codes,
+                                  return_counts=True)
+    return {
+        "vocab": np.asarray(vocab, dtype=object),
+        "senders": np.asarray(senders, dtype=object),
+        "token_ids": token_ids.astype(np.int64),
+        "token_text": token_text,
+        "text_length": text_length,
+        "pair_text": pairs // max(len(senders), 1),
+        "pair_sender": pairs % max(len(senders), 1),
+        "pair_count": pair_count
+    }
+
+def _pair_occurrences(corpus: dict, text_of: np.ndarray) -> tuple:
+    """
+    Expand per-text items (sorted by text) to every (text, sender) pair.
+
+    Returns (item index, sender code, weight) arrays: each item of a text is
+    listed once per sender who sent that text, weighted by how often they did.
+    """
+    counts = np.bincount(text_of, minlength=len(corpus["text_length"]))
+    starts = np.cumsum(counts) - counts
+    lengths = counts[corpus["pair_text"]]
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    items = np.repeat(starts[corpus["pair_text"]], lengths) + offsets
+    return items, np.repeat(corpus["pair_sender"], lengths), np.repeat(corpus["pair_count"], lengths)
+
+def _grams(corpus: dict, n: int, content: np.ndarray) -> tuple:
+    """
+    Start offsets and keys of every n-gram that stays within one message.
+
+    Keys pack the token ids into one int64 while vocab ** n fits, and fall
+    back to a multiplicative hash otherwise, so memory stays one integer per
+    n-gram. N-grams must start and end on a content word and may not repeat
+    a single word throughout ("haha haha").
+    """
+    ids, text = corpus["token_ids"], corpus["token_text"]
+    starts = np.flatnonzero(text[:len(text) - n + 1] == text[n - 1:])
+    keep = content[ids[starts]] & content[ids[starts + n - 1]]
+    keep &= ~np.all([ids[starts + k] == ids[starts] for k in range(1, n)], axis=0)
+    starts = starts[keep]
+    size = len(corpus["vocab"])
+    if size ** n < 2 ** 63:
+        keys = np.zeros(len(starts), dtype=np.int64)
+        for k in range(n):
+            keys = keys * size + ids[starts + k]
+    else:
+        keys = np.zeros(len(starts), dtype=np.uint64)
+        for k in range(n):
+            keys = (keys ^ ids[starts + k].astype(np.uint64)) * np.uint64(0x100000001B3)
+    return starts, keys
+
+def _pmi(counts: np.ndarray, word_counts: list, total_words: np.ndarray) -> np.ndarray:
+    """log2 of how much more often the words co-occur than they would independently."""
+    expected = np.prod(word_counts, axis=0) / total_words.astype(float) ** (len(word_counts) - 1)
+    return np.log2(counts / expected)
+
+def ngram_stats(df: pd.DataFrame, sizes: Iterable[int] = (2, 3),
+                stop_words: Optional[Iterable[str]] = None) -> dict:
+    """
+    Bigram and trigram counts with PMI, overall and per sender.
+
+    Returns a dict keyed by NGRAM_NAMES ("bigrams", "trigrams"), each holding
+        overall:   DataFrame[ngram, count, pmi], most frequent first
+        by_sender: DataFrame[sender, ngram, count, pmi], most frequent first
+    PMI compares the n-gram's count with its words' counts among all tokens
+    of the same scope (the whole chat, or the sender's messages). stop_words
+    defaults to every language pipeline's list.
+    """
+    if stop_words is None:
+        stop_words = pipeline_stop_words()
+    corpus = encode_corpus(df)
+    vocab = pd.Series(corpus["vocab"], dtype=object)
+    content = ((vocab.str.len() > 1) & ~vocab.str.isdigit() & ~vocab.isin(stop_words)).to_numpy(dtype=bool)
+    n_senders = max(len(corpus["senders"]), 1)
+
+    # Word counts among all tokens, per sender and overall
+    token_items, token_senders, token_weights = _pair_occurrences(corpus, corpus["token_text"])
+    token_ids = corpus["token_ids"][token_items]
+    overall_words = np.bincount(token_ids, weights=token_weights, minlength=len(vocab))
+    sender_word_keys, inverse = np.unique(token_senders * len(vocab) + token_ids, return_inverse=True)
+    sender_words = np.bincount(inverse, weights=token_weights)
+    sender_totals = np.bincount(token_senders, weights=token_weights, minlength=n_senders)
+
+    stats = {}
+    for n in sizes:
+        starts, keys = _grams(corpus, n, content)
+        items, gram_senders, weights = _pair_occurrences(corpus, corpus["token_text"][starts])
+        grams, first, gram_of = np.unique(keys, return_index=True, return_inverse=True)
+        gram_of = gram_of[items]
+        words = [corpus["token_ids"][starts[first] + k] for k in range(n)]
+        text = corpus["vocab"][words[0]]
+        for k in range(1, n):
+            text = text + " " + corpus["vocab"][words[k]]
+
+        counts = np.bincount(gram_of, weights=weights, minlength=len(grams))
+        overall = pd.DataFrame({
+            "ngram": text,
+            "count": counts.astype(np.int64),
+            "pmi": _pmi(counts, [overall_words[w] for w in words], np.full(len(grams), overall_words.sum()))
+        })
+
+        pair_keys, inverse = np.unique(gram_of * n_senders + gram_senders, return_inverse=True)
+        pair_counts = np.bincount(inverse, weights=weights)
+        pair_grams, pair_senders = pair_keys // n_senders, pair_keys % n_senders
+        word_counts = [
+            sender_words[np.searchsorted(sender_word_keys, pair_senders * len(vocab) + w[pair_grams])]
+            for w in words
+        ]
+        by_sender = pd.DataFrame({
+            "sender": corpus["senders"][pair_senders],
+            "ngram": text[pair_grams],
+            "count": pair_counts.astype(np.int64),
+            "pmi": _pmi(pair_counts, word_counts, sender_totals[pair_senders])
+        })
+        stats[NGRAM_NAMES.get(n, f"{n}-grams")] = {
+            "overall": overall.sort_values(["count", "ngram"], ascending=[False, True], ignore_index=True),
+            "by_sender": by_sender.sort_values(["count", "ngram"], ascending=[False, True], ignore_index=True)
+        }
+    return stats
+
+def ngrams_for(ngrams: dict, sender: Optional[str] = None) -> pd.DataFrame:
+    """The overall table of one n-gram size, or one sender's rows of it."""
+    if sender is None:
+        return ngrams["overall"]
+    by_sender = ngrams["by_sender"]
+    return by_sender[by_sender["sender"] == sender].drop(columns="sender").reset_index(drop=True)
+
+def collocations(table: pd.DataFrame, min_count: int = DEFAULT_MIN_COUNT, limit: Optional[int] = 20) -> pd.DataFrame:
+    """
+    Highest-PMI n-grams seen at least min_count times.
+
+    The count floor keeps one-off word pairs, which PMI otherwise ranks
+    highest, out of the list.
+    """
+    frequent = table[table["count"] >= min_count]
+    ranked = frequent.sort_values(["pmi", "count"], ascending=False, kind="stable", ignore_index=True)
+    return ranked if limit is None else ranked.head(limit)
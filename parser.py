@@ -2,8 +2,12 @@ import re
 import pandas as pd
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
-from typing import Union, IO, Any
+from typing import Union, IO, Any, NamedTuple, Optional
+from emoji_tokenizer import find_emojis, strip_emojis, stray_zwj_pattern
+from timezones import localize_timestamps, utc_strings, validate_timezone
+from language_id import identify_languages
 
 # Global regex patterns used in message extraction
 url_pattern = r'https?://[^\s]+'
@@ -14,6 +18,66 @@ phone_pattern = r'(?:\+\d{1,3}[\s\-]?)?(?:\(\d{1,4}\)|\d{1,4})[\s\-]?\d{3,4}[\s\
 email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
 money_pattern = r'(?:Rs\.?|₹|\$|€|£|¥|₩|₽|₦|₨|₪|₡|₢|₣|₤|₥|₦|₧|₨|₩|₪|₫|€|₭|₮|₯|₰|₱|₲|₳|₴|₵|₶|₷|₸|₹|₺)\s*[0-9,]+(?:\.[0-9]{1,2})?|[0-9,]+(?:\.[0-9]{1,2})?\s*(?:Rs|rupees?|dollars?|euros?|pounds?|yen|won|ruble|naira|shekel|USD|EUR|GBP|INR|JPY|KRW|RUB|NGN|ILS)\b'
 
+# Message text given to media sent without a caption
+MEDIA_PLACEHOLDER = "[Media message]"
+
+# Phrases that mark a message as a group system notification (matched case-insensitively as whole words)
+GROUP_SYSTEM_KEYWORDS = [
+    "created this group", "Messages and calls are end-to-end encrypted",
+    "changed their phone number", "You were added", "You added",
+    "left the group", "was removed", "pinned a message",
+    "unpinned a message", "changed the group description", 
+    "changed the group icon", "changed the group settings",
+    "changed the subject to", "joined using this group's invite link",
+    "became an admin", "is no longer an admin", "removed",
+    "added", "Security code changed", "Your security code with",
+    "Tap to learn more", "Disappearing messages", "turned on disappearing messages",
+    "turned off disappearing messages", "set disappearing messages",
+    "group invite link", "reset group invite link",
+    "changed to", "changed from", "now allows", "now only allows"
+]
+
+def _phrase_trie_pattern(phrases):
+    """Regex body matching any of the phrases, with shared prefixes factored into a trie."""
+    root = {}
+    for phrase in phrases:
+        node = root
+        for ch in phrase.lower():
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node):
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return render(root)
+
+def compile_phrase_matcher(phrases):
+    """
+    Compile phrases into one regex for a single scan over lowercased text.
+
+    Because the alternation is factored through a prefix trie, each text position
+    follows at most one branch per character instead of retrying every phrase, so
+    adding phrases barely changes the cost of a scan.
+    """
+    return re.compile(r"(?<!\w)(?:" + _phrase_trie_pattern(phrases) + r")(?!\w)")
+
+group_system_matcher = compile_phrase_matcher(GROUP_SYSTEM_KEYWORDS)
+
+def add_group_system_keywords(phrases):
+    """Register extra system phrases (e.g. from a non-English export) and recompile the matcher once."""
+    global group_system_matcher
+    GROUP_SYSTEM_KEYWORDS.extend(phrase for phrase in phrases if phrase not in GROUP_SYSTEM_KEYWORDS)
+    group_system_matcher = compile_phrase_matcher(GROUP_SYSTEM_KEYWORDS)
+
+def is_group_system_message(text: str) -> bool:
+    """True when text contains any group system phrase."""
+    return group_system_matcher.search(text.lower()) is not None
+
 def clean_invisible(text: str) -> str:
     """Clean invisible Unicode characters from text and handle encoding issues."""
     if not isinstance(text, str):
@@ -48,7 +112,8 @@ def clean_invisible(text: str) -> str:
     # Additional invisible and formatting characters
     text = text.replace('\u200b', '')  # Zero-width space
     text = text.replace('\u200c', '')  # Zero-width non-joiner
-    text = text.replace('\u200d', '')  # Zero-width joiner
+    if '\u200d' in text:
+        text = stray_zwj_pattern.sub('', text)  # Zero-width joiner (kept inside emoji ZWJ sequences)
     text = text.replace('\u2060', '')  # Word joiner
     text = text.replace('\u2066', '')  # Left-to-right isolate
     text = text.replace('\u2067', '')  # Right-to-left isolate
@@ -151,7 +216,11 @@ def normalize_contact_name(contact_name):
     return contact_name.strip()
 
 def extract_message_data(match, raw_message, dt_obj, dt_utc):
-    """Extract message data from regex match."""
+    """Extract message data from regex match (group 4 is the sender, group 5 the message)."""
+    return extract_message_fields(match.group(4), match.group(5), raw_message, dt_obj, dt_utc)
+
+def extract_message_fields(sender, message, raw_message, dt_obj, dt_utc):
+    """Extract message data from a sender name and message text."""
     urls, url_matches = [], []
     phone_numbers, phone_matches = [], []
     emails, email_matches = [], []
@@ -159,31 +228,15 @@ def extract_message_data(match, raw_message, dt_obj, dt_utc):
     emojis, emoji_matches = [], []
     money_amounts, money_matches = [], []
     message_modifier = ""
-    group_system_keywords = [
-        "created this group", "Messages and calls are end-to-end encrypted",
-        "changed their phone number", "You were added", "You added",
-        "left the group", "was removed", "pinned a message",
-        "unpinned a message", "changed the group description", 
-        "changed the group icon", "changed the group settings",
-        "changed the subject to", "joined using this group's invite link",
-        "became an admin", "is no longer an admin", "removed",
-        "added", "Security code changed", "Your security code with",
-        "Tap to learn more", "Disappearing messages", "turned on disappearing messages",
-        "turned off disappearing messages", "set disappearing messages",
-        "group invite link", "reset group invite link",
-        "changed to", "changed from", "now allows", "now only allows"
-    ]
-    # More comprehensive emoji pattern
-    emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002600-\U000026FF\U00002700-\U000027BF\U0001F900-\U0001F9FF\U0001F018-\U0001F270\U0001F000-\U0001F02F\U0001F0A0-\U0001F0FF\U0001F100-\U0001F64F\U0001F170-\U0001F251]', re.UNICODE)
 
-    # Extract sender and message from match - ensure consistent extraction
-    sender = clean_invisible(match.group(4)) if match.group(4) else "unknown"
+    # Clean sender and message consistently
+    sender = clean_invisible(sender) if sender else "unknown"
     # Normalize the sender name for consistent contact handling
     sender = normalize_contact_name(sender)
     # Ensure sender is never empty or None
     if not sender or sender.strip() == "":
         sender = "unknown"
-    message = clean_invisible(match.group(5)) if match.group(5) else ""
+    message = clean_invisible(message) if message else ""
     
     # Detect and extract message modifiers - comprehensive patterns for all formats
     modifier_patterns = [
@@ -239,11 +292,8 @@ def extract_message_data(match, raw_message, dt_obj, dt_utc):
                 'end': end_pos
             })
 
-    for match_obj in re.finditer(emoji_pattern, message):
-        emoji = match_obj.group().strip()
-        start_pos = match_obj.start()
-        end_pos = match_obj.end()
-
+    # Whole emoji sequences (ZWJ families, skin tones, flags, keycaps) count as one emoji
+    for emoji, start_pos, end_pos in find_emojis(message):
         emojis.append(emoji)
         emoji_matches.append({
             'emoji': emoji,
@@ -284,7 +334,7 @@ def extract_message_data(match, raw_message, dt_obj, dt_utc):
     message_clean = re.sub(r'@+', '', message_clean)
 
     # Remove emojis
-    message_clean = re.sub(emoji_pattern, '', message_clean)
+    message_clean = strip_emojis(message_clean)
 
     # Clean up extra spaces, newlines, and other whitespace
     message_clean = re.sub(r'\s+', ' ', message_clean).strip()
@@ -397,7 +447,7 @@ def extract_message_data(match, raw_message, dt_obj, dt_utc):
                 message = remaining_text
                 break
 
-    group_system_flag = any(kw.lower() in original_message.lower() for kw in group_system_keywords)
+    group_system_flag = is_group_system_message(original_message)
     actual_sender = "group_notification" if group_system_flag else sender
 
     return {
@@ -430,12 +480,160 @@ def extract_message_data(match, raw_message, dt_obj, dt_utc):
         "minute": dt_obj.minute
     }
 
-def parse_pc(lines, dt_utc_offset):
-    """Parse PC format WhatsApp chat lines."""
-    messages = []
-    pc_message_regex = re.compile(r"\[(\d{2}/\d{2}/\d{2}),\s*(\d{1,2}:\d{2}:\d{2})\s?(AM|PM)\]\s*(.*?):\s*(.*)")
-    
-    for raw_message in lines:
+def group_notification_fields(message, raw_message, dt_obj, dt_utc):
+    """Message data for a group notification line that has no sender."""
+    return {
+        'datetime_ist': dt_obj.isoformat(),
+        'datetime_ist_human': dt_obj.strftime("%d %b %Y, %I:%M %p"),
+        'datetime_utc': dt_utc.isoformat(),
+        'sender': 'group_notification',
+        'raw_message': raw_message,
+        'message': message,
+        'media': '',
+        'media_file_name': '',
+        'urls': '',
+        'url_positions': '',
+        'phone_numbers': '',
+        'phone_positions': '',
+        'emails': '',
+        'email_positions': '',
+        'money_amounts': '',
+        'money_positions': '',
+        'mentions': '',
+        'mention_positions': '',
+        'emojis': '',
+        'emoji_positions': '',
+        'message_modifier': '',
+        'group_system_message': True,
+        'year': dt_obj.year,
+        'month': dt_obj.month,
+        'day': dt_obj.day,
+        'hour': dt_obj.hour,
+        'minute': dt_obj.minute
+    }
+
+class ChatDialect(NamedTuple):
+    """Timestamp header layout of one export, as inferred by detect_dialect."""
+    bracketed: bool        # PC "[date, time] Sender: ..." vs mobile "date, time - Sender: ..."
+    day_first: bool        # DD/MM vs MM/DD
+    four_digit_year: bool  # YYYY vs YY
+    twelve_hour: bool      # "9:05 pm" vs "21:05"
+    seconds: bool          # "9:05:12" vs "9:05"
+    date_separator: str = "/"
+
+    @property
+    def format_name(self) -> str:
+        return "PC" if self.bracketed else "Mobile"
+
+# The layouts the parser handled before detection existed, used when a file has no recognizable headers
+PC_DIALECT = ChatDialect(bracketed=True, day_first=True, four_digit_year=False, twelve_hour=True, seconds=True)
+MOBILE_DIALECT = ChatDialect(bracketed=False, day_first=True, four_digit_year=False, twelve_hour=True, seconds=False)
+
+# Loose header pattern for sampling only: it accepts every layout so the votes can pick one
+header_probe_regex = re.compile(
+    r"(\[)?(\d{1,2})([/.\-])(\d{1,2})\3(\d{2,4}),?\s*\d{1,2}:\d{2}(:\d{2})?\s?([AaPp]\.?[Mm]\.?)?\]?\s*(-)?"
+)
+
+def detect_dialect(lines, sample_size=300, default: Optional[ChatDialect] = None) -> Optional[ChatDialect]:
+    """
+    Infer the header layout from the first sample_size header lines.
+
+    Bracket style, 12/24-hour clock, seconds and year width go by majority vote.
+    Day/month order is decided by any field above 12 (DD/MM wins when nothing
+    disambiguates, as WhatsApp exports from day-first locales are what this
+    parser was written for). Returns default when no header line is found.
+    """
+    headers = bracketed = four_digit = twelve_hour = seconds = 0
+    first_over_12 = second_over_12 = False
+    separators = {}
+    for raw_line in lines:
+        match = header_probe_regex.match(clean_invisible(raw_line))
+        if not match:
+            continue
+        headers += 1
+        bracketed += match.group(1) is not None
+        four_digit += len(match.group(5)) == 4
+        twelve_hour += match.group(7) is not None
+        seconds += match.group(6) is not None
+        first_over_12 |= int(match.group(2)) > 12
+        second_over_12 |= int(match.group(4)) > 12
+        separators[match.group(3)] = separators.get(match.group(3), 0) + 1
+        if headers >= sample_size:
+            break
+
+    if not headers:
+        return default
+    return ChatDialect(
+        bracketed=bracketed * 2 > headers,
+        day_first=first_over_12 or not second_over_12,
+        four_digit_year=four_digit * 2 > headers,
+        twelve_hour=twelve_hour * 2 > headers,
+        seconds=seconds * 2 > headers,
+        date_separator=max(separators, key=separators.get)
+    )
+
+def _timestamp_decoder(dialect: ChatDialect):
+    """
+    Build a datetime decoder for matches of the dialect's header regex.
+
+    Group layout: 1-3 date fields, 4 hour, 5 minute, 6 seconds (empty when the
+    dialect has none), 7 am/pm (empty for 24-hour clocks).
+    """
+    day, month = (1, 2) if dialect.day_first else (2, 1)
+    century = 0 if dialect.four_digit_year else 2000
+
+    if dialect.twelve_hour:
+        def decode(match):
+            hour = int(match[4])
+            # strptime's %I range; % 12 below would otherwise accept 0 and 13-99
+            if not 1 <= hour <= 12:
+                raise ValueError(f"hour {hour} is not a 12-hour clock hour")
+            hour = hour % 12 + (12 if match[7] in ("P", "p") else 0)
+            return datetime(century + int(match[3]), int(match[month]), int(match[day]),
+                            hour, int(match[5]), int(match[6] or 0))
+    else:
+        def decode(match):
+            return datetime(century + int(match[3]), int(match[month]), int(match[day]),
+                            int(match[4]), int(match[5]), int(match[6] or 0))
+    return decode
+
+@lru_cache(maxsize=None)
+def compile_dialect(dialect: ChatDialect):
+    """
+    Return (message_regex, notification_regex, decode_timestamp) specialized for one dialect.
+
+    message_regex captures the timestamp groups described in _timestamp_decoder
+    followed by 8 sender and 9 message; notification_regex (sender-less system
+    lines) captures 8 message.
+    """
+    sep = re.escape(dialect.date_separator)
+    year = r"(\d{4})" if dialect.four_digit_year else r"(\d{2})"
+    timestamp = (
+        rf"(\d{{1,2}}){sep}(\d{{1,2}}){sep}{year},\s*(\d{{1,2}}):(\d{{2}})"
+        + (r":(\d{2})" if dialect.seconds else r"()")
+        + (r"\s?([AaPp])\.?[Mm]\.?" if dialect.twelve_hour else r"()")
+    )
+    if dialect.bracketed:
+        header = rf"\[{timestamp}\]\s*"
+    else:
+        header = rf"{timestamp}\s*-\s*"
+    message_regex = re.compile(header + r"(.*?):\s*(.*)")
+    notification_regex = re.compile(header + r"(.*)")
+    return message_regex, notification_regex, _timestamp_decoder(dialect)
+
+def parse_pc(lines, dt_utc_offset, dialect: Optional[ChatDialect] = None, quarantine: Optional[list] = None):
+    """
+    Parse PC format WhatsApp chat lines (dialect is detected from the lines when not given).
+
+    Skipped lines are appended to quarantine, when given, as (line index, reason).
+    """
+    if dialect is None:
+        dialect = detect_dialect(lines, default=PC_DIALECT)
+    pc_message_regex, _, decode_timestamp = compile_dialect(dialect)
+
+    # Assembly pass: headers and body lines only, so multi-line messages are complete before extraction
+    pending = []  # (sender, body lines, raw_message, dt_obj, dt_utc)
+    for line_index, raw_message in enumerate(lines):
         # Clean Unicode characters from the line before processing
         line = clean_invisible(raw_message.strip())
         if not line:
@@ -444,21 +642,24 @@ def parse_pc(lines, dt_utc_offset):
         match = pc_message_regex.match(line)
         if match:
             try:
-                dt_obj = datetime.strptime(f"{match.group(1)} {match.group(2)} {match.group(3)}", "%d/%m/%y %I:%M:%S %p")
-                dt_utc = dt_obj - dt_utc_offset
-                msg_data = extract_message_data(match, raw_message, dt_obj, dt_utc)
-                messages.append(msg_data)
-            except ValueError:
+                dt_obj = decode_timestamp(match)
+            except ValueError as e:
                 # Skip malformed date/time entries
+                if quarantine is not None:
+                    quarantine.append((line_index, f"invalid timestamp: {e}"))
                 continue
-        else:
-            # Handle continuation lines with consistent cleaning
-            if messages and "message" in messages[-1]:
-                cleaned_line = clean_invisible(line)
-                if isinstance(messages[-1]["message"], str):
-                    messages[-1]["message"] += " " + cleaned_line
-                else:
-                    messages[-1]["message"] = str(messages[-1]["message"]) + " " + cleaned_line
+            pending.append((match[8], [match[9]], raw_message, dt_obj, dt_obj - dt_utc_offset))
+        elif pending:
+            # Continuation line of the previous message
+            pending[-1][1].append(line)
+        elif quarantine is not None:
+            quarantine.append((line_index, "text before the first message"))
+
+    # Extraction pass over complete message bodies
+    messages = [
+        extract_message_fields(sender, " ".join(body), raw_message, dt_obj, dt_utc)
+        for sender, body, raw_message, dt_obj, dt_utc in pending
+    ]
     
     # Normalize pre/post processing for both PC and Mobile
     for msg in messages:
@@ -478,117 +679,61 @@ def parse_pc(lines, dt_utc_offset):
 
         # Ensure media message consistency
         if msg.get('media', ''):
-            msg['message'] = msg['message'] or '[Media message]'
+            msg['message'] = msg['message'] or MEDIA_PLACEHOLDER
 
     # Filter out group notifications
     filtered_messages = [msg for msg in messages if msg.get('sender') != 'group_notification']
     return filtered_messages
 
-def parse_mobile(lines, dt_utc_offset):
-    """Parse mobile format WhatsApp chat lines."""
-    messages = []
-    # Updated regex pattern to handle different mobile formats with flexible whitespace
-    mobile_message_regex = re.compile(r"(\d{1,2}/\d{1,2}/\d{2,4}),\s*(\d{1,2}:\d{2})\s?(am|pm|AM|PM)\s*-\s*(.*?):\s*(.*)")
-    
-    # Regex to detect group notification lines without explicit sender
-    mobile_group_notification_regex = re.compile(r"(\d{1,2}/\d{1,2}/\d{2,4}),\s*(\d{1,2}:\d{2})\s?(am|pm|AM|PM)\s*-\s*(.*)")
-    
-    for raw_message in lines:
+def parse_mobile(lines, dt_utc_offset, dialect: Optional[ChatDialect] = None, quarantine: Optional[list] = None):
+    """
+    Parse mobile format WhatsApp chat lines (dialect is detected from the lines when not given).
+
+    Skipped lines are appended to quarantine, when given, as (line index, reason).
+    """
+    if dialect is None:
+        dialect = detect_dialect(lines, default=MOBILE_DIALECT)
+    # Header regexes and timestamp decoder specialized for this export's date/time layout;
+    # the notification regex matches group notification lines without an explicit sender
+    mobile_message_regex, mobile_group_notification_regex, decode_timestamp = compile_dialect(dialect)
+
+    # Assembly pass: headers and body lines only, so multi-line messages are complete before extraction
+    pending = []  # (sender or None for group notifications, body lines, raw_message, dt_obj, dt_utc)
+    for line_index, raw_message in enumerate(lines):
         # Apply same Unicode cleaning as PC format
         line = clean_invisible(raw_message.strip())
         if not line:
             continue
             
         match = mobile_message_regex.match(line)
+        if match:
+            sender, body = match[8], match[9]
+        else:
+            # Handle group notifications without explicit senders
+            match = mobile_group_notification_regex.match(line)
+            if match:
+                sender, body = None, match[8]
         if match:
             try:
-                date_str, time_str, am_pm, sender, message = match.groups()
-                
-                # Handle different date formats (DD/MM/YY or D/M/YY or DD/MM/YYYY)
-                if len(date_str.split('/')[2]) == 2:
-                    # Two-digit year
-                    dt_obj = datetime.strptime(f"{date_str} {time_str} {am_pm.upper()}", "%d/%m/%y %I:%M %p")
-                else:
-                    # Four-digit year
-                    dt_obj = datetime.strptime(f"{date_str} {time_str} {am_pm.upper()}", "%d/%m/%Y %I:%M %p")
-                    
-                dt_utc = dt_obj - dt_utc_offset
-                
-                # Create a mock match object for extract_message_data
-                class MockMatch:
-                    def __init__(self, groups):
-                        self._groups = groups
-                    def group(self, n):
-                        return self._groups[n-1] if n <= len(self._groups) else None
-                    def groups(self):
-                        return self._groups
-                
-                mock_match = MockMatch([date_str, time_str, am_pm, sender, message])
-                msg_data = extract_message_data(mock_match, raw_message, dt_obj, dt_utc)
-                messages.append(msg_data)
+                dt_obj = decode_timestamp(match)
             except ValueError as e:
                 # Skip malformed date/time entries
-                print(f"Error parsing mobile message: {e} - Line: {line}")
+                if quarantine is not None:
+                    quarantine.append((line_index, f"invalid timestamp: {e}"))
                 continue
-        else:
-            # Handle group notifications without explicit senders
-            group_notification_match = mobile_group_notification_regex.match(line)
-            if group_notification_match:
-                try:
-                    date_str, time_str, am_pm, message = group_notification_match.groups()
-                    
-                    # Handle different date formats (DD/MM/YY or D/M/YY or DD/MM/YYYY)
-                    if len(date_str.split('/')[2]) == 2:
-                        # Two-digit year
-                        dt_obj = datetime.strptime(f"{date_str} {time_str} {am_pm.upper()}", "%d/%m/%y %I:%M %p")
-                    else:
-                        # Four-digit year
-                        dt_obj = datetime.strptime(f"{date_str} {time_str} {am_pm.upper()}", "%d/%m/%Y %I:%M %p")
-
-                    dt_utc = dt_obj - dt_utc_offset
-
-                    msg_data = {
-                        'datetime_ist': dt_obj.isoformat(),
-                        'datetime_ist_human': dt_obj.strftime("%d %b %Y, %I:%M %p"),
-                        'datetime_utc': dt_utc.isoformat(),
-                        'sender': 'group_notification',
-                        'raw_message': raw_message,
-                        'message': message,
-                        'media': '',
-                        'media_file_name': '',
-                        'urls': '',
-                        'url_positions': '',
-                        'phone_numbers': '',
-                        'phone_positions': '',
-                        'emails': '',
-                        'email_positions': '',
-                        'money_amounts': '',
-                        'money_positions': '',
-                        'mentions': '',
-                        'mention_positions': '',
-                        'emojis': '',
-                        'emoji_positions': '',
-                        'message_modifier': '',
-                        'group_system_message': True,
-                        'year': dt_obj.year,
-                        'month': dt_obj.month,
-                        'day': dt_obj.day,
-                        'hour': dt_obj.hour,
-                        'minute': dt_obj.minute
-                    }
-                    messages.append(msg_data)
-                except ValueError as e:
-                    # Skip malformed date/time entries
-                    print(f"Error parsing mobile group notification: {e} - Line: {line}")
-                    continue
-            else:
-                # Handle continuation lines with consistent cleaning
-                if messages and "message" in messages[-1]:
-                    cleaned_line = clean_invisible(line)
-                    if isinstance(messages[-1]["message"], str):
-                        messages[-1]["message"] += " " + cleaned_line
-                    else:
-                        messages[-1]["message"] = str(messages[-1]["message"]) + " " + cleaned_line
+            pending.append((sender, [body], raw_message, dt_obj, dt_obj - dt_utc_offset))
+        elif pending:
+            # Continuation line of the previous message
+            pending[-1][1].append(line)
+        elif quarantine is not None:
+            quarantine.append((line_index, "text before the first message"))
+
+    # Extraction pass over complete message bodies
+    messages = [
+        extract_message_fields(sender, " ".join(body), raw_message, dt_obj, dt_utc) if sender is not None
+        else group_notification_fields(" ".join(body), raw_message, dt_obj, dt_utc)
+        for sender, body, raw_message, dt_obj, dt_utc in pending
+    ]
 
     # Enhanced media detection for mobile format - use advanced pattern matching
     for msg in messages:
@@ -720,71 +865,143 @@ def parse_mobile(lines, dt_utc_offset):
 
         # Ensure media message consistency
         if msg.get('media', ''):
-            msg['message'] = msg['message'] or '[Media message]'
+            msg['message'] = msg['message'] or MEDIA_PLACEHOLDER
 
     # Filter out group notifications
     filtered_messages = [msg for msg in messages if msg.get('sender') != 'group_notification']
     return filtered_messages
 
-def enhance_mobile_media_with_pc_reference(mobile_messages, pc_messages):
-    """Enhance mobile media detection using PC format as reference with fuzzy timestamp matching."""
-    if not pc_messages:
-        return mobile_messages
-    
-    # Create timestamp-based mapping from PC media types with fuzzy matching
-    pc_media_timestamps = []
-    for msg in pc_messages:
-        if msg.get('media') and msg.get('media') != '':
-            timestamp = msg['datetime_ist']
-            media_type = msg['media']
-            dt = datetime.fromisoformat(timestamp)
-            pc_media_timestamps.append((dt, media_type))
-    
-    # Apply fuzzy timestamp matching to mobile generic media messages
-    enhanced_count = 0
-    matched_pairs = []
-    unmatched_mobile = []
-    
-    for msg in mobile_messages:
-        if msg.get('media') == 'media':  # Generic media that needs enhancement
-            timestamp = msg['datetime_ist']
-            dt = datetime.fromisoformat(timestamp)
-            
-            # Find the closest PC media message within 30 seconds
-            best_match = None
-            min_diff = timedelta(seconds=30)
-            
-            for pc_dt, pc_media_type in pc_media_timestamps:
-                diff = abs(dt - pc_dt)
-                if diff <= min_diff:
-                    min_diff = diff
-                    best_match = pc_media_type
-            
-            if best_match:
-                msg['media'] = best_match
-                msg['enhanced_from_pc'] = True  # Mark as enhanced
-                enhanced_count += 1
-                matched_pairs.append((msg['datetime_ist'], best_match, min_diff.total_seconds()))
-            else:
-                unmatched_mobile.append(msg['datetime_ist'])
-    
-    # Debug logging
-    if enhanced_count > 0:
-        print(f"\n🔧 Enhanced {enhanced_count} mobile media messages using PC reference")
-        print(f"   Matched pairs (timestamp, type, diff_seconds):")
-        for timestamp, media_type, diff in matched_pairs[:5]:  # Show first 5
-            print(f"   - {timestamp} -> {media_type} (±{diff:.1f}s)")
-        if len(matched_pairs) > 5:
-            print(f"   ... and {len(matched_pairs) - 5} more matches")
-    
-    if unmatched_mobile:
-        print(f"\n⚠️  {len(unmatched_mobile)} mobile media messages could not be matched")
-        if len(unmatched_mobile) <= 3:
-            print(f"   Unmatched timestamps: {unmatched_mobile}")
-    
-    return mobile_messages
+def enhance_mobile_media_with_pc_reference(mobile_messages, pc_messages, tolerance_seconds=30, match_sender=False):
+    """
+    Enhance mobile media detection using PC format as reference with fuzzy timestamp matching.
+
+    Each generic mobile media message takes the media type of the nearest PC media
+    message within tolerance_seconds (optionally only from the same sender). Both
+    sides are sorted once and joined with pd.merge_asof instead of comparing every
+    pair. Returns (mobile_messages, stats) where stats holds the match counts.
+    """
+    candidates = [i for i, msg in enumerate(mobile_messages) if msg.get('media') == 'media']
+    pc_media = [msg for msg in pc_messages if msg.get('media')]
+    stats = {
+        'candidates': len(candidates),
+        'matched': 0,
+        'unmatched': len(candidates),
+        'media_types': {},
+        'mean_offset_seconds': None,
+        'max_offset_seconds': None,
+        'unmatched_timestamps': [mobile_messages[i]['datetime_ist'] for i in candidates]
+    }
+    if not candidates or not pc_media:
+        return mobile_messages, stats
+
+    mobile_df = pd.DataFrame({
+        'row': candidates,
+        'time': pd.to_datetime([mobile_messages[i]['datetime_ist'] for i in candidates], format='ISO8601'),
+        'sender': [mobile_messages[i].get('sender', '') for i in candidates]
+    }).sort_values('time', kind='stable')
+    pc_df = pd.DataFrame({
+        'pc_time': pd.to_datetime([msg['datetime_ist'] for msg in pc_media], format='ISO8601'),
+        'pc_media': [msg['media'] for msg in pc_media]
+    })
+    if match_sender:
+        pc_df['sender'] = [msg.get('sender', '') for msg in pc_media]
+    pc_df = pc_df.sort_values('pc_time', kind='stable')
+
+    # Nearest PC media message for every mobile candidate in one sorted pass
+    matches = pd.merge_asof(
+        mobile_df, pc_df, left_on='time', right_on='pc_time',
+        by='sender' if match_sender else None,
+        direction='nearest', tolerance=pd.Timedelta(seconds=tolerance_seconds)
+    )
+    matched = matches[matches['pc_media'].notna()]
+
+    for row, media_type in zip(matched['row'], matched['pc_media']):
+        mobile_messages[row]['media'] = media_type
+        mobile_messages[row]['enhanced_from_pc'] = True  # Mark as enhanced
+
+    offsets = (matched['time'] - matched['pc_time']).abs().dt.total_seconds()
+    unmatched = matches[matches['pc_media'].isna()].sort_values('row')
+    stats.update({
+        'matched': len(matched),
+        'unmatched': len(unmatched),
+        'media_types': matched['pc_media'].value_counts().to_dict(),
+        'mean_offset_seconds': float(offsets.mean()) if len(offsets) else None,
+        'max_offset_seconds': float(offsets.max()) if len(offsets) else None,
+        'unmatched_timestamps': [mobile_messages[row]['datetime_ist'] for row in unmatched['row']]
+    })
+    return mobile_messages, stats
+
+QUARANTINE_COLUMNS = ["line_number", "byte_offset", "reason"]
+# Columns of the parsed messages DataFrame, also used for the empty frame when nothing parses
+PARSED_COLUMNS = [
+    "datetime_ist", "datetime_ist_human", "datetime_utc", "sender",
+    "raw_message", "message", "media", "media_file_name", "urls", "url_positions",
+    "phone_numbers", "phone_positions", "emails", "email_positions",
+    "money_amounts", "money_positions", "mentions", "mention_positions",
+    "emojis", "emoji_positions", "message_modifier", "group_system_message",
+    "year", "month", "day", "hour", "minute", "enhanced_from_pc", "language"
+]
+
+def message_languages(df: pd.DataFrame):
+    """Language label of every message; captionless media has no text to judge and is labelled other."""
+    return identify_languages(df["message"].mask(df["message"] == MEDIA_PLACEHOLDER, "")).to_numpy()
+
+def read_chat_lines(file: Union[str, IO, Any], raw_lines: Optional[list] = None) -> list:
+    """
+    Read the lines of a chat export from a filepath or uploaded file object.
+
+    Files read from a path keep a "\n" terminator (whatever the export used);
+    uploaded content is split without terminators. raw_lines, when given, is
+    filled with the same lines carrying their original terminators ("\r\n"
+    included), for byte offsets into the export.
+    """
+    if isinstance(file, str):
+        with open(file, "r", encoding="utf-8", newline="") as f:
+            original = f.readlines()
+        if raw_lines is not None:
+            raw_lines.extend(original)
+        # Same lines as universal-newline reading: every terminator reads as "\n"
+        return [line.rstrip("\r\n") + "\n" if line.endswith(("\r", "\n")) else line for line in original]
+
+    # Handle Streamlit UploadedFile or similar
+    try:
+        content = file.read()
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        elif isinstance(content, bytearray):
+            content = content.decode("utf-8")
+        elif isinstance(content, memoryview):
+            content = content.tobytes().decode("utf-8")
+        elif not isinstance(content, str):
+            content = str(content)
+        if raw_lines is not None:
+            raw_lines.extend(content.splitlines(keepends=True))
+        return content.splitlines()
+    except Exception as e:
+        raise ValueError(f"Error reading file: {e}")
+
+def quarantine_frame(raw_lines, quarantine) -> pd.DataFrame:
+    """
+    Turn the (line index, reason) pairs recorded while parsing into a table.
+
+    raw_lines are the export's lines with their original terminators (see
+    read_chat_lines). Columns: line_number (1-based), byte_offset (start of
+    the line in the UTF-8 export) and reason. Offsets are only computed up
+    to the last quarantined line.
+    """
+    if not quarantine:
+        return pd.DataFrame(columns=QUARANTINE_COLUMNS)
+    last_index = max(index for index, _ in quarantine)
+    offsets = [0]
+    for line in raw_lines[:last_index]:
+        offsets.append(offsets[-1] + len(line.encode("utf-8")))
+    return pd.DataFrame(
+        [(index + 1, offsets[index], reason) for index, reason in quarantine],
+        columns=QUARANTINE_COLUMNS
+    )
 
-def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_file=None) -> pd.DataFrame:
+def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_file=None, return_quarantine=False,
+                    timezone: Optional[str] = None):
     """
     Parse WhatsApp chat file from filepath or uploaded file object.
     Supports both PC and Android formats.
@@ -793,58 +1010,51 @@ def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_
         file: The main chat file to parse
         utc_offset_hours: UTC offset for timezone conversion
         pc_reference_file: Optional PC format file to enhance mobile media detection
+        return_quarantine: Also return the table of skipped lines (see quarantine_frame)
+        timezone: IANA zone the export's timestamps are in (e.g. "Europe/London"); when
+            given, datetime_utc follows that zone's DST rules and utc_offset_hours is ignored
+
+    Returns the messages DataFrame, or (DataFrame, quarantine DataFrame) when return_quarantine is set.
     """
-    # Read lines from file or uploaded file object
-    if isinstance(file, str):
-        with open(file, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    else:
-        # Handle Streamlit UploadedFile or similar
-        try:
-            content = file.read()
-            if isinstance(content, bytes):
-                content = content.decode("utf-8")
-            elif isinstance(content, bytearray):
-                content = content.decode("utf-8")
-            elif isinstance(content, memoryview):
-                content = content.tobytes().decode("utf-8")
-            elif not isinstance(content, str):
-                content = str(content)
-            lines = content.splitlines()
-        except Exception as e:
-            raise ValueError(f"Error reading file: {e}")
-        
+    raw_lines = [] if return_quarantine else None
+    lines = read_chat_lines(file, raw_lines)
+    quarantine = []
+    df = parse_chat_lines(lines, utc_offset_hours, pc_reference_file, quarantine, timezone)
+    if return_quarantine:
+        return df, quarantine_frame(raw_lines, quarantine)
+    return df
+
+def parse_chat_lines(lines, utc_offset_hours=0, pc_reference_file=None, quarantine: Optional[list] = None,
+                     timezone: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parse the lines of a WhatsApp chat export into the messages DataFrame.
+
+    Skipped lines are appended to quarantine, when given, as (line index, reason).
+    """
+    if timezone is not None:
+        # Fail before parsing; the per-message offset is replaced by one tz_localize below
+        validate_timezone(timezone)
+        utc_offset_hours = 0
     if not lines:
-        return pd.DataFrame(columns=[
-            "datetime_ist", "datetime_ist_human", "datetime_utc", "sender", 
-            "raw_message", "message", "media", "media_file_name", "urls", "url_positions", 
-            "phone_numbers", "phone_positions", "emails", "email_positions", 
-            "money_amounts", "money_positions", "mentions", "mention_positions",
-            "emojis", "emoji_positions", "message_modifier", "group_system_message", 
-            "year", "month", "day", "hour", "minute"
-        ])
+        return pd.DataFrame(columns=PARSED_COLUMNS)
 
     dt_utc_offset = timedelta(hours=utc_offset_hours)
 
-    # Detect format by first non-empty line
-    first_line = next((ln for ln in lines if ln.strip()), "")
-    format_detected = ""
-
-    # Clean first line for detection
-    clean_first_line = clean_invisible(first_line)
+    # Detect the export dialect (PC/mobile, date order, year width, clock) from a sample of headers
+    dialect = detect_dialect(lines)
+    if dialect is None:
+        # Default to PC format
+        dialect = PC_DIALECT
+        format_detected = "PC (default)"
+    else:
+        format_detected = dialect.format_name
 
-    if clean_first_line.startswith('['):
+    if dialect.bracketed:
         # PC format: [DD/MM/YY, HH:MM:SS AM/PM] Sender: Message
-        format_detected = "PC"
-        messages = parse_pc(lines, dt_utc_offset)
-    elif "-" in clean_first_line and "," in clean_first_line:
-        # Mobile format: DD/MM/YY, HH:MM AM/PM - Sender: Message
-        format_detected = "Mobile"
-        messages = parse_mobile(lines, dt_utc_offset)
+        messages = parse_pc(lines, dt_utc_offset, dialect, quarantine)
     else:
-        # Default to PC format
-        format_detected = "PC (default)"
-        messages = parse_pc(lines, dt_utc_offset)
+        # Mobile format: DD/MM/YY, HH:MM AM/PM - Sender: Message
+        messages = parse_mobile(lines, dt_utc_offset, dialect, quarantine)
 
     # If PC reference file is provided and current format is mobile, enhance media detection
     if pc_reference_file and format_detected.startswith("Mobile"):
@@ -881,7 +1091,9 @@ def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_
                 print(f"   PC media messages: {pc_media_count}")
                 
                 # Enhance mobile messages with PC reference
-                messages = enhance_mobile_media_with_pc_reference(messages, pc_messages)
+                messages, match_stats = enhance_mobile_media_with_pc_reference(messages, pc_messages)
+                print(f"   Enhanced {match_stats['matched']} of {match_stats['candidates']} generic mobile media messages "
+                      f"({match_stats['unmatched']} unmatched)")
             else:
                 print(f"   ⚠️  No valid lines found in PC reference file")
                 
@@ -892,41 +1104,13 @@ def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_
     # Debug information
     print(f"\n🔍 Debug Information:")
     print(f"Format detected: {format_detected}")
+    print(f"Dialect: {dialect}")
     print(f"Total lines in file: {len(lines)}")
-    print(f"First line sample: {repr(clean_first_line[:100])}")
     print(f"Raw messages parsed: {len(messages)}")
     
-    # Filter out malformed messages - ensure all required fields are present
-    required_fields = ['sender', 'message', 'datetime_ist', 'datetime_utc']
-    valid_messages = []
-    malformed_messages = []
-    
-    for message in messages:
-        if isinstance(message, dict):
-            missing_fields = [field for field in required_fields if field not in message]
-            if not missing_fields:
-                valid_messages.append(message)
-            else:
-                malformed_messages.append((message, missing_fields))
-        else:
-            malformed_messages.append((message, ['not_dict']))
-    
-    malformed_count = len(malformed_messages)
-    
-    print(f"Valid messages after filtering: {len(valid_messages)}")
-    print(f"Malformed messages filtered out: {malformed_count}")
-    
-    # Debug: show details of malformed messages
-    if malformed_count > 0:
-        print(f"\n⚠️  Malformed message details:")
-        for i, (msg, missing) in enumerate(malformed_messages[:3]):  # Show first 3
-            print(f"   Message {i+1}: Missing fields: {missing}")
-            if isinstance(msg, dict):
-                print(f"   Available fields: {list(msg.keys())}")
-            else:
-                print(f"   Message type: {type(msg)}")
-        if malformed_count > 3:
-            print(f"   ... and {malformed_count - 3} more malformed messages")
+    valid_messages = messages
+    if quarantine is not None:
+        print(f"Quarantined lines: {len(quarantine)}")
     
     # Debug: Inspect keys of valid_messages BEFORE DataFrame creation
     print(f"\n🔍 Raw message dict keys inspection:")
@@ -943,14 +1127,7 @@ def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_
         valid_messages = clean_valid_messages
 
     if not valid_messages:
-        return pd.DataFrame(columns=[
-            "datetime_ist", "datetime_ist_human", "datetime_utc", "sender", 
-            "raw_message", "message", "media", "media_file_name", "urls", "url_positions", 
-            "phone_numbers", "phone_positions", "emails", "email_positions", 
-            "money_amounts", "money_positions", "mentions", "mention_positions",
-            "emojis", "emoji_positions", "message_modifier", "group_system_message", 
-            "year", "month", "day", "hour", "minute"
-        ])
+        return pd.DataFrame(columns=PARSED_COLUMNS)
 
     # ===== CRITICAL FIX: Ensure all dictionary keys are clean strings =====
     cleaned_valid_messages = []
@@ -1078,10 +1255,16 @@ def parse_chat_file(file: Union[str, IO, Any], utc_offset_hours=0, pc_reference_
         print(f"\n🔍 DEBUG: Skipping deduplication to isolate the issue...")
         print(f"🔍 DEBUG: Current columns: {list(df.columns)}")
         
+        if timezone is not None:
+            df["datetime_utc"] = utc_strings(localize_timestamps(df["datetime_ist"], timezone)).to_numpy()
+
         # Add enhanced flag column if it doesn't exist
         if 'enhanced_from_pc' not in df.columns:
             df['enhanced_from_pc'] = False
         
+        # Label every message's language in one batch
+        df["language"] = message_languages(df)
+        
         # Sort by datetime first to ensure consistent ordering
         df = df.sort_values('datetime_ist')
         
@@ -0,0 +1,52 @@
+import pandas as pd
+
+# A message arriving later than this after the previous one starts a new
+# conversation rather than replying to it
+DEFAULT_MAX_LATENCY_MINUTES = 360
+QUANTILES = {"median_seconds": 0.5, "p90_seconds": 0.9}
+
+def reply_table(df: pd.DataFrame, max_latency_minutes: float = DEFAULT_MAX_LATENCY_MINUTES) -> pd.DataFrame:
+    """
+    One row per reply: a message whose previous message came from someone else.
+
+    Built with shift/diff over the chronologically sorted chat. Columns: sender
+    (who replied), replied_to (author of the previous message) and
+    latency_seconds (time since that previous message).
+    """
+    chat = pd.DataFrame({
+        "time": pd.to_datetime(df["datetime_ist"], format="ISO8601").to_numpy(),
+        "sender": df["sender"].to_numpy()
+    }).sort_values("time", kind="stable", ignore_index=True)
+    chat["replied_to"] = chat["sender"].shift()
+    chat["latency_seconds"] = chat["time"].diff().dt.total_seconds()
+    is_reply = (
+        chat["replied_to"].notna()
+        & (chat["sender"] != chat["replied_to"])
+        & (chat["latency_seconds"] <= max_latency_minutes * 60)
+    )
+    return chat.loc[is_reply, ["sender", "replied_to", "latency_seconds"]].reset_index(drop=True)
+
+def _latency_summary(replies: pd.DataFrame, keys: list) -> pd.DataFrame:
+    grouped = replies.groupby(keys, sort=True)["latency_seconds"]
+    # unstack leaves no quantile columns when there are no replies, so name them by level value
+    summary = grouped.quantile(list(QUANTILES.values())).unstack().reindex(columns=list(QUANTILES.values()))
+    summary.columns = list(QUANTILES)
+    summary.insert(0, "replies", grouped.size())
+    return summary
+
+def response_times(df: pd.DataFrame, max_latency_minutes: float = DEFAULT_MAX_LATENCY_MINUTES) -> dict:
+    """
+    Reply latency statistics for a chat.
+
+    Returns a dict with:
+        replies: the reply_table rows
+        pairs:   DataFrame indexed by (sender, replied_to) with replies,
+                 median_seconds and p90_seconds
+        senders: the same statistics per replying sender
+    """
+    replies = reply_table(df, max_latency_minutes)
+    return {
+        "replies": replies,
+        "pairs": _latency_summary(replies, ["sender", "replied_to"]),
+        "senders": _latency_summary(replies, ["sender"])
+    }
@@ -0,0 +1,134 @@
+import shlex
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Union
+import numpy as np
+import pandas as pd
+from word_frequency import non_alnum_regex, tokenize_messages
+
+def normalize_query_token(token: str) -> str:
+    """Normalize a query word exactly like indexed message words."""
+    return non_alnum_regex.sub("", token.lower())
+
+class SearchIndex:
+    """
+    Inverted index over the cleaned 'message' column.
+
+    Postings are stored CSR-style: for the token with code c, the message ids
+    and in-message word positions live in doc_ids[offsets[c]:offsets[c + 1]]
+    and positions[...], sorted by message id then position. Message ids are
+    row positions in the DataFrame the index was built from.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        messages = df["message"].reset_index(drop=True)
+        tokens = tokenize_messages(messages)
+        doc_ids = tokens.index.to_numpy(dtype=np.int64)
+        positions = tokens.groupby(level=0).cumcount().to_numpy(dtype=np.int64)
+        codes, vocabulary = pd.factorize(tokens.to_numpy())
+
+        order = np.lexsort((positions, doc_ids, codes))
+        self.doc_ids = doc_ids[order].astype(np.int32)
+        self.positions = positions[order].astype(np.int32)
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(vocabulary)))])
+        self.vocabulary = {token: code for code, token in enumerate(vocabulary)}
+
+        self.size = len(df)
+        self.senders = df["sender"].to_numpy(dtype=str)
+        self.timestamps = pd.to_datetime(df["datetime_ist"], format="ISO8601").to_numpy()
+
+    def postings(self, token: str):
+        """Return (message ids, positions) for one normalized token."""
+        code = self.vocabulary.get(token)
+        if code is None:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty
+        start, end = self.offsets[code], self.offsets[code + 1]
+        return self.doc_ids[start:end], self.positions[start:end]
+
+    def term(self, token: str) -> np.ndarray:
+        """Sorted unique ids of messages containing a token."""
+        return np.unique(self.postings(normalize_query_token(token))[0])
+
+    def phrase(self, words: List[str]) -> np.ndarray:
+        """Sorted unique ids of messages containing the words consecutively."""
+        words = [w for w in (normalize_query_token(word) for word in words) if w]
+        if not words:
+            return np.empty(0, dtype=np.int32)
+        docs, positions = self.postings(words[0])
+        # Encode (message id, position) pairs as single integers so each step is one np.isin
+        stride = np.int64(int(self.positions.max(initial=0)) + len(words) + 1)
+        candidates = docs.astype(np.int64) * stride + positions
+        for offset, word in enumerate(words[1:], start=1):
+            next_docs, next_positions = self.postings(word)
+            next_keys = next_docs.astype(np.int64) * stride + next_positions
+            candidates = candidates[np.isin(candidates + offset, next_keys)]
+            if candidates.size == 0:
+                break
+        return np.unique(candidates // stride).astype(np.int32)
+
+    def _clause(self, clause: str) -> np.ndarray:
+        words = clause.split()
+        return self.phrase(words) if len(words) > 1 else self.term(clause)
+
+    def search(self, query: str, senders: Optional[List[str]] = None,
+               start: Optional[Union[date, datetime]] = None,
+               end: Optional[Union[date, datetime]] = None) -> np.ndarray:
+        """
+        Run a boolean query and return matching row positions in chronological order.
+
+        Query syntax: words are ANDed together, "quoted text" matches a phrase,
+        OR between clauses matches either side, and a leading '-' or NOT
+        excludes a clause. Results can be limited to senders and to an
+        inclusive start/end date range.
+        """
+        try:
+            parts = shlex.split(query)
+        except ValueError:
+            # Unbalanced quotes: treat the query as plain words
+            parts = query.replace('"', " ").split()
+
+        # Each group is a list of clauses joined by OR; groups are ANDed (or excluded when negated)
+        groups = []
+        negate = pending_or = False
+        for part in parts:
+            if part == "OR":
+                pending_or = True
+                continue
+            if part == "NOT":
+                negate = True
+                continue
+            if part.startswith("-") and len(part) > 1:
+                negate, part = True, part[1:]
+            ids = self._clause(part)
+            if pending_or and groups and groups[-1][0] == negate:
+                groups[-1][1].append(ids)
+            else:
+                groups.append((negate, [ids]))
+            negate = pending_or = False
+
+        required = [np.unique(np.concatenate(ids)) for negated, ids in groups if not negated]
+        excluded = [np.unique(np.concatenate(ids)) for negated, ids in groups if negated]
+        if not required:
+            return np.empty(0, dtype=np.int32)
+
+        result = required[0]
+        for ids in required[1:]:
+            result = np.intersect1d(result, ids, assume_unique=True)
+        for ids in excluded:
+            result = np.setdiff1d(result, ids, assume_unique=True)
+
+        if senders:
+            result = result[np.isin(self.senders[result], list(senders))]
+        if start is not None:
+            result = result[self.timestamps[result] >= np.datetime64(pd.Timestamp(start))]
+        if end is not None:
+            if isinstance(end, datetime):
+                result = result[self.timestamps[result] <= np.datetime64(pd.Timestamp(end))]
+            else:
+                # A bare date includes the whole day
+                result = result[self.timestamps[result] < np.datetime64(pd.Timestamp(end) + timedelta(days=1))]
+        return result[np.argsort(self.timestamps[result], kind="stable")]
+
+def build_search_index(df: pd.DataFrame) -> SearchIndex:
+    """Build the inverted index for a parsed chat DataFrame."""
+    return SearchIndex(df)
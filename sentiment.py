@@ -0,0 +1,105 @@
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from word_frequency import tokenize_messages
+
+# The lexicon ships next to the stop word list, in the same tokenized form
+SENTIMENT_LEXICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentiment_lexicon_hinglish.txt")
+
+# English negators flip the word after them; Hindi ones can also follow it ("accha nahi")
+NEGATIONS = frozenset({"not", "no", "never", "dont", "didnt", "doesnt", "isnt", "wasnt", "cant", "wont",
+                       "nahi", "nahin", "nhi", "mat"})
+POSTPOSED_NEGATIONS = frozenset({"nahi", "nahin", "nhi", "mat"})
+
+# Compound scores are sum / sqrt(sum^2 + alpha), bounded to (-1, 1); messages
+# at or beyond the threshold either way count as positive or negative
+NORMALIZATION_ALPHA = 15
+LABEL_THRESHOLD = 0.05
+
+@lru_cache(maxsize=None)
+def load_lexicon(path: str = SENTIMENT_LEXICON_FILE) -> pd.Series:
+    """Load the word -> weight lexicon once per process (empty if the file is missing)."""
+    weights = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip() and not line.startswith("#"):
+                    word, weight = line.split("\t")
+                    weights[word.strip().lower()] = float(weight)
+    except FileNotFoundError:
+        pass
+    return pd.Series(weights, dtype=float)
+
+def score_messages(messages: pd.Series, lexicon=None) -> pd.DataFrame:
+    """
+    Score every message against the lexicon in one batch.
+
+    Distinct message texts are tokenized together, each token is mapped to
+    its weight and the weights are summed per text with np.bincount, so there
+    is no Python loop per message and repeated texts ("ok", "haha") are
+    scored once. A weight is flipped when the token before it (or, for Hindi
+    negators, after it) is a negation.
+
+    Returns a DataFrame aligned with messages: hits (lexicon words found),
+    score (summed weight), compound (normalized to -1..1) and label.
+    """
+    if lexicon is None:
+        lexicon = load_lexicon()
+    codes, texts = pd.factorize(messages.to_numpy(dtype=object))
+    tokens = tokenize_messages(pd.Series(texts))
+    positions = tokens.index.to_numpy()
+    words = tokens.to_numpy(dtype=object)
+    weights = tokens.map(lexicon).to_numpy()
+
+    # Tokens keep their text's position, so neighbours share an index value
+    same_message = positions[1:] == positions[:-1]
+    negated = np.zeros(len(words), dtype=bool)
+    negated[1:] |= same_message & pd.Series(words[:-1]).isin(NEGATIONS).to_numpy()
+    negated[:-1] |= same_message & pd.Series(words[1:]).isin(POSTPOSED_NEGATIONS).to_numpy()
+    weights = np.where(negated, -weights, weights)
+
+    matched = ~np.isnan(weights)
+    n = len(texts)
+    hits = np.bincount(positions[matched].astype(np.int64), minlength=n)[codes]
+    score = np.bincount(positions[matched].astype(np.int64), weights=weights[matched], minlength=n)[codes]
+    compound = score / np.sqrt(score * score + NORMALIZATION_ALPHA)
+    label = np.where(compound >= LABEL_THRESHOLD, "positive",
+                     np.where(compound <= -LABEL_THRESHOLD, "negative", "neutral"))
+    return pd.DataFrame({"hits": hits, "score": score, "compound": compound, "label": label}, index=messages.index)
+
+def _mood_summary(scored: pd.DataFrame, keys) -> pd.DataFrame:
+    """Messages, scored messages, mean compound of scored messages and positive/negative shares per group."""
+    has_hits = scored["hits"] > 0
+    grouped = scored.assign(
+        scored=has_hits,
+        mood=scored["compound"].where(has_hits),
+        positive=scored["label"] == "positive",
+        negative=scored["label"] == "negative"
+    ).groupby(keys)
+    summary = grouped.agg(messages=("hits", "size"), scored=("scored", "sum"), mood=("mood", "mean"),
+                          positive_share=("positive", "mean"), negative_share=("negative", "mean"))
+    summary["mood"] = summary["mood"].fillna(0.0)
+    return summary
+
+def sentiment_stats(df: pd.DataFrame, lexicon=None) -> dict:
+    """
+    Lexicon sentiment for a chat, aggregated per sender and per month.
+
+    Returns a dict with:
+        messages:  score_messages output plus sender and month columns
+        by_sender: DataFrame indexed by sender with messages, scored, mood
+                   (mean compound of messages with lexicon words),
+                   positive_share and negative_share
+        by_month:  the same columns indexed by month start, for the whole chat
+        by_sender_month: the same columns indexed by (sender, month)
+    """
+    scored = score_messages(df["message"].fillna("").astype(str), lexicon)
+    scored["sender"] = df["sender"].to_numpy()
+    scored["month"] = pd.to_datetime(df["datetime_ist"], format="ISO8601").dt.to_period("M").dt.start_time.to_numpy()
+    return {
+        "messages": scored,
+        "by_sender": _mood_summary(scored, "sender").sort_values("mood", ascending=False),
+        "by_month": _mood_summary(scored, "month"),
+        "by_sender_month": _mood_summary(scored, ["sender", "month"])
+    }
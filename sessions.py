@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_IDLE_GAP_MINUTES = 30
+
+def session_ids(timestamps, idle_gap_minutes: float = DEFAULT_IDLE_GAP_MINUTES) -> np.ndarray:
+    """
+    Session id per timestamp for timestamps sorted ascending.
+
+    A new session starts after every gap longer than idle_gap_minutes; ids count
+    up from 0 in one np.diff/np.cumsum pass.
+    """
+    times = np.asarray(timestamps, dtype="datetime64[ns]")
+    if len(times) == 0:
+        return np.empty(0, dtype=np.int64)
+    gaps = np.diff(times) > np.timedelta64(int(idle_gap_minutes * 60), "s")
+    return np.concatenate([[0], np.cumsum(gaps)]).astype(np.int64)
+
+def segment_sessions(df: pd.DataFrame, idle_gap_minutes: float = DEFAULT_IDLE_GAP_MINUTES) -> dict:
+    """
+    Split a chat into conversation sessions separated by idle gaps.
+
+    Returns a dict with:
+        session_id:    int64 array with the session of each row of df (positional)
+        sessions:      DataFrame indexed by session id with start, end,
+                       duration_minutes, messages, participants and initiator
+                       (sender of the first message)
+        participation: DataFrame[session_id, sender, messages], one row per
+                       sender taking part in a session
+    """
+    timestamps = pd.to_datetime(df["datetime_ist"], format="ISO8601").to_numpy()
+    senders = df["sender"].to_numpy()
+    # Rows are normally already chronological; a stable sort keeps ties in file order either way
+    order = np.argsort(timestamps, kind="stable")
+    sorted_ids = session_ids(timestamps[order], idle_gap_minutes)
+    ids = np.empty(len(df), dtype=np.int64)
+    ids[order] = sorted_ids
+
+    by_message = pd.DataFrame({"session_id": sorted_ids, "time": timestamps[order], "sender": senders[order]})
+    grouped = by_message.groupby("session_id", sort=True)
+    sessions = grouped.agg(
+        start=("time", "first"),
+        end=("time", "last"),
+        messages=("time", "size"),
+        participants=("sender", "nunique"),
+        initiator=("sender", "first")
+    )
+    sessions.insert(2, "duration_minutes", (sessions["end"] - sessions["start"]).dt.total_seconds() / 60)
+    participation = by_message.groupby(["session_id", "sender"], sort=True).size().reset_index(name="messages")
+    return {"session_id": ids, "sessions": sessions, "participation": participation}
+
+def sessions_for_sender(segmented: dict, sender: str) -> pd.DataFrame:
+    """Sessions a sender took part in, with how many of its messages they wrote."""
+    participation = segmented["participation"]
+    mine = participation[participation["sender"] == sender].set_index("session_id")["messages"]
+    return segmented["sessions"].loc[mine.index].assign(sender_messages=mine)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify hour-of-week burst and silence detection
+"""
+
+import numpy as np
+import pandas as pd
+from activity_anomalies import activity_anomalies, anomalies_for, hourly_counts, window_messages
+
+def build_chat():
+    """Six weeks of Alice and Bob sending 5 messages each every evening, with one burst and one quiet stretch"""
+    rows = []
+    for day in pd.date_range('2023-01-02', periods=42, freq='D'):
+        if day.strftime('%Y-%m-%d') in ('2023-02-01', '2023-02-02', '2023-02-03'):
+            continue
+        for sender in ('Alice', 'Bob'):
+            for minute in range(5):
+                rows.append((day + pd.Timedelta(hours=20, minutes=10 * minute + (sender == 'Bob')), sender))
+    for minute in range(30):
+        rows.append((pd.Timestamp('2023-01-18 15:00') + pd.Timedelta(minutes=minute), 'Alice'))
+    rows.append((pd.Timestamp('2023-01-10 03:00'), 'Carol'))
+    df = pd.DataFrame(rows, columns=['time', 'sender']).sort_values('time', kind='stable')
+    return pd.DataFrame({
+        'datetime_ist': df['time'].dt.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sender': df['sender'],
+        'message': 'hi'
+    }).reset_index(drop=True)
+
+def test_hourly_counts():
+    """Test one bincount matrix for the chat and every active sender"""
+
+    print("🧪 Testing Activity Anomalies")
+    print("=" * 40)
+
+    df = build_chat()
+    hourly = hourly_counts(df)
+    assert hourly['senders'] == [None, 'Alice', 'Bob']
+    assert hourly['origin'] == np.datetime64('2023-01-02T00', 'h')
+    assert hourly['counts'].shape == (3, 6 * 168)
+    assert hourly['counts'][0].sum() == len(df)
+    assert hourly['counts'][1:].sum() == len(df) - 1
+    assert hourly['counts'][0, 20] == 10 and hourly['counts'][1, 16 * 24 + 15] == 30
+    print("✅ Hourly counts from Monday 00:00, rare senders only in the overall row")
+
+def test_bursts_and_silences():
+    """Test flagged windows overall and per sender, and the messages inside them"""
+
+    df = build_chat()
+    anomalies = activity_anomalies(df)
+    overall = anomalies_for(anomalies)
+    bursts = overall[overall['kind'] == 'burst']
+    assert len(bursts) == 1
+    assert bursts.iloc[0]['start'] == pd.Timestamp('2023-01-18 15:00') and bursts.iloc[0]['hours'] == 1
+    assert bursts.iloc[0]['messages'] == 30 and bursts.iloc[0]['score'] == 30
+    print("✅ Afternoon burst flagged with its robust z-score")
+
+    silences = overall[overall['kind'] == 'silence']
+    assert len(silences) == 1
+    assert silences.iloc[0]['start'] == pd.Timestamp('2023-01-31 21:00')
+    assert silences.iloc[0]['end'] == pd.Timestamp('2023-02-04 20:00')
+    assert silences.iloc[0]['expected'] == 30 and silences.iloc[0]['score'] <= -3.5
+    print("✅ Three missed evenings merged into one silence")
+
+    alice = anomalies_for(anomalies, 'Alice')
+    assert alice['kind'].tolist() == ['burst', 'silence']
+    bob = anomalies_for(anomalies, 'Bob')
+    assert bob['kind'].tolist() == ['silence']
+    assert set(anomalies['by_sender']['sender']) == {'Alice', 'Bob'}
+    print("✅ Per-sender windows from the same pass")
+
+    burst_messages = window_messages(df, bursts.iloc[0], 'Alice')
+    assert len(burst_messages) == 30 and len(window_messages(df, silences.iloc[0])) == 0
+    print("✅ Messages inside a window")
+
+    short = activity_anomalies(df[df['datetime_ist'] < '2023-01-16'])
+    assert len(short['overall']) == 0 and len(short['by_sender']) == 0
+    empty = activity_anomalies(df.iloc[:0])
+    assert len(empty['overall']) == 0
+    print("✅ Chats shorter than the baseline give no windows")
+
+if __name__ == "__main__":
+    test_hourly_counts()
+    test_bursts_and_silences()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the bincount activity matrix matches pandas groupby counts
+"""
+
+import pandas as pd
+from activity_matrix import WEEKDAY_NAMES, build_activity_matrix, month_totals, weekday_hour_matrix, weekday_totals
+
+def test_activity_matrix():
+    """Test weekday x hour and month counts per sender and overall"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Alice', 'Bob', 'Chitra'],
+        'datetime_ist': [
+            '2023-01-02T09:15:00',  # Monday
+            '2023-01-02T09:45:00',  # Monday
+            '2023-01-08T23:59:00',  # Sunday
+            '2023-06-14T00:00:00',  # Wednesday
+            '2024-06-15T13:30:00',  # Saturday
+            '2024-12-31T18:00:00'   # Tuesday
+        ]
+    })
+
+    print("🧪 Testing Activity Matrix")
+    print("=" * 40)
+
+    matrix = build_activity_matrix(df)
+    assert matrix['senders'] == ['Alice', 'Bob', 'Chitra']
+    assert matrix['weekday_hour'].shape == (3, 7, 24)
+    assert matrix['month'].shape == (3, 12)
+    print("✅ Matrix shapes are (senders, 7, 24) and (senders, 12)")
+
+    timestamps = pd.to_datetime(df['datetime_ist'])
+    for sender in [None, 'Alice', 'Bob', 'Chitra']:
+        subset = timestamps if sender is None else timestamps[df['sender'] == sender]
+        expected_grid = subset.groupby([subset.dt.weekday, subset.dt.hour]).size()
+        grid = weekday_hour_matrix(matrix, sender)
+        assert int(grid.sum()) == len(subset)
+        for (weekday, hour), count in expected_grid.items():
+            assert grid[weekday, hour] == count
+
+        expected_weekdays = subset.dt.day_name().value_counts()
+        for weekday, count in zip(WEEKDAY_NAMES, weekday_totals(matrix, sender)):
+            assert count == expected_weekdays.get(weekday, 0)
+
+        expected_months = subset.dt.month.value_counts()
+        for month, count in enumerate(month_totals(matrix, sender), start=1):
+            assert count == expected_months.get(month, 0)
+    print("✅ Overall and per-sender counts match pandas groupby")
+
+    assert weekday_hour_matrix(matrix, 'nobody').sum() == 0
+    empty = build_activity_matrix(df.iloc[0:0])
+    assert weekday_hour_matrix(empty).shape == (7, 24)
+    print("✅ Unknown senders and empty chats give zero grids")
+
+if __name__ == "__main__":
+    test_activity_matrix()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script to verify hash-join alignment of PC and mobile exports
+"""
+
+import io
+from chat_alignment import align_exports
+from compare_outputs import compare_pc_mobile_outputs
+from parser import parse_chat_file
+
+def test_chat_alignment():
+    """Test matched, changed, deleted and inserted messages between two exports"""
+
+    pc_chat = (
+        "[25/12/23, 10:30:45 AM] John: Court booked for tonight\n"
+        "[25/12/23, 10:30:50 AM] John: Court booked for tonight\n"
+        "[25/12/23, 10:31:10 AM] ~Alice: image omitted\n"
+        "[25/12/23, 10:45:00 AM] Alice: See you at 8\n"
+        "[25/12/23, 11:00:00 AM] Bob: Only on PC\n"
+        "[25/12/23, 11:05:30 AM] John: Bring   the balls\n"
+    )
+    mobile_chat = (
+        "25/12/23, 10:30 am - John: court booked for tonight\n"
+        "25/12/23, 10:30 am - John: Court booked for tonight\n"
+        "25/12/23, 10:31 am - Alice: <Media omitted>\n"
+        "25/12/23, 10:45 am - Alice: See you at 8:30\n"
+        "25/12/23, 10:50 am - Dev: Only on mobile\n"
+        "25/12/23, 11:05 am - John: bring the balls\n"
+    )
+    pc_df = parse_chat_file(io.StringIO(pc_chat))
+    mobile_df = parse_chat_file(io.StringIO(mobile_chat))
+
+    print("🧪 Testing Chat Alignment")
+    print("=" * 40)
+
+    alignment = align_exports(pc_df, mobile_df)
+    assert alignment['summary'] == {
+        'pc_messages': 6, 'mobile_messages': 6, 'matched': 4, 'changed': 1, 'deleted': 1, 'inserted': 1
+    }
+    assert alignment['matched'][['pc_row', 'mobile_row']].values.tolist() == [[0, 0], [1, 1], [2, 2], [5, 5]]
+    print("✅ Repeated, media and case/spacing-only differences align")
+
+    changed = alignment['changed'].iloc[0]
+    assert (changed['pc_message'], changed['mobile_message']) == ("See you at 8", "See you at 8:30")
+    assert alignment['deleted']['message'].tolist() == ["Only on PC"]
+    assert alignment['inserted']['message'].tolist() == ["Only on mobile"]
+    print("✅ Edited, PC-only and mobile-only messages reported")
+
+    # A missing message no longer shifts every later comparison
+    shifted = align_exports(pc_df, mobile_df.iloc[1:])
+    assert shifted['summary']['matched'] == 3 and shifted['summary']['deleted'] == 2
+    print("✅ Dropping a message only affects that message")
+
+    result = compare_pc_mobile_outputs(pc_df, mobile_df)
+    assert result['summary']['changed'] == 1
+    print("✅ compare_pc_mobile_outputs uses the alignment")
+
+if __name__ == "__main__":
+    test_chat_alignment()
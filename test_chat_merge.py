@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script to verify merging overlapping exports of one chat
+"""
+
+import io
+from parser import parse_chat_file
+from chat_merge import merge_chat_files, merge_chat_frames
+
+FIRST_EXPORT = (
+    "01/01/24, 9:00 am - Ann: court at 8?\n"
+    "01/01/24, 9:01 am - Ben: ok\n"
+    "01/01/24, 9:01 am - Ben: ok\n"
+    "01/01/24, 9:05 am - Ann: <Media omitted>\n"
+)
+SECOND_EXPORT = (
+    "01/01/24, 9:01 am - Ben: ok\n"
+    "01/01/24, 9:01 am - Ben: ok\n"
+    "01/01/24, 9:05 am - Ann: <Media omitted>\n"
+    "02/01/24, 7:30 pm - Ben: booked\n"
+)
+PC_EXPORT = (
+    "[02/01/24, 7:30:12 PM] Ben: booked\n"
+    "[02/01/24, 7:45:00 PM] Ann: 👍\n"
+)
+
+def test_merge_overlapping_exports():
+    """Test that overlapping exports merge into one deduplicated timeline"""
+
+    print("🧪 Testing Chat Export Merge")
+    print("=" * 40)
+
+    merged, stats = merge_chat_files([io.StringIO(FIRST_EXPORT), io.StringIO(SECOND_EXPORT)])
+    assert merged['message'].tolist() == ["court at 8?", "ok", "ok", "[Media message]", "booked"]
+    assert list(merged.index) == list(range(5))
+    assert stats['duplicates_removed'] == 3
+    assert [e['new_messages'] for e in stats['exports']] == [4, 1]
+    print("✅ Overlap removed, repeated messages within an export kept")
+
+    pc_df = parse_chat_file(io.StringIO(PC_EXPORT))
+    mobile_df = parse_chat_file(io.StringIO(SECOND_EXPORT))
+    merged, stats = merge_chat_frames([pc_df, mobile_df], names=["pc", "mobile"])
+    assert merged['message'].tolist() == ["ok", "ok", "[Media message]", "booked", ""]
+    booked = merged[merged['message'] == "booked"].iloc[0]
+    assert booked['datetime_ist'] == "2024-01-02T19:30:12"
+    assert stats['exports'][1] == {"name": "mobile", "messages": 4, "new_messages": 3}
+    print("✅ PC and mobile exports deduplicate at minute resolution, earlier export wins")
+
+    merged, stats = merge_chat_frames([])
+    assert len(merged) == 0 and stats['merged_messages'] == 0
+    print("✅ Empty input handled")
+
+if __name__ == "__main__":
+    test_merge_overlapping_exports()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify storing parsed chats in SQLite and reading them back
+"""
+
+import io
+from datetime import date
+import pandas as pd
+from chat_store import (INTEGER_COLUMNS, MESSAGE_COLUMNS, SAVED_QUERIES, count_messages, delete_chat, fetch_messages_page, list_chats,
+                        load_chat_messages, open_store, run_query, run_saved_query, save_chat, search_messages)
+from parser import parse_chat_file
+
+def test_chat_store():
+    """Test round-trip, entities, FTS search, paging and re-import handling"""
+
+    sample_chat = (
+        "[25/12/23, 10:30:45 AM] John: Court booked for tonight https://example.com/court 👍🏽\n"
+        "[25/12/23, 10:31:22 AM] Alice: @John kal milte hain 🇮🇳\n"
+        "[26/12/23, 08:00:00 PM] John: Kal milte, call me at +91 98765 43210\n"
+        "[27/12/23, 09:15:00 AM] Alice: <Media omitted>\n"
+    )
+    df = parse_chat_file(io.StringIO(sample_chat))
+
+    print("🧪 Testing Chat Store")
+    print("=" * 40)
+
+    conn = open_store(":memory:")
+    schema = conn.execute("PRAGMA table_info(messages)").fetchall()
+    assert [row[1] for row in schema[2:]] == MESSAGE_COLUMNS
+    assert {row[1] for row in schema if row[2] == "INTEGER"} == set(INTEGER_COLUMNS) | {"id", "chat_id"}
+    print("✅ Every stored column declared with its type")
+
+    chat_id = save_chat(conn, df, "hash-1", name="Pickleball")
+    stored = load_chat_messages(conn, chat_id)
+    pd.testing.assert_frame_equal(stored, df.reset_index(drop=True))
+    print("✅ Stored chat loads back identical to the parsed DataFrame")
+
+    kinds = dict(conn.execute("SELECT kind, COUNT(*) FROM entities GROUP BY kind").fetchall())
+    assert kinds['url'] == 1 and kinds['mention'] == 1 and kinds['emoji'] == 2
+    print(f"✅ Entities table filled: {kinds}")
+
+    assert search_messages(conn, chat_id, '"kal milte"')['sender'].tolist() == ['Alice', 'John']
+    assert len(search_messages(conn, chat_id, 'court')) == 1
+    print("✅ FTS5 search finds phrases and words")
+
+    assert count_messages(conn, chat_id, sender='John') == 2
+    assert count_messages(conn, chat_id, end=date(2023, 12, 26)) == 3
+    first, second = (fetch_messages_page(conn, chat_id, page=p, page_size=3) for p in (0, 1))
+    assert len(first) == 3 and len(second) == 1
+    assert pd.concat([first, second])['raw_message'].tolist() == stored['raw_message'].tolist()
+    print("✅ Sender/date filters and paging work")
+
+    assert save_chat(conn, df, "hash-1") == chat_id
+    assert len(list_chats(conn)) == 1
+    replaced_id = save_chat(conn, df, "hash-1", replace=True)
+    assert count_messages(conn, replaced_id) == len(df)
+    assert len(search_messages(conn, replaced_id, 'court')) == 1
+    print("✅ Re-importing is a no-op unless replace=True")
+
+    delete_chat(conn, replaced_id)
+    assert len(list_chats(conn)) == 0
+    assert conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM messages_fts WHERE messages_fts MATCH 'court'").fetchone()[0] == 0
+    print("✅ Deleting a chat removes its messages, entities and FTS rows")
+
+def test_chat_queries():
+    """Test ad-hoc SQL and saved queries across two stored exports"""
+
+    pc_chat_text = (
+        "[25/12/23, 10:30:45 AM] John: image omitted\n"
+        "[25/12/23, 10:40:00 AM] Alice: video omitted\n"
+        "[02/01/24, 09:00:00 PM] John: image omitted\n"
+        "[02/01/24, 09:05:00 PM] Alice: see you at the court\n"
+    )
+    mobile_chat_text = (
+        "25/12/23, 10:30 am - John: <Media omitted>\n"
+        "02/01/24, 09:05 pm - Alice: see you at the court\n"
+    )
+    conn = open_store(":memory:")
+    pc_chat = save_chat(conn, parse_chat_file(io.StringIO(pc_chat_text)), "pc")
+    mobile_chat = save_chat(conn, parse_chat_file(io.StringIO(mobile_chat_text)), "mobile")
+
+    print("\n🧪 Testing Chat Queries")
+    print("=" * 40)
+
+    by_sender = run_query(conn, "SELECT sender, COUNT(*) AS n FROM messages WHERE chat_id = ? GROUP BY sender ORDER BY sender",
+                          (pc_chat,))
+    assert by_sender.to_dict('records') == [{'sender': 'Alice', 'n': 2}, {'sender': 'John', 'n': 2}]
+    print("✅ Ad-hoc SQL returns a DataFrame")
+
+    media_months = run_saved_query(conn, 'media_per_sender_month', chat=pc_chat)
+    assert media_months.to_dict('records') == [
+        {'sender': 'Alice', 'month': '2023-12', 'media_messages': 1},
+        {'sender': 'John', 'month': '2023-12', 'media_messages': 1},
+        {'sender': 'John', 'month': '2024-01', 'media_messages': 1}
+    ]
+    print("✅ Media per sender per month")
+
+    media_types = run_saved_query(conn, 'media_types', chat=pc_chat, other=mobile_chat).set_index('media')
+    assert media_types.loc['image', 'chat_count'] == 2 and media_types.loc['media', 'other_count'] == 1
+    missing = run_saved_query(conn, 'missing_media', chat=pc_chat, other=mobile_chat)
+    assert missing['datetime_ist'].tolist() == ['2023-12-25T10:40:00', '2024-01-02T21:00:00']
+    assert len(run_saved_query(conn, 'generic_media', chat=mobile_chat)) == 1
+    print("✅ Cross-export media comparisons")
+
+    assert set(SAVED_QUERIES) >= {'media_types', 'missing_media', 'generic_media'}
+    try:
+        run_saved_query(conn, 'nope')
+        assert False, "unknown saved query should raise"
+    except KeyError:
+        print("✅ Unknown saved query rejected")
+
+if __name__ == "__main__":
+    test_chat_store()
+    test_chat_queries()
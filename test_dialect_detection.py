@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script to verify export dialect detection and the specialized header parsers
+"""
+
+import io
+from datetime import datetime
+from parser import MOBILE_DIALECT, PC_DIALECT, ChatDialect, compile_dialect, detect_dialect, parse_chat_file
+
+def test_dialect_detection():
+    """Test that sampled headers pick the right date order, year width, clock and style"""
+
+    print("🧪 Testing Dialect Detection")
+    print("=" * 40)
+
+    pc_lines = [
+        "[25/12/23, 10:30:45 AM] John: Hello there!",
+        "continuation line",
+        "[26/12/23, 9:01:02 PM] Jane: Hi"
+    ]
+    assert detect_dialect(pc_lines) == PC_DIALECT
+    assert detect_dialect(["01/01/23, 9:00 am - Dev: court milte"]) == MOBILE_DIALECT
+    print("✅ Default PC and mobile layouts detected")
+
+    us_lines = [
+        "1/5/2024, 21:05 - Ann: first",
+        "1/13/2024, 08:10 - Ben: second"
+    ]
+    dialect = detect_dialect(us_lines)
+    assert dialect == ChatDialect(bracketed=False, day_first=False, four_digit_year=True,
+                                  twelve_hour=False, seconds=False)
+    print("✅ MM/DD, four-digit years and 24-hour clocks detected")
+
+    dotted = detect_dialect(["[13.02.24, 07:15:00] Ann: hallo"])
+    assert dotted.bracketed and dotted.day_first and not dotted.twelve_hour
+    assert dotted.date_separator == "."
+    print("✅ Dotted dates detected")
+
+    assert detect_dialect(["no headers here", ""]) is None
+    assert detect_dialect(["no headers here"], default=PC_DIALECT) == PC_DIALECT
+    print("✅ Default returned when no header is found")
+
+    message_regex, _, decode = compile_dialect(dialect)
+    match = message_regex.match(us_lines[1])
+    assert decode(match) == datetime(2024, 1, 13, 8, 10)
+    assert (match[8], match[9]) == ("Ben", "second")
+    match = compile_dialect(PC_DIALECT)[0].match(pc_lines[2])
+    assert compile_dialect(PC_DIALECT)[2](match) == datetime(2023, 12, 26, 21, 1, 2)
+    assert compile_dialect(MOBILE_DIALECT)[2](
+        compile_dialect(MOBILE_DIALECT)[0].match("1/01/23, 12:15 am - Dev: late")
+    ) == datetime(2023, 1, 1, 0, 15)
+    print("✅ Specialized decoders build the right timestamps")
+
+def test_parse_detected_dialect():
+    """Test that parse_chat_file parses a 24-hour MM/DD mobile export"""
+
+    df = parse_chat_file(io.StringIO(
+        "2/14/2024, 18:30 - Messages and calls are end-to-end encrypted. Tap to learn more.\n"
+        "2/14/2024, 18:31 - Ann: dinner at 8?\n"
+        "see you there\n"
+        "2/15/2024, 07:05 - Ben: sure\n"
+    ))
+    assert df['sender'].tolist() == ['Ann', 'Ben']
+    assert df['datetime_ist'].tolist() == ['2024-02-14T18:31:00', '2024-02-15T07:05:00']
+    assert df['message'].iloc[0] == 'dinner at 8? see you there'
+    print("✅ 24-hour MM/DD mobile export parsed")
+
+if __name__ == "__main__":
+    test_dialect_detection()
+    test_parse_detected_dialect()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script to verify grapheme-aware emoji segmentation in the parser
+"""
+
+import io
+import json
+import random
+from emoji_tokenizer import (CLASS_OF, KEYCAP, KEYCAP_BASE, MODIFIER, TEXT_DEFAULT, VARIATION,
+                             emoji_counts_by_sender, find_emojis, strip_emojis, walk_sequence_trie)
+from parser import clean_invisible, parse_chat_file
+
+def test_emoji_segmentation():
+    """Test that multi-code-point emoji sequences come back as single emojis"""
+
+    print("🧪 Testing Emoji Segmentation")
+    print("=" * 40)
+
+    cases = [
+        ("family 👨‍👩‍👧 done", ["👨‍👩‍👧"]),
+        ("thumbs 👍🏽👍", ["👍🏽", "👍"]),
+        ("flags 🇮🇳🇺🇸", ["🇮🇳", "🇺🇸"]),
+        ("love ❤️ and ❤", ["❤️", "❤"]),
+        ("keycap 1️⃣ but not 123 or #tag", ["1️⃣"]),
+        ("runner 🏃‍♀️!", ["🏃‍♀️"]),
+        ("scotland 🏴\U000E0067\U000E0062\U000E0073\U000E0063\U000E0074\U000E007F", ["🏴\U000E0067\U000E0062\U000E0073\U000E0063\U000E0074\U000E007F"]),
+        ("copyright © stays text, ©️ is emoji", ["©️"]),
+        ("no emoji here", [])
+    ]
+    for text, expected in cases:
+        found = find_emojis(text)
+        assert [emoji for emoji, _, _ in found] == expected, (text, found)
+        for emoji, start, end in found:
+            assert text[start:end] == emoji
+    print(f"✅ {len(cases)} segmentation cases passed")
+
+    assert strip_emojis("hi 👨‍👩‍👧 there 👍🏽") == "hi  there "
+    print("✅ Emoji sequences stripped whole")
+
+    # Joiners between emoji survive cleaning, stray ones do not
+    assert clean_invisible("👨‍👩 a‍b") == "👨‍👩 ab"
+    print("✅ clean_invisible keeps ZWJ inside emoji sequences only")
+
+def test_patterns_mirror_trie():
+    """Test that the regex patterns segment and strip exactly like the sequence trie"""
+
+    rng = random.Random(28)
+    # Every class, plus digits, hashes and Devanagari and Latin text around them
+    alphabet = ("😀👨👩🏃❤☀✌🏳🏴🇮🇳🇺" "\U0001F3FB\U0001F3FD" "\ufe0f\ufe0e\u200d\u20e3"
+                "\U000E0067\U000E0062\U000E007F" "©®™↔" "019#*" "aZ नमस्ते:,")
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        found = find_emojis(text)
+        assert found == walk_sequence_trie(text), (text, found)
+
+        # Stripping drops keycaps, every emoji-class character and text-default
+        # pictographs that a selector or modifier turns into emoji
+        kept, i = [], 0
+        while i < len(text):
+            keycap = text[i + 1:i + 3] if text[i + 1:i + 2] == "\ufe0f" else text[i + 1:i + 2]
+            if CLASS_OF.get(text[i]) == KEYCAP_BASE and keycap.endswith("\u20e3"):
+                i += 1 + len(keycap)
+                continue
+            cls = CLASS_OF.get(text[i])
+            if cls in (None, KEYCAP_BASE, KEYCAP) or (
+                    cls == TEXT_DEFAULT and CLASS_OF.get(text[i + 1:i + 2]) not in (VARIATION, MODIFIER)):
+                kept.append(text[i])
+            i += 1
+        assert strip_emojis(text) == "".join(kept), text
+    print("✅ Regex patterns match the sequence trie on 20000 random strings")
+
+def test_parser_emojis():
+    """Test that parsed messages store whole emoji sequences"""
+
+    sample_chat = (
+        "[25/12/23, 10:30:45 AM] John: Family trip 👨‍👩‍👧 👍🏽\n"
+        "[25/12/23, 10:31:22 AM] Alice: 🇮🇳🇮🇳\n"
+    )
+    df = parse_chat_file(io.StringIO(sample_chat))
+
+    john = df[df['sender'] == 'John'].iloc[0]
+    assert json.loads(john['emojis']) == ["👨‍👩‍👧", "👍🏽"]
+    assert john['message'] == "Family trip"
+    positions = json.loads(john['emoji_positions'])
+    assert [p['emoji'] for p in positions] == json.loads(john['emojis'])
+
+    counts = emoji_counts_by_sender(df)
+    assert counts[counts['sender'] == 'Alice']['count'].tolist() == [2]
+    print("✅ Parser and per-sender counts use whole emoji sequences")
+
+if __name__ == "__main__":
+    test_emoji_segmentation()
+    test_patterns_mirror_trie()
+    test_parser_emojis()
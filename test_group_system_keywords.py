@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compiled group system phrase matcher
+"""
+
+import io
+import parser as chat_parser
+from parser import GROUP_SYSTEM_KEYWORDS, add_group_system_keywords, compile_phrase_matcher, is_group_system_message, parse_chat_file
+
+def test_group_system_keywords():
+    """Test whole-word, case-insensitive matching and adding phrases"""
+
+    print("🧪 Testing Group System Keyword Matcher")
+    print("=" * 40)
+
+    cases = [
+        ("Bob ADDED Alice", True),
+        ("You were added", True),
+        ("Changed the subject to \"Thane Pickleball\"", True),
+        ("joined using this group's invite link", True),
+        ("Messages and calls are end-to-end encrypted. Tap to learn more.", True),
+        ("the court is padded now", False),
+        ("see you at the court", False),
+        ("", False)
+    ]
+    for text, expected in cases:
+        assert is_group_system_message(text) == expected, text
+        if expected:
+            assert any(kw.lower() in text.lower() for kw in GROUP_SYSTEM_KEYWORDS)
+    print("✅ Phrases match case-insensitively on word boundaries")
+
+    matcher = compile_phrase_matcher(["left", "left the group", "lefty"])
+    assert [bool(matcher.search(t)) for t in ["left", "lefty", "leftover", "x left the group"]] == [True, True, False, True]
+    print("✅ Phrases sharing a prefix all match")
+
+    original_keywords, original_matcher = list(GROUP_SYSTEM_KEYWORDS), chat_parser.group_system_matcher
+    try:
+        assert not is_group_system_message("Ana salió del grupo")
+        add_group_system_keywords(["salió del grupo"])
+        assert is_group_system_message("Ana salió del grupo")
+        df = parse_chat_file(io.StringIO(
+            "[25/12/23, 10:30:45 AM] Ana: Ana salió del grupo\n"
+            "[25/12/23, 10:31:22 AM] John: court at 8\n"
+        ))
+        assert df['sender'].tolist() == ['John']
+        print("✅ Extra locale phrases flag messages as group notifications")
+    finally:
+        GROUP_SYSTEM_KEYWORDS[:] = original_keywords
+        chat_parser.group_system_matcher = original_matcher
+
+if __name__ == "__main__":
+    test_group_system_keywords()
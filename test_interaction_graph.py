@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the sparse reply/mention interaction graph
+"""
+
+import numpy as np
+import pandas as pd
+from interaction_graph import build_interaction_graph, centrality, mention_lookup, pagerank, top_pairs
+
+def test_interaction_graph():
+    """Test reply and mention edges, centrality and top pairs"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Bob', 'Alice', 'Chitra Rao', '+91 98765 43210', 'Alice'],
+        'datetime_ist': [
+            '2023-01-02T09:00:00',
+            '2023-01-02T09:01:00',  # Bob -> Alice (reply)
+            '2023-01-02T09:02:00',  # same sender, no edge
+            '2023-01-02T09:05:00',  # Alice -> Bob
+            '2023-01-02T09:06:00',  # Chitra Rao -> Alice, mentions Bob
+            '2023-01-02T09:07:00',  # phone sender -> Chitra Rao, mentions Alice
+            '2023-01-05T09:00:00'   # days later: not a reply; mentions the phone sender and herself
+        ],
+        'mentions': ['', '', '', '', '["@Bob"]', '["@alice"]', '["@919876543210", "@Alice", "@Nobody"]']
+    })
+
+    print("🧪 Testing Interaction Graph")
+    print("=" * 40)
+
+    lookup = mention_lookup(['+91 98765 43210', 'Chitra Rao', 'Chitra Das', 'Dev Shah'])
+    assert lookup['919876543210'] == 0
+    assert lookup['chitrarao'] == 1 and 'chitra' not in lookup
+    assert lookup['dev'] == 3
+    print("✅ Mentions resolve by phone digits, full name and unique first name")
+
+    graph = build_interaction_graph(df)
+    assert graph['senders'] == ['+91 98765 43210', 'Alice', 'Bob', 'Chitra Rao']
+    edges = {
+        (graph['senders'][s], graph['senders'][t]): (r, m)
+        for s, t, r, m in zip(graph['source'], graph['target'], graph['replies'], graph['mentions'])
+    }
+    assert edges == {
+        ('Bob', 'Alice'): (1, 0),
+        ('Alice', 'Bob'): (1, 0),
+        ('Chitra Rao', 'Alice'): (1, 0),
+        ('Chitra Rao', 'Bob'): (0, 1),
+        ('+91 98765 43210', 'Chitra Rao'): (1, 0),
+        ('+91 98765 43210', 'Alice'): (0, 1),
+        ('Alice', '+91 98765 43210'): (0, 1)
+    }
+    assert np.array_equal(graph['weight'], graph['replies'] + graph['mentions'])
+    print("✅ Reply and mention edges counted per directed pair")
+
+    scores = centrality(graph)
+    assert scores.index[0] == 'Alice'
+    assert scores.loc['Alice', 'in_strength'] == 3 and scores.loc['Alice', 'out_strength'] == 2
+    assert scores.loc['Chitra Rao', 'partners'] == 3
+    assert abs(pagerank(graph).sum() - 1) < 1e-9
+    print("✅ Strength, partners and PageRank per member")
+
+    pairs = top_pairs(graph, limit=2)
+    assert pairs[['member_a', 'member_b', 'weight']].values.tolist() == [
+        ['+91 98765 43210', 'Alice', 2], ['Alice', 'Bob', 2]
+    ]
+    assert len(top_pairs(graph, limit=None)) == 5
+    print("✅ Top pairs combine both directions")
+
+    empty = build_interaction_graph(df.iloc[:1])
+    assert len(empty['source']) == 0 and len(top_pairs(empty)) == 0
+    print("✅ Chats without interactions give an empty graph")
+
+if __name__ == "__main__":
+    test_interaction_graph()
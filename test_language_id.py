@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batched language identification and per-language word counts
+"""
+
+import io
+import pandas as pd
+import language_id
+from parser import PARSED_COLUMNS, parse_chat_file
+from language_id import identify_languages, load_language_model, read_samples, train_language_model
+from word_frequency import word_counts_by_sender
+
+def test_identify_languages():
+    """Test English, Hinglish, Hindi and other labels on chat-style messages"""
+
+    print("🧪 Testing Language Identification")
+    print("=" * 40)
+
+    model = load_language_model()
+    assert sorted(model['languages']) == sorted(language_id.LANGUAGES)
+    print("✅ Bundled model loaded")
+
+    messages = pd.Series([
+        'Good morning everyone!', 'Kal milte hain bhai', 'कल शाम को मिलते हैं', '😂😂😂',
+        'What time is the match tomorrow?', 'Arre yaar traffic bahut hai', '12345', None,
+        'Kal milte hain bhai'
+    ], index=[3, 1, 4, 1, 5, 9, 2, 6, 5])
+    labels = identify_languages(messages)
+    assert labels.index.tolist() == messages.index.tolist()
+    assert labels.tolist() == ['english', 'hinglish', 'hindi', 'other', 'english', 'hinglish', 'other', 'other',
+                               'hinglish']
+    print("✅ Messages labelled in one batch, emoji and numbers as other")
+
+    chunk_chars = language_id.CHUNK_CHARS
+    language_id.CHUNK_CHARS = 20
+    try:
+        assert identify_languages(messages).tolist() == labels.tolist()
+    finally:
+        language_id.CHUNK_CHARS = chunk_chars
+    print("✅ Chunked scoring gives the same labels")
+
+    samples = read_samples()
+    trained = train_language_model(samples)
+    assert set(trained['counts']) == set(language_id.LANGUAGES)
+    assert trained['counts']['hindi']['मि'] > 0
+    print(f"✅ Model retrains from the {len(samples)} bundled samples")
+
+def test_language_pipelines():
+    """Test that Hindi messages keep vowel signs and use the Hindi stop words"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Alice', 'Bob'],
+        'message': ['मैं कल दिल्ली जा रहा हूँ।', 'kal milte hain court pe', 'दिल्ली बहुत सुंदर है'],
+        'language': ['hindi', 'hinglish', 'hindi']
+    })
+    counts = word_counts_by_sender(df)
+    alice = dict(zip(counts[counts['sender'] == 'Alice']['word'], counts[counts['sender'] == 'Alice']['count']))
+    assert alice['दिल्ली'] == 1 and 'मैं' not in alice and 'हूँ' not in alice
+    assert 'court' in alice and 'hain' not in alice
+    assert set(counts[counts['sender'] == 'Bob']['word']) == {'दिल्ली', 'सुंदर'}
+    print("✅ Per-language cleaning and stop words")
+
+def test_language_column_when_nothing_parses():
+    """Test that empty parses keep the language column the app reads"""
+
+    parsed = parse_chat_file(io.StringIO("01/01/23, 9:00 am - Dev: hi\n"))
+    assert list(parsed.columns) == PARSED_COLUMNS
+    for empty in (parse_chat_file(io.StringIO("")), parse_chat_file(io.StringIO("31/02/23, 9:00 am - Dev: hi\n"))):
+        assert len(empty) == 0 and list(empty.columns) == PARSED_COLUMNS
+    print("✅ Empty and unparseable chats have the same columns, language included")
+
+if __name__ == "__main__":
+    test_identify_languages()
+    test_language_pipelines()
+    test_language_column_when_nothing_parses()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script to verify URL domain extraction and shared-link statistics
+"""
+
+import pandas as pd
+from link_analytics import link_stats, link_table, url_domain
+
+def test_url_domain():
+    """Test registrable domains from assorted URLs"""
+
+    print("🧪 Testing Link Analytics")
+    print("=" * 40)
+
+    assert url_domain("https://m.youtube.com/watch?v=abc") == "youtube.com"
+    assert url_domain("https://www.bbc.co.uk/news") == "bbc.co.uk"
+    assert url_domain("https://www.flipkart.co.in/item") == "flipkart.co.in"
+    assert url_domain("http://EXAMPLE.com./path") == "example.com"
+    assert url_domain("https://wa.me/919876543210") == "wa.me"
+    assert url_domain("http://192.168.1.10:8080/admin") == "192.168.1.10"
+    assert url_domain("http://[broken/") == ""
+    print("✅ Subdomains, country-code suffixes and IP hosts handled")
+
+def test_link_stats():
+    """Test one row per URL and per-domain/per-sender counts"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Bob', 'Alice'],
+        'datetime_ist': ['2023-01-02T09:00:00', '2023-01-03T10:00:00', '2023-01-04T11:00:00',
+                         '2023-01-05T12:00:00', '2023-01-06T13:00:00'],
+        'urls': ['["https://youtu.be/a", "https://www.youtube.com/b"]', '', None,
+                 '["https://news.bbc.co.uk/x"]', '["https://youtube.com/c", "http://[broken/"]']
+    }, index=[10, 10, 11, 12, 13])
+
+    links = link_table(df)
+    assert list(links.columns) == ['url', 'sender', 'time', 'domain']
+    assert links['domain'].tolist() == ['youtu.be', 'youtube.com', 'bbc.co.uk', 'youtube.com']
+    assert links['sender'].tolist() == ['Alice', 'Alice', 'Bob', 'Alice']
+    print("✅ One row per URL, unparseable URLs dropped")
+
+    stats = link_stats(df)
+    domains = stats['domains']
+    assert domains.index[0] == 'youtube.com'
+    assert domains.loc['youtube.com', 'shares'] == 2 and domains.loc['youtube.com', 'senders'] == 1
+    assert domains.loc['youtube.com', 'first_shared'] == pd.Timestamp('2023-01-02 09:00:00')
+    assert domains.loc['youtube.com', 'last_shared'] == pd.Timestamp('2023-01-06 13:00:00')
+    assert stats['by_sender'].iloc[0].tolist() == ['Alice', 'youtube.com', 2]
+    print("✅ Shares, first/last shared per domain and per sender")
+
+    empty = link_stats(df.iloc[1:3])
+    assert len(empty['links']) == 0 and len(empty['domains']) == 0 and len(empty['by_sender']) == 0
+    print("✅ Chats without links give empty tables")
+
+if __name__ == "__main__":
+    test_url_domain()
+    test_link_stats()
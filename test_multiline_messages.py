@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script to verify entity extraction over complete multi-line messages
+"""
+
+import io
+import json
+from parser import parse_chat_file
+
+def test_multiline_entities():
+    """Test that URLs, phones and emojis on continuation lines are extracted"""
+
+    print("🧪 Testing Multi-line Message Extraction")
+    print("=" * 40)
+
+    for sample in [
+        (
+            "[25/12/23, 10:30:45 AM] John: Venue details\n"
+            "see https://example.com/court 🎾\n"
+            "call +91 98765 43210\n"
+            "[25/12/23, 10:31:22 AM] Jane: 👍\n"
+        ),
+        (
+            "25/12/23, 10:30 am - John: Venue details\n"
+            "see https://example.com/court 🎾\n"
+            "call +91 98765 43210\n"
+            "25/12/23, 10:31 am - Jane: 👍\n"
+        )
+    ]:
+        df = parse_chat_file(io.StringIO(sample)).reset_index(drop=True)
+        first = df.iloc[0]
+        assert json.loads(first['urls']) == ["https://example.com/court"]
+        assert json.loads(first['phone_numbers']) == ["+91 98765 43210"]
+        assert json.loads(first['emojis']) == ["🎾"]
+        assert first['message'] == "Venue details see call"
+        assert json.loads(df.iloc[1]['emojis']) == ["👍"]
+    print("✅ Entities on continuation lines extracted for PC and mobile exports")
+
+    df = parse_chat_file(io.StringIO(
+        "25/12/23, 10:30 am - John: first line\n"
+        "second line <This message was edited>\n"
+    ))
+    assert df['message'].iloc[0] == "first line second line"
+    assert df['message_modifier'].iloc[0] == "<This message was edited>"
+    print("✅ Modifiers on the last line of a message detected")
+
+if __name__ == "__main__":
+    test_multiline_entities()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script to verify MinHash-LSH near-duplicate clustering of forwarded messages
+"""
+
+import numpy as np
+import pandas as pd
+from near_duplicates import (connected_components, duplicate_clusters, find_near_duplicates,
+                             lsh_candidate_pairs, minhash_signatures)
+
+FORWARD = ("Forwarded as received: the water supply will be off tomorrow from 9 am to 5 pm "
+           "in sectors 4, 5 and 6. Please store water tonight.")
+
+def test_minhash_and_lsh():
+    """Test signature agreement tracks similarity and LSH pairs similar texts"""
+
+    print("🧪 Testing Near-Duplicate Detection")
+    print("=" * 40)
+
+    texts = [FORWARD, FORWARD.replace("9 am", "10 am"), "Completely unrelated message about the cricket match last night"]
+    signatures = minhash_signatures(texts)
+    assert signatures.shape == (3, 64) and signatures.dtype == np.uint32
+    assert np.array_equal(minhash_signatures(texts[:1]), signatures[:1])
+    assert (signatures[0] == signatures[1]).mean() > 0.8
+    assert (signatures[0] == signatures[2]).mean() < 0.2
+    print("✅ Signature agreement estimates shingle similarity")
+
+    sources, targets = lsh_candidate_pairs(signatures)
+    pairs = {tuple(sorted(pair)) for pair in zip(sources.tolist(), targets.tolist())}
+    assert pairs == {(0, 1)}
+    print("✅ LSH buckets pair only the similar texts")
+
+    labels = connected_components(5, np.array([1, 3]), np.array([2, 2]))
+    assert labels.tolist() == [0, 1, 1, 1, 4]
+    print("✅ Connected components over candidate pairs")
+
+def test_find_near_duplicates():
+    """Test clusters, earliest-copy originals and the cluster summary"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Chitra', 'Alice', 'Bob', 'Dev'],
+        'datetime_ist': ['2023-01-03T10:00:00', '2023-01-01T10:00:00', '2023-01-02T10:00:00',
+                         '2023-01-04T10:00:00', '2023-01-05T10:00:00', '2023-01-06T10:00:00'],
+        'message': [FORWARD, FORWARD.replace("9 am", "10 am"), "  " + FORWARD.upper(), 'good morning',
+                    'good morning', 'A long message that nobody else has ever sent to this group']
+    }, index=[10, 11, 12, 13, 14, 15])
+
+    duplicates = find_near_duplicates(df)
+    assert duplicates.index.tolist() == df.index.tolist()
+    assert duplicates['cluster'].tolist() == [0, 0, 0, -1, -1, -1]
+    assert duplicates['cluster_size'].tolist() == [3, 3, 3, 1, 1, 1]
+    assert duplicates['is_duplicate'].tolist() == [True, False, True, False, False, False]
+    print("✅ Forwards clustered, earliest copy kept, short greetings ignored")
+
+    summary = duplicate_clusters(df, duplicates)
+    assert summary.loc[0, 'messages'] == 3 and summary.loc[0, 'senders'] == 3
+    assert summary.loc[0, 'first_sender'] == 'Bob'
+    assert summary.loc[0, 'last_sent'] == '2023-01-03T10:00:00'
+    print("✅ Cluster summary with first sender and dates")
+
+    none = find_near_duplicates(df.iloc[3:5])
+    assert (none['cluster'] == -1).all() and len(duplicate_clusters(df.iloc[3:5], none)) == 0
+    print("✅ Chats without long repeats give no clusters")
+
+if __name__ == "__main__":
+    test_minhash_and_lsh()
+    test_find_near_duplicates()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify integer-coded n-gram counts and PMI collocations
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from ngrams import _grams, collocations, encode_corpus, ngram_stats, ngrams_for
+
+def test_ngram_counts():
+    """Test bigram/trigram counts overall and per sender"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Alice', 'Bob', 'Bob'],
+        'message': ['Happy birthday bhai!', 'happy birthday', 'happy birthday bhai', 'haha haha',
+                    'kal milte hai', '[Media message]']
+    })
+
+    print("🧪 Testing N-grams")
+    print("=" * 40)
+
+    corpus = encode_corpus(df)
+    assert corpus['pair_count'].sum() == 5
+    assert list(corpus['vocab'][corpus['token_ids'][:3]]) == ['happy', 'birthday', 'bhai']
+    print("✅ Distinct texts tokenized once and integer-coded")
+
+    stats = ngram_stats(df, stop_words={'hai'})
+    bigrams = stats['bigrams']['overall']
+    assert bigrams.iloc[0].tolist()[:2] == ['happy birthday', 3]
+    assert set(bigrams['ngram']) == {'happy birthday', 'birthday bhai', 'kal milte'}
+    print("✅ Bigrams stay within messages, skip stop-word edges and repeats")
+
+    alice = ngrams_for(stats['bigrams'], 'Alice')
+    assert dict(zip(alice['ngram'], alice['count'])) == {'happy birthday': 2, 'birthday bhai': 2}
+    trigrams = ngrams_for(stats['trigrams'])
+    assert trigrams['ngram'].tolist() == ['happy birthday bhai'] and trigrams['count'].tolist() == [2]
+    print("✅ Per-sender and trigram counts")
+
+    # 'happy birthday' x3 among 13 tokens, with happy x3 and birthday x3
+    pmi = bigrams.set_index('ngram').loc['happy birthday', 'pmi']
+    assert math.isclose(pmi, math.log2(3 * 13 / (3 * 3)))
+    print("✅ PMI from n-gram and word counts")
+
+def test_collocations_and_hashing():
+    """Test PMI ranking with a count floor and hashed keys for huge vocabularies"""
+
+    table = pd.DataFrame({'ngram': ['a b', 'c d', 'e f'], 'count': [10, 1, 4], 'pmi': [1.0, 9.0, 3.0]})
+    assert collocations(table, min_count=3)['ngram'].tolist() == ['e f', 'a b']
+    assert len(collocations(table, min_count=1, limit=2)) == 2
+    print("✅ Collocations ranked by PMI above the count floor")
+
+    corpus = {
+        'vocab': np.empty(3_000_000, dtype=object),
+        'token_ids': np.array([5, 2_999_999, 7, 5, 2_999_999, 7]),
+        'token_text': np.array([0, 0, 0, 1, 1, 1])
+    }
+    starts, keys = _grams(corpus, 3, np.ones(3_000_000, dtype=bool))
+    assert keys.dtype == np.uint64 and list(starts) == [0, 3] and keys[0] == keys[1]
+    print("✅ Trigram keys fall back to hashing when vocab ** 3 overflows int64")
+
+    empty = ngram_stats(pd.DataFrame({'sender': [], 'message': []}))
+    assert len(empty['bigrams']['overall']) == 0 and len(empty['trigrams']['by_sender']) == 0
+    print("✅ Empty chats give empty tables")
+
+def test_hindi_ngrams():
+    """Test that Hindi messages keep vowel signs and use the Hindi stop words"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice'],
+        'message': ['मुझे दिल्ली मेट्रो बहुत पसंद है।', 'दिल्ली मेट्रो में भीड़ है', 'kal milte hain court pe'],
+        'language': ['hindi', 'hindi', 'hinglish']
+    })
+    stats = ngram_stats(df)
+    bigrams = stats['bigrams']['overall']
+    assert bigrams['ngram'].tolist() == ['दिल्ली मेट्रो'] and bigrams['count'].tolist() == [2]
+    assert 'मेट्रो में भीड़' in set(stats['trigrams']['overall']['ngram'])
+    print("✅ Hindi n-grams keep vowel signs and skip Hindi stop-word edges")
+
+if __name__ == "__main__":
+    test_ngram_counts()
+    test_collocations_and_hashing()
+    test_hindi_ngrams()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that skipped lines are reported in the quarantine table
+"""
+
+import io
+import os
+import tempfile
+from parser import QUARANTINE_COLUMNS, parse_chat_file, parse_pc
+from datetime import timedelta
+
+def test_parse_quarantine():
+    """Test line numbers, byte offsets and reasons of quarantined lines"""
+
+    print("🧪 Testing Parse Quarantine")
+    print("=" * 40)
+
+    sample = (
+        "Chat export header\n"
+        "01/01/23, 9:00 am - Dev: hi\n"
+        "31/02/23, 9:01 am - Dev: impossible date\n"
+        "01/01/23, 9:02 am - Ann: ok\n"
+        "31/13/23, 9:03 am - Messages and calls are end-to-end encrypted.\n"
+    )
+    df, quarantine = parse_chat_file(io.StringIO(sample), return_quarantine=True)
+    assert df['sender'].tolist() == ['Dev', 'Ann']
+    assert list(quarantine.columns) == QUARANTINE_COLUMNS
+    assert quarantine['line_number'].tolist() == [1, 3, 5]
+    assert quarantine['reason'].iloc[0] == "text before the first message"
+    assert quarantine['reason'].iloc[1].startswith("invalid timestamp")
+    print("✅ Skipped lines recorded with reasons")
+
+    encoded = sample.encode("utf-8")
+    for line_number, offset in zip(quarantine['line_number'], quarantine['byte_offset']):
+        assert encoded[offset:].split(b"\n")[0].decode("utf-8") == sample.split("\n")[line_number - 1]
+    print("✅ Byte offsets point at the quarantined lines")
+
+    crlf = sample.replace("\n", "\r\n").replace("Dev: hi", "Dev: héllo")
+    crlf_path = os.path.join(tempfile.mkdtemp(), "crlf_chat.txt")
+    with open(crlf_path, "wb") as f:
+        f.write(crlf.encode("utf-8"))
+    for source in (io.BytesIO(crlf.encode("utf-8")), crlf_path):
+        _, crlf_quarantine = parse_chat_file(source, return_quarantine=True)
+        encoded = crlf.encode("utf-8")
+        for line_number, offset in zip(crlf_quarantine['line_number'], crlf_quarantine['byte_offset']):
+            assert encoded[offset:].split(b"\r\n")[0].decode("utf-8") == crlf.split("\r\n")[line_number - 1]
+    print("✅ Byte offsets count CRLF terminators, for uploads and file paths")
+
+    clean_df, clean_quarantine = parse_chat_file(io.StringIO("01/01/23, 9:00 am - Dev: hi\n"), return_quarantine=True)
+    assert len(clean_df) == 1 and len(clean_quarantine) == 0
+    assert len(parse_chat_file(io.StringIO(sample))) == 2
+    print("✅ Clean chats have an empty quarantine and the default return is unchanged")
+
+    clock_df, clock_quarantine = parse_chat_file(io.StringIO(
+        "12/01/2023, 9:00 am - Alice: hi\n"
+        "12/01/2023, 13:05 pm - Alice: no such hour\n"
+        "12/01/2023, 0:30 am - Alice: nor this one\n"
+        "13/01/2023, 12:30 am - Bob: after midnight\n"
+    ), return_quarantine=True)
+    assert clock_df['message'].tolist() == ['hi', 'after midnight']
+    assert clock_df['datetime_ist'].iloc[1] == '2023-01-13T00:30:00'
+    assert clock_quarantine['line_number'].tolist() == [2, 3]
+    assert clock_quarantine['reason'].str.startswith("invalid timestamp").all()
+    print("✅ 12-hour clocks reject hours outside 1-12")
+
+    skipped = []
+    messages = parse_pc(["[30/02/24, 10:00:00 AM] Ann: no such day", "[01/03/24, 10:00:00 AM] Ann: fine"],
+                        timedelta(0), quarantine=skipped)
+    assert len(messages) == 1 and [index for index, _ in skipped] == [0]
+    print("✅ PC parser reports malformed timestamps")
+
+if __name__ == "__main__":
+    test_parse_quarantine()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script to verify PC-reference media enhancement for mobile exports
+"""
+
+from parser import enhance_mobile_media_with_pc_reference
+
+def test_pc_media_enhancement():
+    """Test nearest-match within tolerance, sender constraint and returned statistics"""
+
+    pc_messages = [
+        {'datetime_ist': '2023-12-25T10:30:10', 'sender': 'John', 'media': 'image'},
+        {'datetime_ist': '2023-12-25T10:30:50', 'sender': 'Alice', 'media': 'video'},
+        {'datetime_ist': '2023-12-25T11:00:00', 'sender': 'Alice', 'media': 'sticker'},
+        {'datetime_ist': '2023-12-25T11:00:05', 'sender': 'John', 'media': ''}
+    ]
+
+    def mobile_messages():
+        return [
+            {'datetime_ist': '2023-12-25T10:30:00', 'sender': 'John', 'media': 'media'},     # 10s from image
+            {'datetime_ist': '2023-12-25T10:30:40', 'sender': 'John', 'media': 'media'},     # 10s from video, 30s from image
+            {'datetime_ist': '2023-12-25T10:31:00', 'sender': 'Alice', 'media': 'gif'},      # already typed
+            {'datetime_ist': '2023-12-25T11:00:05', 'sender': 'John', 'media': 'media'},     # 5s from sticker
+            {'datetime_ist': '2023-12-25T12:00:00', 'sender': 'Alice', 'media': 'media'},    # nothing nearby
+            {'datetime_ist': '2023-12-25T10:29:00', 'sender': 'John', 'media': ''}           # text message
+        ]
+
+    print("🧪 Testing PC Media Enhancement")
+    print("=" * 40)
+
+    messages, stats = enhance_mobile_media_with_pc_reference(mobile_messages(), pc_messages)
+    assert [msg['media'] for msg in messages] == ['image', 'video', 'gif', 'sticker', 'media', '']
+    assert [msg.get('enhanced_from_pc', False) for msg in messages] == [True, True, False, True, False, False]
+    assert stats['candidates'] == 4 and stats['matched'] == 3 and stats['unmatched'] == 1
+    assert stats['media_types'] == {'image': 1, 'video': 1, 'sticker': 1}
+    assert stats['max_offset_seconds'] == 10.0
+    assert stats['unmatched_timestamps'] == ['2023-12-25T12:00:00']
+    print(f"✅ Nearest PC media within 30s applied: {stats['media_types']}")
+
+    messages, stats = enhance_mobile_media_with_pc_reference(mobile_messages(), pc_messages, match_sender=True)
+    assert [msg['media'] for msg in messages] == ['image', 'image', 'gif', 'media', 'media', '']
+    assert stats['matched'] == 2
+    print("✅ Sender constraint only matches the same sender's media")
+
+    messages, stats = enhance_mobile_media_with_pc_reference(mobile_messages(), pc_messages, tolerance_seconds=5)
+    assert [msg['media'] for msg in messages][:4] == ['media', 'media', 'gif', 'sticker']
+    print("✅ Tolerance is configurable")
+
+    messages, stats = enhance_mobile_media_with_pc_reference(mobile_messages(), [])
+    assert stats['matched'] == 0 and stats['unmatched'] == 4
+    print("✅ No PC reference leaves mobile messages unchanged")
+
+if __name__ == "__main__":
+    test_pc_media_enhancement()
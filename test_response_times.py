@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script to verify reply latency statistics per sender and sender pair
+"""
+
+import pandas as pd
+from response_times import reply_table, response_times
+
+def test_response_times():
+    """Test reply detection, latency and per-pair percentiles"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Alice', 'Bob', 'Alice', 'Chitra', 'Bob', 'Alice'],
+        'datetime_ist': [
+            '2023-01-02T09:00:00',
+            '2023-01-02T09:01:00',
+            '2023-01-02T09:03:00',  # Bob replies to Alice after 2 min
+            '2023-01-02T09:04:00',  # Alice replies to Bob after 1 min
+            '2023-01-02T09:14:00',  # Chitra replies to Alice after 10 min
+            '2023-01-02T09:20:00',  # Bob replies to Chitra after 6 min
+            '2023-01-03T09:20:00'   # a day later: not a reply
+        ]
+    })
+
+    print("🧪 Testing Response Times")
+    print("=" * 40)
+
+    replies = reply_table(df)
+    assert replies['sender'].tolist() == ['Bob', 'Alice', 'Chitra', 'Bob']
+    assert replies['replied_to'].tolist() == ['Alice', 'Bob', 'Alice', 'Chitra']
+    assert replies['latency_seconds'].tolist() == [120.0, 60.0, 600.0, 360.0]
+    assert len(reply_table(df, max_latency_minutes=24 * 60)) == 5
+    print("✅ Replies are messages after someone else's, within the latency cap")
+
+    shuffled = reply_table(df.sample(frac=1, random_state=1))
+    assert shuffled.equals(replies)
+    print("✅ Unsorted input gives the same replies")
+
+    stats = response_times(df)
+    bob = stats['senders'].loc['Bob']
+    assert bob['replies'] == 2
+    assert bob['median_seconds'] == 240.0
+    assert bob['p90_seconds'] == 120.0 + 0.9 * 240.0
+    assert stats['pairs'].loc[('Chitra', 'Alice'), 'median_seconds'] == 600.0
+    assert sorted(stats['pairs'].index) == [('Alice', 'Bob'), ('Bob', 'Alice'), ('Bob', 'Chitra'), ('Chitra', 'Alice')]
+    print("✅ Median and 90th percentile per sender and per pair")
+
+    alone = response_times(df[df['sender'] == 'Alice'])
+    assert len(alone['replies']) == 0
+    assert list(alone['senders'].columns) == ['replies', 'median_seconds', 'p90_seconds'] and len(alone['senders']) == 0
+    assert len(alone['pairs']) == 0
+    print("✅ Chats without replies give empty tables")
+
+if __name__ == "__main__":
+    test_response_times()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script to verify inverted-index search: terms, phrases, boolean operators and filters
+"""
+
+from datetime import date
+import pandas as pd
+from search_index import build_search_index
+
+def test_search_index():
+    """Test term, phrase, OR/NOT queries and sender/date filters against a small chat"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Chitra', 'Bob'],
+        'datetime_ist': [
+            '2023-01-02T09:15:00',
+            '2023-01-01T20:00:00',
+            '2023-01-05T23:59:00',
+            '2023-01-03T10:00:00',
+            '2023-01-06T08:00:00'
+        ],
+        'message': [
+            'Kal milte hain court pe!',
+            'Party tonight? Court booked',
+            'milte kal, bhai',
+            'Game at the court kal milte',
+            ''
+        ]
+    })
+
+    print("🧪 Testing Search Index")
+    print("=" * 40)
+
+    index = build_search_index(df)
+    assert index.search('court').tolist() == [1, 0, 3]
+    assert index.search('COURT!').tolist() == [1, 0, 3]
+    print("✅ Term matches are case/punctuation-insensitive and chronological")
+
+    assert index.search('"kal milte"').tolist() == [0, 3]
+    assert index.search('"milte kal"').tolist() == [2]
+    assert index.search('"court kal"').tolist() == [3]
+    print("✅ Phrase queries respect word order")
+
+    assert index.search('court kal').tolist() == [0, 3]
+    assert index.search('party OR game').tolist() == [1, 3]
+    assert index.search('court -party').tolist() == [0, 3]
+    assert index.search('court NOT game').tolist() == [1, 0]
+    assert index.search('bhai OR party court OR game').tolist() == [1]
+    assert index.search('-court').tolist() == []
+    assert index.search('nothing here').tolist() == []
+    print("✅ AND, OR and NOT combine as expected")
+
+    assert index.search('court', senders=['Alice', 'Chitra']).tolist() == [0, 3]
+    assert index.search('kal', start=date(2023, 1, 3)).tolist() == [3, 2]
+    assert index.search('kal', end=date(2023, 1, 5)).tolist() == [0, 3, 2]
+    assert index.search('kal', start=date(2023, 1, 3), end=date(2023, 1, 4)).tolist() == [3]
+    print("✅ Sender and inclusive date filters applied")
+
+    assert index.search('"kal court').tolist() == [0, 3]
+    print("✅ Unbalanced quotes fall back to plain words")
+
+if __name__ == "__main__":
+    test_search_index()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batched lexicon sentiment scoring and its aggregates
+"""
+
+import pandas as pd
+from sentiment import load_lexicon, score_messages, sentiment_stats
+
+def test_score_messages():
+    """Test lexicon weights, negation and compound normalization"""
+
+    print("🧪 Testing Sentiment")
+    print("=" * 40)
+
+    lexicon = load_lexicon()
+    assert len(lexicon) > 200
+    assert lexicon['awesome'] > 0 and lexicon['bakwas'] < 0 and lexicon['mast'] > 0
+    print(f"✅ Bundled lexicon loaded ({len(lexicon)} words)")
+
+    messages = pd.Series([
+        'Good morning!!', 'not good', 'movie accha nahi tha', 'Bakwas movie yaar',
+        'Thanks, awesome party', '', 'ok see you', 'not good'
+    ], index=[5, 5, 6, 7, 8, 9, 10, 11])
+    scores = score_messages(messages)
+    assert scores.index.tolist() == messages.index.tolist()
+    assert scores['hits'].tolist() == [1, 1, 1, 1, 2, 0, 1, 1]
+    assert scores['score'].tolist() == [2.0, -2.0, -2.0, -3.0, 5.0, 0.0, 1.0, -2.0]
+    assert scores['compound'].between(-1, 1).all()
+    assert scores['label'].tolist() == ['positive', 'negative', 'negative', 'negative',
+                                        'positive', 'neutral', 'positive', 'negative']
+    print("✅ Weights summed per message, negators flip the neighbouring word")
+
+    custom = score_messages(pd.Series(['meh day', 'meh']), lexicon={'meh': -1.0})
+    assert custom['score'].tolist() == [-1.0, -1.0]
+    print("✅ Custom lexicons can be passed in")
+
+def test_sentiment_stats():
+    """Test per-sender and per-month aggregates"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Bob'],
+        'datetime_ist': ['2023-01-02T09:00:00', '2023-01-20T10:00:00', '2023-02-01T11:00:00', '2023-02-02T12:00:00'],
+        'message': ['great news', 'bakwas', 'hello', None]
+    })
+    stats = sentiment_stats(df)
+
+    by_sender = stats['by_sender']
+    assert by_sender.index.tolist() == ['Alice', 'Bob']
+    assert by_sender.loc['Alice', 'messages'] == 2 and by_sender.loc['Alice', 'scored'] == 1
+    assert by_sender.loc['Alice', 'positive_share'] == 0.5
+    assert by_sender.loc['Bob', 'mood'] < 0 and by_sender.loc['Bob', 'negative_share'] == 0.5
+    print("✅ Mood and positive/negative shares per sender")
+
+    by_month = stats['by_month']
+    assert by_month.index.tolist() == [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-02-01')]
+    assert by_month['messages'].tolist() == [2, 2] and by_month['scored'].tolist() == [2, 0]
+    assert by_month.loc['2023-02-01', 'mood'] == 0.0
+    assert stats['by_sender_month'].loc[('Alice', pd.Timestamp('2023-01-01')), 'scored'] == 1
+    print("✅ Monthly mood overall and per sender")
+
+if __name__ == "__main__":
+    test_score_messages()
+    test_sentiment_stats()
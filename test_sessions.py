@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script to verify idle-gap conversation session segmentation
+"""
+
+import pandas as pd
+from sessions import segment_sessions, session_ids, sessions_for_sender
+
+def test_session_segmentation():
+    """Test session ids, per-session stats and per-sender participation"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Chitra', 'Bob', 'Bob'],
+        'datetime_ist': [
+            '2023-01-02T09:00:00',
+            '2023-01-02T09:10:00',
+            '2023-01-02T09:40:00',  # exactly 30 minutes later: same session
+            '2023-01-02T10:11:00',  # 31 minutes later: new session
+            '2023-01-02T10:15:00',
+            '2023-01-03T08:00:00'
+        ]
+    }, index=[10, 11, 12, 13, 14, 15])
+
+    print("🧪 Testing Conversation Sessions")
+    print("=" * 40)
+
+    assert session_ids(pd.to_datetime(df['datetime_ist'])).tolist() == [0, 0, 0, 1, 1, 2]
+    assert session_ids(pd.to_datetime(df['datetime_ist']), idle_gap_minutes=5).tolist() == [0, 1, 2, 3, 3, 4]
+    assert len(session_ids([])) == 0
+    print("✅ Sessions split on gaps longer than the idle threshold")
+
+    segmented = segment_sessions(df)
+    sessions = segmented['sessions']
+    assert segmented['session_id'].tolist() == [0, 0, 0, 1, 1, 2]
+    assert sessions['messages'].tolist() == [3, 2, 1]
+    assert sessions['participants'].tolist() == [2, 2, 1]
+    assert sessions['initiator'].tolist() == ['Alice', 'Chitra', 'Bob']
+    assert sessions['duration_minutes'].tolist() == [40.0, 4.0, 0.0]
+    print("✅ Size, duration, participants and initiator per session")
+
+    shuffled = segment_sessions(df.iloc[[3, 0, 5, 1, 4, 2]])
+    assert shuffled['session_id'].tolist() == [1, 0, 2, 0, 1, 0]
+    assert shuffled['sessions'].equals(sessions)
+    print("✅ Unsorted input gets the same sessions")
+
+    bob = sessions_for_sender(segmented, 'Bob')
+    assert bob.index.tolist() == [0, 1, 2]
+    assert bob['sender_messages'].tolist() == [1, 1, 1]
+    assert sessions_for_sender(segmented, 'Chitra')['initiator'].tolist() == ['Chitra']
+    print("✅ Sessions filtered to one sender")
+
+if __name__ == "__main__":
+    test_session_segmentation()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script to verify resampled timelines, rolling means and LTTB downsampling
+"""
+
+import numpy as np
+import pandas as pd
+from timelines import downsample, lttb, message_counts, rolling_means, timeline
+
+def test_resampled_counts():
+    """Test day/week/month resampling with empty periods filled"""
+
+    df = pd.DataFrame({'datetime_ist': [
+        '2023-01-02T09:00:00', '2023-01-02T23:59:00', '2023-01-04T00:00:00', '2023-02-15T12:00:00'
+    ]})
+
+    print("🧪 Testing Timelines")
+    print("=" * 40)
+
+    daily = message_counts(df, "D")
+    assert len(daily) == 45
+    assert daily.loc['2023-01-02'] == 2 and daily.loc['2023-01-03'] == 0 and daily.sum() == 4
+    weekly = message_counts(df, "W-MON")
+    assert weekly.index[0] == pd.Timestamp('2023-01-02') and weekly.iloc[0] == 3
+    monthly = message_counts(df, "MS")
+    assert monthly.tolist() == [3, 1]
+    assert len(message_counts(df.iloc[:0])) == 0
+    print("✅ Day, week and month bins, empty periods counted as 0")
+
+    means = rolling_means(daily)
+    assert list(means.columns) == ['7-day average', '30-day average']
+    assert means['7-day average'].loc['2023-01-04'] == 1.0
+    assert means['7-day average'].loc['2023-01-08'] == 3 / 7
+    print("✅ Trailing 7/30-day averages")
+
+def test_lttb_downsampling():
+    """Test that LTTB bounds the point count and keeps extremes"""
+
+    x = np.arange(10_000)
+    y = np.sin(x / 300.0) * 10
+    y[4321] = 100
+    keep = lttb(x, y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4321 in keep
+    assert np.array_equal(lttb(x[:50], y[:50], 500), np.arange(50))
+    print("✅ LTTB keeps endpoints and spikes within the point budget")
+
+    days = pd.DataFrame({'datetime_ist': pd.date_range('2010-01-01', periods=4000, freq='D').strftime('%Y-%m-%dT%H:%M:%S')})
+    frame = timeline(days, "D", rolling=True, max_points=300)
+    assert len(frame) == 300
+    assert list(frame.columns) == ['messages', '7-day average', '30-day average']
+    assert len(downsample(frame, 1000)) == 300
+    print("✅ Timelines are downsampled with all columns aligned")
+
+if __name__ == "__main__":
+    test_resampled_counts()
+    test_lttb_downsampling()
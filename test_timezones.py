@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script to verify IANA timezone localization and viewer timezone conversion
+"""
+
+import io
+from parser import parse_chat_file
+from timezones import convert_chat_timezone, localize_timestamps, utc_strings, validate_timezone
+import pandas as pd
+
+SAMPLE = (
+    "3/11/23, 11:30 pm - Ann: autumn\n"
+    "5/11/23, 1:30 am - Ben: late night\n"
+    "12/3/24, 2:30 am - Ann: spring\n"
+    "1/7/24, 12:00 pm - Ben: summer\n"
+)
+
+def test_localize_timestamps():
+    """Test DST-aware conversion to UTC"""
+
+    print("🧪 Testing Timezone Localization")
+    print("=" * 40)
+
+    local = pd.Series(["2023-11-05T01:30:00", "2024-03-10T02:30:00", "2024-01-15T09:00:00"])
+    utc = utc_strings(localize_timestamps(local, "America/New_York")).tolist()
+    assert utc == ["2023-11-05T05:30:00", "2024-03-10T07:00:00", "2024-01-15T14:00:00"]
+    print("✅ Ambiguous and skipped wall times resolved")
+
+    try:
+        validate_timezone("Mars/Olympus_Mons")
+        assert False, "unknown zone accepted"
+    except ValueError:
+        pass
+    print("✅ Unknown zones rejected")
+
+def test_parse_with_timezone():
+    """Test parse_chat_file timezone option and re-expressing a chat in a viewer zone"""
+
+    df = parse_chat_file(io.StringIO(SAMPLE), timezone="Europe/London")
+    assert df['datetime_ist'].tolist() == [
+        "2023-11-03T23:30:00", "2023-11-05T01:30:00", "2024-03-12T02:30:00", "2024-07-01T12:00:00"
+    ]
+    assert df['datetime_utc'].tolist() == [
+        "2023-11-03T23:30:00", "2023-11-05T01:30:00", "2024-03-12T02:30:00", "2024-07-01T11:00:00"
+    ]
+    print("✅ datetime_utc follows the export zone's DST rules")
+
+    viewed = convert_chat_timezone(df, "Europe/London", "Asia/Kolkata")
+    assert viewed['datetime_ist'].tolist() == [
+        "2023-11-04T05:00:00", "2023-11-05T07:00:00", "2024-03-12T08:00:00", "2024-07-01T16:30:00"
+    ]
+    assert viewed['hour'].tolist() == [5, 7, 8, 16]
+    assert viewed['day'].tolist() == [4, 5, 12, 1]
+    assert viewed['datetime_ist_human'].iloc[0] == "04 Nov 2023, 05:00 AM"
+    assert viewed['datetime_utc'].tolist() == df['datetime_utc'].tolist()
+    assert df['hour'].tolist() == [23, 1, 2, 12]
+    print("✅ Chat re-expressed in the viewer zone without re-parsing")
+
+if __name__ == "__main__":
+    test_localize_timestamps()
+    test_parse_with_timezone()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cached word cloud rendering and background pre-rendering
+"""
+
+import pandas as pd
+import word_cloud
+from word_cloud import WordCloudCache, prerender_word_clouds, render_word_cloud, word_cloud_key
+from word_frequency import word_counts_by_sender
+
+def test_word_cloud_cache():
+    """Test LRU eviction, render de-duplication and pre-rendering"""
+
+    print("🧪 Testing Word Cloud Cache")
+    print("=" * 40)
+
+    png = render_word_cloud({'court': 5, 'pickleball': 3, 'bhai': 1})
+    assert png.startswith(b'\x89PNG')
+    print(f"✅ Rendered PNG ({len(png)} bytes)")
+
+    # Count renders instead of drawing real images for the cache checks
+    renders = []
+    original_render = word_cloud.render_word_cloud
+    word_cloud.render_word_cloud = lambda frequencies: renders.append(frequencies) or b'png'
+    try:
+        cache = WordCloudCache(maxsize=2)
+        key_a = word_cloud_key('chat', None, 'v1')
+        key_b = word_cloud_key('chat', 'Alice', 'v1')
+        key_c = word_cloud_key('chat', 'Alice', 'v2')
+
+        cache.get_or_render(key_a, {'a': 1})
+        cache.get_or_render(key_a, {'a': 1})
+        assert len(renders) == 1
+        print("✅ Second request served from cache")
+
+        cache.get_or_render(key_b, {'b': 1})
+        cache.get(key_a)  # key_a is now most recently used
+        cache.get_or_render(key_c, {'c': 1})
+        assert len(cache) == 2 and key_a in cache and key_b not in cache
+        print("✅ Least recently used entry evicted")
+
+        df = pd.DataFrame({'sender': ['Alice', 'Bob', 'Alice'], 'message': ['court booked', 'nice court', 'pickleball night']})
+        counts = word_counts_by_sender(df, frozenset())
+        thread = prerender_word_clouds('chat2', counts, [None, 'Alice', 'Bob'], 'v1', cache=WordCloudCache())
+        thread.join()
+        assert len(renders) == 6
+        print("✅ Background pre-render filled the cache")
+    finally:
+        word_cloud.render_word_cloud = original_render
+
+if __name__ == "__main__":
+    test_word_cloud_cache()
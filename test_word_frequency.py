@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the vectorized word frequency engine matches the original loop
+"""
+
+from collections import Counter
+import pandas as pd
+from word_frequency import load_stop_words, tokenize_messages, word_counts_by_sender, word_counts_for
+
+def legacy_word_counts(messages, stop_words):
+    """The per-word loop app.py used before the vectorized engine."""
+    all_words = []
+    for message in messages:
+        if message and message.strip():
+            for word in message.lower().split():
+                clean_word = ''.join(char for char in word if char.isalnum())
+                if clean_word and len(clean_word) > 1 and clean_word not in stop_words and not clean_word.isdigit():
+                    all_words.append(clean_word)
+    return Counter(all_words)
+
+def test_word_frequency():
+    """Test that per-sender counts agree with the legacy tokenizer"""
+
+    df = pd.DataFrame({
+        'sender': ['Alice', 'Bob', 'Alice', 'Bob', 'Chitra'],
+        'message': [
+            "Kal milte hain at the court!!",
+            "Don't forget the e-mail, bhai... 2024 booking",
+            "",
+            "court court COURT_booking a 123",
+            "नमस्ते दोस्तों, court?"
+        ]
+    })
+    stop_words = frozenset({'the', 'at', 'hain'})
+
+    print("🧪 Testing Word Frequency Engine")
+    print("=" * 40)
+
+    tokens = tokenize_messages(df['message'])
+    print(f"✅ Tokens produced: {len(tokens)}")
+    assert set(tokens.index) <= set(df.index)
+
+    counts = word_counts_by_sender(df, stop_words)
+    print(f"✅ Sender/word pairs: {len(counts)}")
+
+    overall = word_counts_for(counts)
+    expected = legacy_word_counts(df['message'], stop_words)
+    assert overall.to_dict() == dict(expected), (overall.to_dict(), dict(expected))
+    print(f"✅ Overall counts match legacy loop ({len(expected)} unique words)")
+
+    for sender in df['sender'].unique():
+        sender_counts = word_counts_for(counts, sender)
+        expected = legacy_word_counts(df[df['sender'] == sender]['message'], stop_words)
+        assert sender_counts.to_dict() == dict(expected), sender
+    print("✅ Per-sender counts match legacy loop")
+
+    assert list(overall.index[:1]) == ['court']
+    assert word_counts_for(counts, 'nobody').empty
+
+    # Stop words are loaded once and shared
+    assert load_stop_words() is load_stop_words()
+    print(f"✅ Stop words cached ({len(load_stop_words())} entries)")
+
+if __name__ == "__main__":
+    test_word_frequency()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+FREQUENCIES = {"Day": "D", "Week": "W-MON", "Month": "MS"}
+ROLLING_WINDOWS = [7, 30]
+DEFAULT_MAX_POINTS = 1500
+
+def message_counts(df: pd.DataFrame, freq: str = "D") -> pd.Series:
+    """
+    Messages per period, with a 0 for every empty period in between.
+
+    freq is a pandas offset alias ("D", "W-MON", "MS", ...); bins are labelled
+    by the period start. Uses resample on a datetime index.
+    """
+    timestamps = pd.to_datetime(df["datetime_ist"], format="ISO8601")
+    if len(timestamps) == 0:
+        return pd.Series(dtype=np.int64, name="messages")
+    ones = pd.Series(1, index=pd.DatetimeIndex(timestamps.to_numpy()))
+    counts = ones.resample(freq, label="left", closed="left").sum()
+    return counts.rename("messages").astype(np.int64)
+
+def rolling_means(daily_counts: pd.Series, windows=ROLLING_WINDOWS) -> pd.DataFrame:
+    """Trailing rolling means of a daily count series, one column per window in days."""
+    return pd.DataFrame({
+        f"{window}-day average": daily_counts.rolling(f"{window}D", min_periods=1).mean()
+        for window in windows
+    })
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling; returns the indices to keep.
+
+    Keeps the first and last points and, from each of max_points - 2 equal
+    buckets in between, the point forming the largest triangle with the point
+    kept from the previous bucket and the mean of the next bucket. Peaks and
+    troughs survive, unlike plain striding.
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        keep[bucket + 1] = previous
+    return keep
+
+def downsample(frame: pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS, column=None) -> pd.DataFrame:
+    """
+    Reduce a datetime-indexed frame to at most max_points rows with LTTB.
+
+    Points are chosen on column (the first column by default) and the same
+    rows are kept for every column, so overlaid lines stay aligned.
+    """
+    if len(frame) <= max_points:
+        return frame
+    values = frame[column if column is not None else frame.columns[0]].to_numpy()
+    keep = lttb(frame.index.asi8, values, max_points)
+    return frame.iloc[keep]
+
+def timeline(df: pd.DataFrame, freq: str = "D", rolling: bool = False,
+             max_points: int = DEFAULT_MAX_POINTS) -> pd.DataFrame:
+    """
+    Message-count timeline ready for plotting.
+
+    Columns: messages plus, for daily timelines with rolling=True, the
+    ROLLING_WINDOWS averages. Downsampled to at most max_points rows.
+    """
+    counts = message_counts(df, freq)
+    frame = counts.to_frame()
+    if rolling and freq == "D" and len(counts) > 0:
+        frame = frame.join(rolling_means(counts))
+    return downsample(frame, max_points)
@@ -0,0 +1,58 @@
+from zoneinfo import ZoneInfo, available_timezones
+import numpy as np
+import pandas as pd
+
+# WhatsApp exports carry wall-clock times without a zone; the parser's column
+# names (datetime_ist) come from the zone this app was first written for
+DEFAULT_TIMEZONE = "Asia/Kolkata"
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+HUMAN_FORMAT = "%d %b %Y, %I:%M %p"
+
+def timezone_names() -> list:
+    """Sorted IANA zone names, for pickers."""
+    return sorted(available_timezones())
+
+def validate_timezone(timezone: str) -> str:
+    """Return the zone name unchanged, or raise ValueError if it is not a known IANA zone."""
+    try:
+        ZoneInfo(timezone)
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown timezone: {timezone!r}")
+    return timezone
+
+def localize_timestamps(local: pd.Series, timezone: str) -> pd.Series:
+    """
+    Interpret naive wall-clock timestamps in an IANA zone and convert them to UTC.
+
+    One vectorized tz_localize/tz_convert for the whole column. Wall times that
+    occur twice when DST ends resolve to the first (DST) occurrence, and times
+    skipped when DST starts move forward to the first valid instant.
+    """
+    naive = pd.to_datetime(local, format="ISO8601")
+    return (naive.dt.tz_localize(validate_timezone(timezone),
+                                 ambiguous=np.ones(len(naive), dtype=bool),
+                                 nonexistent="shift_forward")
+                 .dt.tz_convert("UTC"))
+
+def utc_strings(utc: pd.Series) -> pd.Series:
+    """Format UTC timestamps like the parser's datetime_utc column."""
+    return utc.dt.tz_localize(None).dt.strftime(ISO_FORMAT)
+
+def convert_chat_timezone(df: pd.DataFrame, from_timezone: str, to_timezone: str) -> pd.DataFrame:
+    """
+    Re-express a parsed chat in another zone without re-parsing.
+
+    The wall-clock columns (datetime_ist, datetime_ist_human, year, month, day,
+    hour, minute) are rewritten as seen from to_timezone, datetime_utc is set
+    from from_timezone, and rows are re-sorted. Returns a copy.
+    """
+    utc = localize_timestamps(df["datetime_ist"], from_timezone)
+    local = utc.dt.tz_convert(validate_timezone(to_timezone)).dt.tz_localize(None)
+    converted = df.copy()
+    converted["datetime_utc"] = utc_strings(utc)
+    converted["datetime_ist"] = local.dt.strftime(ISO_FORMAT)
+    converted["datetime_ist_human"] = local.dt.strftime(HUMAN_FORMAT)
+    for column in ["year", "month", "day", "hour", "minute"]:
+        if column in converted.columns:
+            converted[column] = getattr(local.dt, column).astype(converted[column].dtype)
+    return converted.sort_values("datetime_ist", kind="stable")
@@ -0,0 +1,125 @@
+import io
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+import pandas as pd
+from word_frequency import word_counts_for
+
+# Rendering settings used by the "☁️ Word Cloud" tab
+WORD_CLOUD_OPTIONS = {
+    "width": 800,
+    "height": 400,
+    "background_color": "white",
+    "colormap": "viridis",
+    "max_words": 100
+}
+
+def render_word_cloud(frequencies: dict) -> bytes:
+    """Render a word -> count mapping to PNG bytes."""
+    from wordcloud import WordCloud
+
+    image = WordCloud(**WORD_CLOUD_OPTIONS).generate_from_frequencies(frequencies).to_image()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class WordCloudCache:
+    """
+    Bounded LRU cache of rendered word cloud PNGs.
+
+    Keys are (chat_hash, sender, stop_words_version) tuples. Renders that are
+    already in flight (e.g. from a background pre-render) are waited on rather
+    than started twice.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._images = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._images
+
+    def get(self, key) -> Optional[bytes]:
+        """Return the cached PNG for a key, marking it as recently used."""
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                return self._images[key]
+        return None
+
+    def put(self, key, png: bytes):
+        """Store a PNG, evicting the least recently used entries past maxsize."""
+        with self._lock:
+            self._images[key] = png
+            self._images.move_to_end(key)
+            while len(self._images) > self.maxsize:
+                self._images.popitem(last=False)
+
+    def get_or_render(self, key, frequencies: dict) -> bytes:
+        """Return the cached PNG for a key, rendering it (once) if needed."""
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                return self._images[key]
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending[key] = threading.Event()
+
+        if not owner:
+            event.wait()
+            png = self.get(key)
+            if png is not None:
+                return png
+            # The other render failed or was evicted straight away; do it ourselves
+            return self.get_or_render(key, frequencies)
+
+        try:
+            png = render_word_cloud(frequencies)
+            self.put(key, png)
+            return png
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+
+    def is_cached_or_pending(self, key) -> bool:
+        with self._lock:
+            return key in self._images or key in self._pending
+
+# Shared by every session in this process so pre-rendered images survive reruns
+word_cloud_cache = WordCloudCache()
+
+def word_cloud_key(chat_hash: str, sender: Optional[str], stop_words_version: str):
+    """Build the cache key for a chat/sender word cloud ("Overall" when sender is None)."""
+    return (chat_hash, sender or "Overall", stop_words_version)
+
+def prerender_word_clouds(chat_hash: str, counts: pd.DataFrame, senders: Iterable[Optional[str]],
+                          stop_words_version: str, cache: Optional[WordCloudCache] = None) -> Optional[threading.Thread]:
+    """
+    Render word clouds for the given senders (None meaning "Overall") in a background thread.
+
+    Keys that are already cached or being rendered are skipped. Returns the
+    started thread, or None when there was nothing left to render.
+    """
+    cache = cache or word_cloud_cache
+    todo = [sender for sender in senders
+            if not cache.is_cached_or_pending(word_cloud_key(chat_hash, sender, stop_words_version))]
+    if not todo:
+        return None
+
+    def worker():
+        for sender in todo:
+            frequencies = word_counts_for(counts, sender)
+            if len(frequencies) > 0:
+                cache.get_or_render(word_cloud_key(chat_hash, sender, stop_words_version), frequencies.to_dict())
+
+    thread = threading.Thread(target=worker, name=f"wordcloud-prerender-{chat_hash[:8]}", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+
+# Stop words ship next to this module so lookups don't depend on the working directory
+STOP_WORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stop_words_hinglish.txt")
+
+HINDI_STOP_WORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stop_words_hindi.txt")
+
+# Anything that is not a letter, digit or whitespace is dropped from inside a word,
+# which matches the old ''.join(char for char in word if char.isalnum()) cleaning
+non_alnum_pattern = r"[^\w\s]|_"
+non_alnum_regex = re.compile(non_alnum_pattern)
+
+# Devanagari vowel signs and the virama are not alphanumeric, so the default cleaning
+# cuts them out of Hindi words; Hindi messages keep them and drop the dandas instead
+devanagari_non_word_pattern = r"[^\w\s\u0900-\u0963\u0966-\u097F]|_"
+devanagari_non_word_regex = re.compile(devanagari_non_word_pattern)
+
+# Word cleaning regex and stop word file per message language (see language_id.py);
+# languages without an entry use the default pipeline
+DEFAULT_PIPELINE = (non_alnum_regex, STOP_WORDS_FILE)
+LANGUAGE_PIPELINES = {"hindi": (devanagari_non_word_regex, HINDI_STOP_WORDS_FILE)}
+
+@lru_cache(maxsize=None)
+def load_stop_words(path: str = STOP_WORDS_FILE) -> frozenset:
+    """Load the stop word list once per process as a frozenset (empty if the file is missing)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return frozenset(word.strip().lower() for word in f if word.strip())
+    except FileNotFoundError:
+        return frozenset()
+
+@lru_cache(maxsize=8)
+def stop_words_version(stop_words: frozenset) -> str:
+    """Short content hash of a stop word set, used to key caches built on filtered words."""
+    return hashlib.sha1("\n".join(sorted(stop_words)).encode("utf-8")).hexdigest()[:12]
+
+def message_pipelines(df: pd.DataFrame) -> pd.Series:
+    """LANGUAGE_PIPELINES key of every message ("" for the default pipeline), from the language column if any."""
+    if "language" not in df.columns:
+        return pd.Series("", index=df.index)
+    return df["language"].where(df["language"].isin(list(LANGUAGE_PIPELINES)), "")
+
+def pipeline_stop_words() -> frozenset:
+    """The stop words of every pipeline together, for callers that filter mixed-language tokens at once."""
+    files = {DEFAULT_PIPELINE[1]} | {stop_words_file for _, stop_words_file in LANGUAGE_PIPELINES.values()}
+    return frozenset().union(*(load_stop_words(path) for path in sorted(files)))
+
+def tokenize_messages(messages: pd.Series, pipelines: Optional[pd.Series] = None) -> pd.Series:
+    """
+    Tokenize a message column in bulk.
+
+    pipelines (aligned with messages, as from message_pipelines) selects each
+    message's LANGUAGE_PIPELINES cleaning; without it every message uses the
+    default. Returns one row per word, indexed by the originating message's
+    index (in message order), so callers can join tokens back to sender or
+    any other message column.
+    """
+    texts = messages.fillna("").astype(str).reset_index(drop=True)
+    languages = pipelines.to_numpy() if pipelines is not None else np.full(len(texts), "", dtype=object)
+    frames = [
+        group.str.lower().str.replace(LANGUAGE_PIPELINES.get(language, DEFAULT_PIPELINE)[0], "", regex=True)
+        .str.split().explode().dropna()
+        for language, group in texts.groupby(languages, sort=False)
+    ]
+    if not frames:
+        return pd.Series(dtype=str)
+    # Back to message order (by position), then to the caller's index
+    words = frames[0] if len(frames) == 1 else pd.concat(frames).sort_index(kind="stable")
+    words.index = messages.index[words.index.to_numpy(dtype=np.int64)]
+    return words.astype(str)
+
+def filter_tokens(tokens: pd.Series, stop_words: Optional[Iterable[str]] = None) -> pd.Series:
+    """Drop single characters, pure numbers and stop words from a token series."""
+    if stop_words is None:
+        stop_words = load_stop_words()
+    keep = (tokens.str.len() > 1) & ~tokens.str.isdigit()
+    if stop_words:
+        keep &= ~tokens.isin(stop_words)
+    return tokens[keep]
+
+def word_counts_by_sender(df: pd.DataFrame, stop_words: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Count filtered words for every sender in a single pass.
+
+    Each sender's messages are joined into one buffer and tokenized with a
+    single regex pass, so filtering only runs over distinct words rather than
+    every token. When df has a language column, each language's messages go
+    through their LANGUAGE_PIPELINES cleaning and stop words (stop_words, if
+    given, replaces the stop word lists). Returns a DataFrame with 'sender',
+    'word' and 'count' columns sorted by descending count.
+    """
+    pipelines = message_pipelines(df)
+    frames = []
+    for (sender, language), messages in df["message"].fillna("").astype(str).groupby([df["sender"], pipelines], sort=False):
+        word_regex, stop_words_file = LANGUAGE_PIPELINES.get(language, DEFAULT_PIPELINE)
+        buffer = word_regex.sub("", "\n".join(messages).lower())
+        sender_counts = Counter(buffer.split())
+        if sender_counts:
+            words = pd.Series(list(sender_counts.keys()))
+            keep = filter_tokens(words, stop_words if stop_words is not None else load_stop_words(stop_words_file)).index
+            frames.append(pd.DataFrame({
+                "sender": sender,
+                "word": words[keep].to_numpy(),
+                "count": [sender_counts[word] for word in words[keep]]
+            }))
+    if not frames:
+        return pd.DataFrame({"sender": pd.Series(dtype=str), "word": pd.Series(dtype=str),
+                             "count": pd.Series(dtype="int64")})
+    counts = pd.concat(frames, ignore_index=True)
+    counts = counts.groupby(["sender", "word"], sort=False, as_index=False)["count"].sum()
+    return counts.sort_values(["count", "word"], ascending=[False, True], ignore_index=True)
+
+def word_counts_for(counts: pd.DataFrame, sender: Optional[str] = None) -> pd.Series:
+    """
+    Collapse per-sender counts into a word -> count Series for one sender (or everyone).
+
+    The result is sorted by descending count, then alphabetically.
+    """
+    if sender is not None:
+        counts = counts[counts["sender"] == sender]
+    totals = counts.groupby("word", sort=False)["count"].sum()
+    totals = totals.reset_index().sort_values(["count", "word"], ascending=[False, True])
+    return totals.set_index("word")["count"]